@@ -0,0 +1,291 @@
+"""
+Serviço assíncrono de consultas (asyncio)
+Descrição: Expõe ``await service.find_path_async(start, goal)`` para serviços
+asyncio, executando as buscas em um pool de threads sem bloquear o event
+loop, juntando consultas idênticas em andamento numa só busca, limitando a
+fila de consultas pendentes e cancelando buscas cujo prazo expirou
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+from path_cache import PathCache
+from pathfinder_astar import PackedGrid, PathFinder
+
+
+Position = Tuple[int, int]
+Path = Optional[List[Position]]
+
+
+class SearchCancelled(Exception):
+    """Levantada dentro da thread para interromper uma busca que ninguém mais espera."""
+
+
+class _Job:
+    """Uma busca pendente, compartilhada por todas as consultas idênticas."""
+    __slots__ = ('key', 'future', 'waiters', 'cancelled', 'cancellable')
+    
+    def __init__(self, key: tuple, future: asyncio.Future, cancellable: bool):
+        self.key = key
+        self.future = future
+        self.waiters = 0
+        # Lidos pela thread da busca (ver AsyncPathService._run)
+        self.cancelled = False
+        self.cancellable = cancellable
+
+
+class AsyncPathService:
+    """
+    Front-end asyncio para o PathFinder.
+    
+    - Pool de threads: cada thread tem seu próprio PathFinder sobre a mesma
+      grade (os buffers de busca não podem ser compartilhados entre threads).
+      Um ``cache`` passado nas opções serve de modelo: cada thread recebe um
+      PathCache próprio com os mesmos limites (``caches``), pois o cache não
+      é protegido contra acesso concorrente
+    - Consultas idênticas (início, fim, algoritmo) em andamento são atendidas
+      por uma única busca
+    - No máximo ``max_pending`` buscas ficam na fila ou em execução; quem
+      chega com a fila cheia espera uma vaga (contra-pressão)
+    - Cada consulta pode ter um prazo (``timeout``); quando todas as consultas
+      que esperam uma busca desistem, a busca é interrompida na próxima
+      expansão (ganchos de ``find_path_with_stats``, só para 'astar'
+      4-conectado; os outros algoritmos terminam a busca em segundo plano).
+      Buscas sem prazo usam o ``find_path`` normal, sem o custo dos ganchos
+    
+    A grade não deve ser alterada enquanto o serviço estiver em uso.
+    
+    Uso:
+        async with AsyncPathService(maze, workers=4) as service:
+            path = await service.find_path_async((0, 0), (99, 99), timeout=0.5)
+    
+    Atributos:
+        grid: Grade compartilhada pelas threads
+        workers: Número de threads de busca
+        max_pending: Limite de buscas na fila ou em execução
+        searches: Buscas iniciadas
+        coalesced: Consultas atendidas por uma busca já em andamento
+        cancelled: Buscas interrompidas ou descartadas por falta de interessados
+        caches: PathCache de cada thread (vazia sem ``cache`` nas opções)
+    """
+    def __init__(self, maze: Union[List[List[str]], PackedGrid], workers: Optional[int] = None,
+                 max_pending: int = 256, **options):
+        """
+        Cria o serviço (as threads só sobem em ``start`` ou no ``async with``).
+        
+        Args:
+            maze: Labirinto (matriz ou PackedGrid)
+            workers: Número de threads de busca (padrão: número de núcleos, até 4)
+            max_pending: Limite de buscas na fila ou em execução
+            **options: Repassadas ao construtor de cada PathFinder (ex.: connectivity=8)
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending deve ser pelo menos 1!")
+        
+        self.grid = maze if isinstance(maze, PackedGrid) else PackedGrid.from_matrix(maze)
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max_pending
+        self._options = options
+        
+        # PathFinder de cada thread (criado na primeira busca da thread)
+        self._local = threading.local()
+        # PathFinder do event loop, usado só para validar e completar posições
+        self._resolver = PathFinder(self.grid, require_endpoints=False, **options)
+        
+        self._executor = None
+        self._queue = None
+        self._slots = None
+        self._tasks = []
+        self._inflight: Dict[tuple, _Job] = {}
+        
+        self.caches: List[PathCache] = []
+        self.searches = 0
+        self.coalesced = 0
+        self.cancelled = 0
+    
+    async def start(self):
+        """Sobe o pool de threads e as tarefas que consomem a fila."""
+        if self._queue is not None:
+            return
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='pathfinder')
+        self._queue = asyncio.Queue(self.max_pending)
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+    
+    async def close(self):
+        """Interrompe as buscas pendentes e encerra o pool de threads."""
+        if self._queue is None:
+            return
+        
+        for job in self._inflight.values():
+            job.cancelled = True
+            if not job.future.done():
+                job.future.cancel()
+        self._inflight.clear()
+        
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        
+        # Espera as threads (que param na próxima expansão) sem travar o loop
+        executor = self._executor
+        await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+        self._executor = self._queue = self._slots = None
+        self._tasks = []
+    
+    async def __aenter__(self) -> 'AsyncPathService':
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    def _pathfinder(self) -> PathFinder:
+        """PathFinder da thread atual."""
+        pathfinder = getattr(self._local, 'pathfinder', None)
+        if pathfinder is None:
+            options = self._options
+            model = options.get('cache')
+            if model is not None:
+                cache = PathCache(model.capacity, model.max_bytes)
+                options = dict(options, cache=cache)
+                self.caches.append(cache)
+            pathfinder = PathFinder(self.grid, require_endpoints=False, **options)
+            self._local.pathfinder = pathfinder
+        return pathfinder
+    
+    def _run(self, job: _Job) -> Path:
+        """
+        Executa uma busca na thread de trabalho.
+        
+        Buscas que podem ser canceladas (alguma consulta com prazo) em 'astar'
+        4-conectado usam o gancho de expansão de ``find_path_with_stats`` para
+        abandonar a busca assim que ninguém mais a esperar. Esse laço ignora o
+        cache, então o cache da thread é consultado e atualizado aqui. As
+        demais buscas usam ``find_path`` (cache e índice de componentes).
+        """
+        if job.cancelled:
+            raise SearchCancelled()
+        
+        start, goal, algorithm = job.key
+        pathfinder = self._pathfinder()
+        if not job.cancellable or algorithm != 'astar' or pathfinder.connectivity != 4:
+            return pathfinder.find_path(start, goal, algorithm)
+        
+        grid = self.grid
+        cache = pathfinder.cache
+        version = grid.version
+        start_index, goal_index = grid.index(start), grid.index(goal)
+        if cache is not None:
+            found, path = cache.get(version, start_index, goal_index)
+            if found:
+                return path
+        
+        def check_cancelled(position, g):
+            if job.cancelled:
+                raise SearchCancelled()
+        
+        path, _ = pathfinder.find_path_with_stats(start, goal, algorithm, on_expand=check_cancelled)
+        if cache is not None:
+            cells = None if path is None else [grid.index(pos) for pos in path]
+            cache.put(version, start_index, goal_index, path, cells)
+        return path
+    
+    async def _worker(self):
+        """Consome a fila, despachando cada busca para o pool de threads."""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.cancelled:
+                    continue
+                self.searches += 1
+                try:
+                    path = await loop.run_in_executor(self._executor, self._run, job)
+                except SearchCancelled:
+                    if not job.future.done():
+                        job.future.cancel()
+                except Exception as error:
+                    if not job.future.done():
+                        job.future.set_exception(error)
+                else:
+                    if not job.future.done():
+                        job.future.set_result(path)
+            finally:
+                if self._inflight.get(job.key) is job:
+                    del self._inflight[job.key]
+                self._slots.release()
+                self._queue.task_done()
+    
+    async def find_path_async(self, start: Optional[Position] = None, goal: Optional[Position] = None,
+                              algorithm: str = 'astar', timeout: Optional[float] = None) -> Path:
+        """
+        Versão assíncrona de ``PathFinder.find_path``.
+        
+        Args:
+            start: Posição inicial (padrão: o 'S' do labirinto)
+            goal: Posição final (padrão: o 'E' do labirinto)
+            algorithm: Algoritmo (ver ``PathFinder.find_path``)
+            timeout: Prazo em segundos (inclui a espera por vaga na fila)
+            
+        Returns:
+            Lista de posições do caminho encontrado, ou None se não houver solução
+            
+        Raises:
+            asyncio.TimeoutError: Se o prazo expirar antes do resultado
+        """
+        if self._queue is None:
+            raise RuntimeError("Use 'async with AsyncPathService(...)' ou chame start() antes!")
+        if algorithm not in PathFinder._ALGORITHMS:
+            raise ValueError(f"Algoritmo desconhecido: {algorithm!r}")
+        
+        # Normaliza as posições, para que consultas iguais tenham a mesma chave
+        resolver = self._resolver
+        if start is None:
+            start = resolver.start
+        if goal is None:
+            goal = resolver.end
+        start_index, goal_index = resolver._resolve_endpoints(start, goal)
+        key = (self.grid.position(start_index), self.grid.position(goal_index), algorithm)
+        
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(0.0, deadline - loop.time())
+        
+        job = self._inflight.get(key)
+        if job is None:
+            # Contra-pressão: espera uma vaga antes de criar uma nova busca
+            await asyncio.wait_for(self._slots.acquire(), remaining())
+            job = self._inflight.get(key)
+            if job is None:
+                job = _Job(key, loop.create_future(), timeout is not None)
+                self._inflight[key] = job
+                self._queue.put_nowait(job)
+            else:
+                # Outra consulta igual criou a busca enquanto esperávamos
+                self._slots.release()
+                self.coalesced += 1
+        else:
+            self.coalesced += 1
+        
+        if timeout is not None:
+            # Vale se a busca ainda estiver na fila
+            job.cancellable = True
+        job.waiters += 1
+        try:
+            # shield: a desistência de uma consulta não cancela a busca das outras
+            return await asyncio.wait_for(asyncio.shield(job.future), remaining())
+        finally:
+            job.waiters -= 1
+            if job.waiters == 0 and not job.future.done():
+                # Ninguém mais espera: a busca para na próxima expansão
+                if not job.cancelled:
+                    job.cancelled = True
+                    self.cancelled += 1
+                if self._inflight.get(job.key) is job:
+                    del self._inflight[job.key]
@@ -0,0 +1,132 @@
+"""
+Resolução de consultas em lote com vários processos
+Descrição: Distribui consultas (início, fim) ou labirintos inteiros entre os
+núcleos da máquina com um ProcessPoolExecutor, compartilhando a grade entre os
+processos via multiprocessing.shared_memory
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple, Union
+
+from pathfinder_astar import PackedGrid, PathFinder
+
+
+Position = Tuple[int, int]
+Path = Optional[List[Position]]
+
+# PathFinder de cada processo trabalhador, criado uma única vez pelo inicializador
+_worker_state = {}
+
+
+def _attach_worker(name: str, rows: int, cols: int):
+    """
+    Inicializador dos processos: anexa a memória compartilhada e cria o PathFinder.
+    
+    A grade é usada diretamente sobre o buffer compartilhado (sem cópia), e o
+    PathFinder guarda seus próprios buffers de busca, reaproveitados entre os
+    blocos de consultas que o processo receber.
+    
+    Args:
+        name: Nome do bloco de memória compartilhada
+        rows: Número de linhas do labirinto
+        cols: Número de colunas do labirinto
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    size = (rows + 2) * (cols + 2)
+    grid = PackedGrid(rows, cols, shm.buf[:size])
+    _worker_state['shm'] = shm
+    _worker_state['pathfinder'] = PathFinder(grid, require_endpoints=False)
+
+
+def _solve_chunk(pairs: Sequence[Tuple[Position, Position]]) -> List[Path]:
+    """Resolve um bloco de consultas no processo trabalhador."""
+    return _worker_state['pathfinder'].find_paths(pairs)
+
+
+def _solve_maze(maze: Union[List[List[str]], PackedGrid]) -> Path:
+    """Resolve um labirinto completo (entre seus 'S' e 'E') no processo trabalhador."""
+    return PathFinder(maze).find_path()
+
+
+def _chunks(items: Sequence, size: int) -> List[Sequence]:
+    """Divide uma sequência em blocos de até ``size`` itens."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def solve_queries(maze: Union[List[List[str]], PackedGrid],
+                  pairs: Sequence[Tuple[Position, Position]],
+                  workers: Optional[int] = None,
+                  chunksize: int = 256) -> List[Path]:
+    """
+    Resolve muitas consultas (início, fim) sobre um mesmo labirinto em paralelo.
+    
+    A grade é copiada uma única vez para um bloco de memória compartilhada;
+    os processos apenas a anexam, e cada tarefa transporta só as coordenadas
+    do seu bloco de consultas.
+    
+    Args:
+        maze: Labirinto (matriz ou PackedGrid)
+        pairs: Consultas (início, fim)
+        workers: Número de processos (padrão: número de núcleos)
+        chunksize: Quantidade de consultas enviadas por tarefa
+        
+    Returns:
+        Caminho (ou None) de cada consulta, na mesma ordem de ``pairs``
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize deve ser pelo menos 1!")
+    
+    grid = maze if isinstance(maze, PackedGrid) else PackedGrid.from_matrix(maze)
+    pairs = list(pairs)
+    workers = workers or os.cpu_count() or 1
+    
+    # Sem paralelismo possível: resolve no próprio processo
+    if workers == 1 or len(pairs) <= chunksize:
+        return PathFinder(grid, require_endpoints=False).find_paths(pairs)
+    
+    size = (grid.rows + 2) * grid.width
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        shm.buf[:size] = grid.cells[grid.offset:grid.offset + size]
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_attach_worker,
+            initargs=(shm.name, grid.rows, grid.cols),
+        ) as executor:
+            results = []
+            for chunk_result in executor.map(_solve_chunk, _chunks(pairs, chunksize)):
+                results.extend(chunk_result)
+            return results
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def solve_mazes(mazes: Sequence[Union[List[List[str]], PackedGrid]],
+                workers: Optional[int] = None,
+                chunksize: int = 1) -> List[Path]:
+    """
+    Resolve vários labirintos independentes (cada um entre seu 'S' e 'E') em paralelo.
+    
+    Cada labirinto é diferente, então é enviado ao processo junto com a tarefa.
+    
+    Args:
+        mazes: Labirintos a resolver
+        workers: Número de processos (padrão: número de núcleos)
+        chunksize: Quantidade de labirintos enviados por tarefa
+        
+    Returns:
+        Caminho (ou None) de cada labirinto, na mesma ordem de ``mazes``
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize deve ser pelo menos 1!")
+    
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(mazes) <= 1:
+        return [_solve_maze(maze) for maze in mazes]
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_solve_maze, mazes, chunksize=chunksize))
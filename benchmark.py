@@ -0,0 +1,430 @@
+"""
+Benchmark reprodutível do PathFinder com labirintos grandes gerados
+Descrição: Gera labirintos determinísticos (por semente) de vários tipos e
+tamanhos, mede latência, vazão, células expandidas e pico de memória das
+consultas, grava o resultado em JSON e compara com uma execução de referência
+para detectar regressões
+
+Uso:
+    python benchmark.py --sizes 100 1000 --output atual.json
+    python benchmark.py --sizes 100 1000 --baseline referencia.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence
+
+from pathfinder_astar import PackedGrid, PathFinder, WALL, FREE
+
+
+# ============================================================================
+# GERADORES DE LABIRINTOS
+# ============================================================================
+# Todos recebem (linhas, colunas, semente) e devolvem uma PackedGrid com 'S'
+# em (0, 0) e 'E' perto do canto oposto. A grade é preenchida direto no
+# buffer, sem passar por listas de listas, para aguentar 10000x10000.
+
+def _place_endpoints(grid: PackedGrid, end: tuple):
+    """Coloca 'S' em (0, 0) e 'E' na posição dada."""
+    grid.cells[grid.index((0, 0))] = ord('S')
+    grid.cells[grid.index(end)] = ord('E')
+
+
+def backtracker_maze(rows: int, cols: int, seed: int = 0) -> PackedGrid:
+    """
+    Labirinto perfeito (sem ciclos) gerado por backtracking recursivo.
+    
+    As salas ficam nas posições de linha e coluna pares; a busca em
+    profundidade (iterativa) derruba a parede entre salas vizinhas. É o
+    pior caso para a distância de Manhattan: corredores longos e sinuosos.
+    
+    Args:
+        rows: Número de linhas
+        cols: Número de colunas
+        seed: Semente do gerador aleatório
+        
+    Returns:
+        PackedGrid com o labirinto
+    """
+    rnd = random.Random(seed)
+    grid = PackedGrid(rows, cols)
+    cells = grid.cells
+    width = grid.width
+    size = (rows + 2) * width
+    cells[:] = bytes([WALL]) * size
+    
+    # Salas ainda não visitadas (com folga de duas linhas em cada ponta do
+    # buffer, para que um passo duplo nunca caia em índice negativo)
+    pad = 2 * width
+    visited = bytearray(b'\x01') * (size + 2 * pad)
+    for row in range(0, rows, 2):
+        first = pad + (row + 1) * width + 1
+        visited[first:first + cols:2] = bytes((cols + 1) // 2)
+    
+    steps = (-2 * width, 2 * width, -2, 2)
+    start = grid.index((0, 0))
+    visited[start + pad] = 1
+    cells[start] = FREE
+    stack = [start]
+    choice = rnd.choice
+    
+    while stack:
+        current = stack[-1]
+        options = [step for step in steps if not visited[current + step + pad]]
+        if not options:
+            stack.pop()
+            continue
+        step = choice(options)
+        following = current + step
+        visited[following + pad] = 1
+        cells[current + step // 2] = FREE
+        cells[following] = FREE
+        stack.append(following)
+    
+    _place_endpoints(grid, ((rows - 1) // 2 * 2, (cols - 1) // 2 * 2))
+    return grid
+
+
+def random_maze(rows: int, cols: int, seed: int = 0, density: float = 0.3) -> PackedGrid:
+    """
+    Obstáculos espalhados ao acaso com a densidade dada.
+    
+    Args:
+        rows: Número de linhas
+        cols: Número de colunas
+        seed: Semente do gerador aleatório
+        density: Fração aproximada de paredes
+        
+    Returns:
+        PackedGrid com o labirinto
+    """
+    rnd = random.Random(seed)
+    grid = PackedGrid(rows, cols)
+    cells = grid.cells
+    
+    # Cada byte aleatório vira parede se ficar abaixo do limiar
+    threshold = int(density * 256)
+    table = bytes(WALL if value < threshold else FREE for value in range(256))
+    for row in range(rows):
+        first = grid.index((row, 0))
+        cells[first:first + cols] = rnd.randbytes(cols).translate(table)
+    
+    # Libera os vizinhos de S e E para que nenhum dos dois nasça cercado
+    for row, col in ((0, 1), (1, 0), (rows - 1, cols - 2), (rows - 2, cols - 1)):
+        if grid.contains((row, col)):
+            cells[grid.index((row, col))] = FREE
+    
+    _place_endpoints(grid, (rows - 1, cols - 1))
+    return grid
+
+
+def rooms_maze(rows: int, cols: int, seed: int = 0, room: int = 16) -> PackedGrid:
+    """
+    Salas abertas separadas por paredes, com uma porta entre salas vizinhas.
+    
+    Args:
+        rows: Número de linhas
+        cols: Número de colunas
+        seed: Semente do gerador aleatório
+        room: Lado de cada sala, contando a parede
+        
+    Returns:
+        PackedGrid com o labirinto
+    """
+    rnd = random.Random(seed)
+    grid = PackedGrid(rows, cols)
+    cells = grid.cells
+    width = grid.width
+    
+    # Paredes horizontais e verticais a cada `room` células. A última linha
+    # e a última coluna nunca recebem parede: se o lado for múltiplo de
+    # `room`, o 'E' no canto cairia no cruzamento de duas paredes
+    for row in range(room - 1, rows - 1, room):
+        first = grid.index((row, 0))
+        cells[first:first + cols] = bytes([WALL]) * cols
+    for col in range(room - 1, cols - 1, room):
+        first = grid.index((0, col))
+        cells[first:first + rows * width:width] = bytes([WALL]) * rows
+    
+    # Uma porta em cada trecho de parede entre duas salas
+    for top in range(0, rows, room):
+        bottom = min(top + room - 1, rows)
+        for left in range(0, cols, room):
+            right = min(left + room - 1, cols)
+            if right < cols - 1:
+                cells[grid.index((rnd.randrange(top, bottom), right))] = FREE
+            if bottom < rows - 1:
+                cells[grid.index((bottom, rnd.randrange(left, right)))] = FREE
+    
+    _place_endpoints(grid, (rows - 1, cols - 1))
+    return grid
+
+
+def unreachable_maze(rows: int, cols: int, seed: int = 0) -> PackedGrid:
+    """
+    Pior caso: mapa quase aberto com o 'E' cercado de paredes.
+    
+    Sem caminho, a busca precisa visitar toda a região alcançável a partir
+    de 'S' antes de desistir.
+    
+    Args:
+        rows: Número de linhas
+        cols: Número de colunas
+        seed: Semente do gerador aleatório
+        
+    Returns:
+        PackedGrid com o labirinto
+    """
+    grid = random_maze(rows, cols, seed, density=0.2)
+    end = (rows - 1, cols - 1)
+    for step in grid.width, 1:
+        grid.cells[grid.index(end) - step] = WALL
+    return grid
+
+
+# Geradores disponíveis na linha de comando
+GENERATORS: Dict[str, Callable[[int, int, int], PackedGrid]] = {
+    'backtracker': backtracker_maze,
+    'random': random_maze,
+    'rooms': rooms_maze,
+    'unreachable': unreachable_maze,
+}
+
+
+# ============================================================================
+# MEDIÇÃO
+# ============================================================================
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """
+    Percentil com interpolação linear entre as amostras ordenadas.
+    
+    Args:
+        values: Amostras (não vazias)
+        fraction: Percentil entre 0 e 1 (ex.: 0.9 para o p90)
+        
+    Returns:
+        Valor do percentil
+    """
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _prepare(pathfinder: PathFinder, algorithm: str):
+    """Monta as estruturas que alguns algoritmos exigem antes da primeira consulta."""
+    if algorithm == 'alt':
+        pathfinder.build_landmarks()
+    elif algorithm == 'hpa':
+        pathfinder.build_hierarchy()
+
+
+def benchmark(generator: str, size: int, algorithm: str = 'astar',
+              repeat: int = 5, warmup: int = 1, seed: int = 0) -> dict:
+    """
+    Mede uma consulta S → E em um labirinto gerado.
+    
+    As repetições usam o mesmo PathFinder (como um serviço faria); estruturas
+    auxiliares ('alt', 'hpa') são montadas antes e seu tempo fica em
+    ``prepare_time``. O pico de memória é medido à parte, com tracemalloc, num
+    PathFinder novo (incluindo essas estruturas), porque o rastreamento deixa
+    a busca bem mais lenta.
+    
+    Args:
+        generator: Nome do gerador (chave de GENERATORS)
+        size: Lado do labirinto (size x size)
+        algorithm: Algoritmo passado a ``find_path``
+        repeat: Número de repetições medidas
+        warmup: Número de execuções descartadas antes da medição
+        seed: Semente do gerador
+        
+    Returns:
+        Dicionário com as métricas (tempos em segundos)
+    """
+    if repeat < 1:
+        raise ValueError("repeat deve ser pelo menos 1!")
+    
+    grid = GENERATORS[generator](size, size, seed)
+    pathfinder = PathFinder(grid)
+    
+    began = time.perf_counter()
+    _prepare(pathfinder, algorithm)
+    prepare_time = time.perf_counter() - began
+    
+    for _ in range(warmup):
+        pathfinder.find_path(algorithm=algorithm)
+    
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        pathfinder.find_path(algorithm=algorithm)
+        timings.append(time.perf_counter() - began)
+    
+    path, stats = pathfinder.find_path_with_stats(algorithm=algorithm)
+    
+    tracemalloc.start()
+    try:
+        fresh = PathFinder(grid)
+        _prepare(fresh, algorithm)
+        fresh.find_path(algorithm=algorithm)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    
+    total = sum(timings)
+    return {
+        'generator': generator,
+        'size': size,
+        'algorithm': algorithm,
+        'seed': seed,
+        'repeat': repeat,
+        'prepare_time': prepare_time,
+        'mean': total / repeat,
+        'min': min(timings),
+        'p50': percentile(timings, 0.5),
+        'p90': percentile(timings, 0.9),
+        'p99': percentile(timings, 0.99),
+        'queries_per_second': repeat / total if total else float('inf'),
+        'nodes_per_second': stats.nodes_expanded * repeat / total if total else float('inf'),
+        'nodes_expanded': stats.nodes_expanded,
+        'path_length': stats.path_length,
+        'peak_memory': peak,
+    }
+
+
+def run_suite(sizes: Sequence[int], generators: Sequence[str], algorithms: Sequence[str],
+              repeat: int = 5, warmup: int = 1, seed: int = 0, verbose: bool = True) -> dict:
+    """
+    Executa o benchmark para todas as combinações de tamanho, gerador e algoritmo.
+    
+    Args:
+        sizes: Lados dos labirintos
+        generators: Nomes dos geradores
+        algorithms: Algoritmos
+        repeat: Repetições medidas por caso
+        warmup: Execuções descartadas por caso
+        seed: Semente dos geradores
+        verbose: Se True, imprime cada resultado
+        
+    Returns:
+        Dicionário com 'meta' (ambiente e parâmetros) e 'results'
+    """
+    results = []
+    for size in sizes:
+        for generator in generators:
+            for algorithm in algorithms:
+                result = benchmark(generator, size, algorithm, repeat, warmup, seed)
+                results.append(result)
+                if verbose:
+                    print(f"{generator:<12} {size:>6} {algorithm:<14} "
+                          f"p50 {result['p50'] * 1000:10.2f} ms | "
+                          f"p90 {result['p90'] * 1000:10.2f} ms | "
+                          f"{result['queries_per_second']:9.1f} consultas/s | "
+                          f"{result['nodes_expanded']:>10} expandidos | "
+                          f"{result['peak_memory'] / 1024 / 1024:8.1f} MiB")
+    
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': repeat,
+            'warmup': warmup,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.10) -> List[str]:
+    """
+    Compara um resultado com uma execução de referência.
+    
+    Casos são pareados por (gerador, tamanho, algoritmo). Há regressão se a
+    mediana ficou mais de ``tolerance`` acima da referência, ou se foram
+    expandidas mais células (os labirintos são os mesmos para a mesma semente).
+    
+    Args:
+        current: Resultado de ``run_suite``
+        baseline: Resultado de referência (mesmo formato)
+        tolerance: Piora relativa aceita na mediana (0.10 = 10%)
+        
+    Returns:
+        Lista de descrições das regressões encontradas (vazia se nenhuma)
+    """
+    def key(result):
+        return (result['generator'], result['size'], result['algorithm'])
+    
+    reference = {key(result): result for result in baseline['results']}
+    regressions = []
+    
+    for result in current['results']:
+        old = reference.get(key(result))
+        if old is None or old.get('seed') != result.get('seed'):
+            continue
+        name = '/'.join(str(part) for part in key(result))
+        
+        if result['p50'] > old['p50'] * (1 + tolerance):
+            regressions.append(f"{name}: mediana {old['p50'] * 1000:.2f} ms → "
+                               f"{result['p50'] * 1000:.2f} ms")
+        if result['nodes_expanded'] > old['nodes_expanded']:
+            regressions.append(f"{name}: expandidos {old['nodes_expanded']} → "
+                               f"{result['nodes_expanded']}")
+    
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Linha de comando do benchmark.
+    
+    Returns:
+        Código de saída: 0, ou 1 se houver regressões em relação à referência
+    """
+    parser = argparse.ArgumentParser(description="Benchmark do PathFinder")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 300, 1000],
+                        help="lados dos labirintos (ex.: 100 1000 10000)")
+    parser.add_argument('--generators', nargs='+', default=list(GENERATORS),
+                        choices=list(GENERATORS))
+    parser.add_argument('--algorithms', nargs='+', default=['astar'],
+                        choices=list(PathFinder._ALGORITHMS))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="arquivo JSON para gravar o resultado")
+    parser.add_argument('--baseline', help="arquivo JSON de referência para comparar")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="piora relativa aceita na mediana (padrão: 0.10)")
+    args = parser.parse_args(argv)
+    
+    suite = run_suite(args.sizes, args.generators, args.algorithms,
+                      args.repeat, args.warmup, args.seed)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(suite, f, indent=2)
+        print(f"\nResultado gravado em {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(suite, baseline, args.tolerance)
+        if regressions:
+            print("\n✗ Regressões em relação à referência:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\n✓ Nenhuma regressão em relação à referência")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Campo de distâncias vetorizado (BFS em frentes de onda com NumPy)
+Descrição: Calcula de uma só vez a distância de uma origem até todas as
+células do mapa, junto com o pai de cada célula, para responder o caminho
+até qualquer destino em tempo proporcional ao comprimento do caminho
+"""
+
+from typing import Iterable, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # dependência opcional: só este módulo precisa dela
+    np = None
+
+from pathfinder_astar import PackedGrid, WALL
+
+
+# Distância registrada para células que a origem não alcança
+UNREACHABLE = -1
+
+
+class DistanceField:
+    """
+    Distâncias e pais de todas as células a partir de uma origem.
+    
+    A BFS avança uma camada inteira por passo: os vizinhos de todas as
+    células da fronteira são gerados com uma única operação vetorial sobre
+    os índices planos da grade (com borda, como na PackedGrid), filtrados
+    por parede/visitado e deduplicados com ``np.unique``. Cada passo custa
+    O(tamanho da fronteira), não O(tamanho da grade).
+    
+    As distâncias coincidem com o comprimento dos caminhos de
+    ``PathFinder.find_path`` (número de passos = len(caminho) - 1); entre
+    caminhos mínimos diferentes, o escolhido pode não ser o mesmo.
+    
+    Atributos:
+        grid: Grade usada
+        source: Posição de origem (linha, coluna)
+        distances: Matriz ``rows x cols`` (int32) de distâncias, -1 = inalcançável
+        parents: Vetor (int32) com o índice plano do pai de cada célula, -1 = nenhum
+    """
+    def __init__(self, maze: Union[List[List[str]], PackedGrid],
+                 source: Optional[Tuple[int, int]] = None):
+        """
+        Calcula o campo de distâncias.
+        
+        Args:
+            maze: Matriz 2D do labirinto ou uma PackedGrid (mesmo formato do PathFinder)
+            source: Posição de origem (padrão: o 'S' do labirinto)
+        """
+        if np is None:
+            raise ImportError("O campo de distâncias precisa do NumPy: pip install numpy")
+        
+        if not isinstance(maze, PackedGrid):
+            maze = PackedGrid.from_matrix(maze)
+        self.grid = maze
+        
+        if source is None:
+            source = maze.find_last('S')
+            if source is None:
+                raise ValueError("Posição inicial 'S' não encontrada no labirinto!")
+        if not maze.contains(source):
+            raise ValueError(f"Posição {tuple(source)} fora dos limites do labirinto!")
+        self.source = tuple(source)
+        
+        self._compute()
+    
+    def _compute(self):
+        """Executa a BFS em frentes de onda sobre o buffer da grade."""
+        grid = self.grid
+        width = grid.width
+        size = (grid.rows + 2) * width
+        
+        # Visão do buffer da grade (índices relativos a grid.offset)
+        cells = np.frombuffer(grid.cells, dtype=np.uint8, count=size, offset=grid.offset)
+        blocked = cells == WALL
+        
+        distances = np.full(size, UNREACHABLE, dtype=np.int32)
+        parents = np.full(size, -1, dtype=np.int32)
+        offsets = np.array([-width, width, -1, 1], dtype=np.int32)
+        
+        source = grid.index(self.source) - grid.offset
+        if not blocked[source]:
+            distances[source] = 0
+            # Paredes e células já alcançadas ficam de fora das próximas camadas
+            closed = blocked.copy()
+            closed[source] = True
+            frontier = np.array([source], dtype=np.int32)
+            distance = 0
+            
+            while frontier.size:
+                distance += 1
+                candidates = (frontier[:, None] + offsets).ravel()
+                origins = np.repeat(frontier, len(offsets))
+                
+                fresh = ~closed[candidates]
+                candidates = candidates[fresh]
+                origins = origins[fresh]
+                
+                # Uma célula pode ser vizinha de várias da fronteira: fica o primeiro pai
+                frontier, first = np.unique(candidates, return_index=True)
+                closed[frontier] = True
+                distances[frontier] = distance
+                parents[frontier] = origins[first]
+        
+        self._distances = distances
+        self.parents = parents
+        # Matriz sem a borda, no formato (linha, coluna)
+        self.distances = distances.reshape(grid.rows + 2, width)[1:-1, 1:-1]
+    
+    def distance(self, goal: Tuple[int, int]) -> Optional[int]:
+        """
+        Distância da origem até uma posição.
+        
+        Args:
+            goal: Posição de destino (linha, coluna)
+            
+        Returns:
+            Número de passos, ou None se o destino for inalcançável
+        """
+        if not self.grid.contains(goal):
+            raise ValueError(f"Posição {tuple(goal)} fora dos limites do labirinto!")
+        distance = int(self._distances[self.grid.index(goal) - self.grid.offset])
+        return None if distance == UNREACHABLE else distance
+    
+    def path_to(self, goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """
+        Caminho mínimo da origem até uma posição, lido do vetor de pais.
+        
+        Args:
+            goal: Posição de destino (linha, coluna)
+            
+        Returns:
+            Lista de posições da origem ao destino, ou None se não houver caminho
+        """
+        if self.distance(goal) is None:
+            return None
+        
+        grid = self.grid
+        base = grid.offset
+        parents = self.parents
+        path = []
+        current = grid.index(goal) - base
+        while current != -1:
+            path.append(grid.position(current + base))
+            current = int(parents[current])
+        
+        path.reverse()
+        return path
+    
+    def paths_to(self, goals: Iterable[Tuple[int, int]]) -> List[Optional[List[Tuple[int, int]]]]:
+        """
+        Caminhos da origem até vários destinos (sem nenhuma busca adicional).
+        
+        Args:
+            goals: Posições de destino
+            
+        Returns:
+            Lista com o caminho (ou None) de cada destino, na mesma ordem
+        """
+        return [self.path_to(goal) for goal in goals]
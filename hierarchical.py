@@ -0,0 +1,491 @@
+"""
+Busca hierárquica (HPA*) sobre uma abstração de clusters
+Descrição: Divide a grade em clusters, pré-calcula as entradas entre clusters
+vizinhos e as distâncias entre entradas de um mesmo cluster, e responde
+consultas buscando nesse grafo abstrato (pequeno) e refinando o resultado
+localmente, cluster a cluster
+"""
+
+import heapq
+import struct
+import sys
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from pathfinder_astar import PackedGrid, WALL
+
+
+# Cabeçalho do arquivo: assinatura, linhas, colunas, tamanho do cluster,
+# número de transições e de arestas internas
+HPA_MAGIC = b'PFHPA1\n\x00'
+HPA_HEADER = struct.Struct('<8sIIIII')
+
+# Trechos de entrada com pelo menos este comprimento recebem duas transições
+# (uma em cada ponta); os menores recebem uma só, no meio
+LONG_ENTRANCE = 6
+
+
+class ClusterAbstraction:
+    """
+    Grafo abstrato do HPA* para uma PackedGrid.
+    
+    Os nós abstratos são células (índices do buffer da grade) nas bordas dos
+    clusters. Há dois tipos de aresta:
+    - transição: liga duas células vizinhas em clusters vizinhos (custo 1)
+    - interna: liga duas células de borda do mesmo cluster, com a distância
+      do menor caminho que não sai do cluster
+    
+    Os caminhos obtidos são válidos, mas não necessariamente mínimos: a
+    abstração só permite atravessar clusters pelas transições escolhidas.
+    
+    Atributos:
+        grid: Grade abstraída
+        cluster_size: Lado (em células) de cada cluster
+        cluster_rows: Número de clusters na vertical
+        cluster_cols: Número de clusters na horizontal
+        transitions: (cluster a, cluster b) -> lista de transições (u, v)
+        intra: cluster -> nó u -> nó v -> distância interna
+        version: Versão da grade refletida pela abstração
+        clusters_rebuilt: Quantos clusters já tiveram as arestas recalculadas
+    """
+    def __init__(self, grid: PackedGrid, cluster_size: int = 16, build: bool = True):
+        """
+        Cria a abstração de uma grade.
+        
+        Args:
+            grid: Grade a ser abstraída
+            cluster_size: Lado de cada cluster, em células
+            build: Se False, não calcula nada (usado por ``load``)
+        """
+        if cluster_size < 2:
+            raise ValueError("O tamanho do cluster deve ser pelo menos 2!")
+        
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-grid.rows // cluster_size)
+        self.cluster_cols = -(-grid.cols // cluster_size)
+        self.transitions: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        self.intra: Dict[int, Dict[int, Dict[int, int]]] = {}
+        self.version = grid.version
+        self.clusters_rebuilt = 0
+        
+        # Transições de cada célula (u -> células v do outro lado)
+        self._inter: Dict[int, Set[int]] = {}
+        # Clusters alterados desde a última atualização
+        self._dirty: Set[int] = set()
+        
+        if build:
+            self.rebuild()
+    
+    def cluster_of(self, index: int) -> int:
+        """Retorna o número do cluster que contém uma célula."""
+        row, col = self.grid.position(index)
+        size = self.cluster_size
+        return (row // size) * self.cluster_cols + col // size
+    
+    def _bounds(self, cluster: int) -> Tuple[int, int, int, int]:
+        """Retorna (linha inicial, linha final, coluna inicial, coluna final) de um cluster."""
+        size = self.cluster_size
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        row0, col0 = cluster_row * size, cluster_col * size
+        return row0, min(row0 + size, self.grid.rows), col0, min(col0 + size, self.grid.cols)
+    
+    def _neighbor_clusters(self, cluster: int) -> List[int]:
+        """Retorna os clusters vizinhos (cima, baixo, esquerda, direita)."""
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        neighbors = []
+        if cluster_row > 0:
+            neighbors.append(cluster - self.cluster_cols)
+        if cluster_row < self.cluster_rows - 1:
+            neighbors.append(cluster + self.cluster_cols)
+        if cluster_col > 0:
+            neighbors.append(cluster - 1)
+        if cluster_col < self.cluster_cols - 1:
+            neighbors.append(cluster + 1)
+        return neighbors
+    
+    def rebuild(self):
+        """Calcula toda a abstração: transições de todas as bordas e arestas internas."""
+        self.transitions = {}
+        self.intra = {}
+        self._inter = {}
+        self._dirty = set()
+        
+        n_clusters = self.cluster_rows * self.cluster_cols
+        for cluster in range(n_clusters):
+            for neighbor in self._neighbor_clusters(cluster):
+                if neighbor > cluster:
+                    self._build_border(cluster, neighbor)
+        for cluster in range(n_clusters):
+            self._build_intra(cluster)
+        
+        self.version = self.grid.version
+    
+    def _build_border(self, first: int, second: int):
+        """
+        (Re)calcula as transições da borda entre dois clusters vizinhos.
+        
+        Args:
+            first: Cluster de cima ou da esquerda
+            second: Cluster de baixo ou da direita
+        """
+        grid = self.grid
+        cells = grid.cells
+        inter = self._inter
+        
+        # Remove as transições antigas desta borda
+        for u, v in self.transitions.pop((first, second), ()):
+            for a, b in ((u, v), (v, u)):
+                targets = inter[a]
+                targets.discard(b)
+                if not targets:
+                    del inter[a]
+        
+        row0, row1, col0, col1 = self._bounds(first)
+        if second != first + self.cluster_cols:
+            # Borda vertical: última coluna do primeiro x primeira do segundo
+            pairs = [(grid.index((row, col1 - 1)), grid.index((row, col1))) for row in range(row0, row1)]
+        else:
+            # Borda horizontal: última linha do primeiro x primeira do segundo
+            pairs = [(grid.index((row1 - 1, col)), grid.index((row1, col))) for col in range(col0, col1)]
+        
+        # Agrupa pares livres consecutivos em trechos de entrada
+        runs = []
+        run = []
+        for u, v in pairs:
+            if cells[u] != WALL and cells[v] != WALL:
+                run.append((u, v))
+            elif run:
+                runs.append(run)
+                run = []
+        if run:
+            runs.append(run)
+        
+        transitions = []
+        for run in runs:
+            if len(run) >= LONG_ENTRANCE:
+                transitions.extend((run[0], run[-1]))
+            else:
+                transitions.append(run[len(run) // 2])
+        
+        self.transitions[(first, second)] = transitions
+        for u, v in transitions:
+            inter.setdefault(u, set()).add(v)
+            inter.setdefault(v, set()).add(u)
+    
+    def _nodes(self, cluster: int) -> Set[int]:
+        """Retorna as células de transição que pertencem a um cluster."""
+        nodes = set()
+        for neighbor in self._neighbor_clusters(cluster):
+            key = (min(cluster, neighbor), max(cluster, neighbor))
+            for u, v in self.transitions.get(key, ()):
+                nodes.add(u if cluster == key[0] else v)
+        return nodes
+    
+    def _build_intra(self, cluster: int):
+        """(Re)calcula as distâncias internas entre os nós de um cluster."""
+        nodes = self._nodes(cluster)
+        table = {}
+        for u in nodes:
+            distances, _ = self._cluster_bfs(u, cluster)
+            table[u] = {v: distances[v] for v in nodes if v != u and v in distances}
+        self.intra[cluster] = table
+        self.clusters_rebuilt += 1
+    
+    def _cluster_bfs(self, source: int, cluster: int, target: int = -1,
+                     bounds: Optional[Tuple[int, int, int, int]] = None
+                     ) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """
+        Busca em largura a partir de uma célula sem sair do cluster.
+        
+        Args:
+            source: Índice inicial
+            cluster: Cluster onde a busca fica confinada
+            target: Se informado, a busca para ao alcançá-lo
+            bounds: Limites (linhas, colunas) a usar no lugar dos do cluster
+            
+        Returns:
+            Tupla (distâncias, pais) das células alcançadas
+        """
+        grid = self.grid
+        cells, width, base = grid.cells, grid.width, grid.offset
+        row0, row1, col0, col1 = bounds or self._bounds(cluster)
+        # Limites em coordenadas do buffer (com a borda)
+        row0, row1, col0, col1 = row0 + 1, row1 + 1, col0 + 1, col1 + 1
+        
+        distances = {source: 0}
+        parents = {source: -1}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if current == target:
+                break
+            next_distance = distances[current] + 1
+            for step in (-width, width, -1, 1):
+                neighbor = current + step
+                if neighbor in distances or cells[neighbor] == WALL:
+                    continue
+                row, col = divmod(neighbor - base, width)
+                if row0 <= row < row1 and col0 <= col < col1:
+                    distances[neighbor] = next_distance
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+        
+        return distances, parents
+    
+    def cell_changed(self, index: int, blocked: bool):
+        """
+        Registra uma alteração de célula (``PathFinder.set_blocked``/``set_free``).
+        
+        Só o cluster da célula é marcado; o recálculo acontece na próxima
+        consulta (ver ``refresh``). Se a grade mudou por outro caminho, a
+        abstração inteira é reconstruída.
+        
+        Args:
+            index: Índice da célula alterada
+            blocked: True se a célula virou parede, False se foi liberada
+        """
+        if self.version + 1 != self.grid.version:
+            return
+        self.version = self.grid.version
+        self._dirty.add(self.cluster_of(index))
+    
+    def refresh(self):
+        """
+        Atualiza a abstração após alterações na grade.
+        
+        Recalcula as bordas dos clusters alterados e as arestas internas
+        desses clusters e dos vizinhos (cujas transições podem ter mudado).
+        Os demais clusters não são tocados.
+        """
+        if self.version != self.grid.version:
+            self.rebuild()
+            return
+        if not self._dirty:
+            return
+        
+        affected = set(self._dirty)
+        for cluster in self._dirty:
+            for neighbor in self._neighbor_clusters(cluster):
+                self._build_border(min(cluster, neighbor), max(cluster, neighbor))
+                affected.add(neighbor)
+        for cluster in affected:
+            self._build_intra(cluster)
+        self._dirty = set()
+    
+    def _connect(self, index: int, cluster: int) -> Dict[int, int]:
+        """Distâncias internas de uma célula qualquer até os nós do seu cluster."""
+        distances, _ = self._cluster_bfs(index, cluster)
+        return {node: distances[node] for node in self._nodes(cluster) if node in distances and node != index}
+    
+    def find_path(self, start: int, goal: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Encontra um caminho entre dois índices usando a abstração.
+        
+        1. Liga o início e o fim aos nós dos seus clusters (busca local)
+        2. Executa A* sobre o grafo abstrato
+        3. Refina cada aresta abstrata em células com buscas locais
+        
+        Args:
+            start: Índice inicial no buffer da grade
+            goal: Índice final no buffer da grade
+            
+        Returns:
+            Lista de posições do caminho, ou None se não houver solução
+        """
+        self.refresh()
+        grid = self.grid
+        cells, width, base = grid.cells, grid.width, grid.offset
+        if cells[start] == WALL or cells[goal] == WALL:
+            return None
+        if start == goal:
+            return [grid.position(start)]
+        
+        start_cluster, goal_cluster = self.cluster_of(start), self.cluster_of(goal)
+        start_edges = self._connect(start, start_cluster)
+        goal_edges = self._connect(goal, goal_cluster)
+        
+        # Extremidades no mesmo cluster ou em clusters vizinhos: aresta direta
+        # pela busca local na região dos dois, evitando desvios até as transições
+        direct_parents = None
+        if start_cluster == goal_cluster or goal_cluster in self._neighbor_clusters(start_cluster):
+            (a0, a1, a2, a3), (b0, b1, b2, b3) = self._bounds(start_cluster), self._bounds(goal_cluster)
+            bounds = (min(a0, b0), max(a1, b1), min(a2, b2), max(a3, b3))
+            distances, direct_parents = self._cluster_bfs(start, start_cluster, goal, bounds)
+            if goal in distances:
+                start_edges[goal] = distances[goal]
+        
+        goal_row, goal_col = divmod(goal - base, width)
+        
+        def heuristic(index: int) -> int:
+            row, col = divmod(index - base, width)
+            return abs(row - goal_row) + abs(col - goal_col)
+        
+        # A* sobre o grafo abstrato (dicionários: o grafo é pequeno)
+        g_costs = {start: 0}
+        parents = {start: -1}
+        closed = set()
+        h = heuristic(start)
+        open_list = [(h, h, start)]
+        
+        while open_list:
+            current = heapq.heappop(open_list)[2]
+            if current in closed:
+                continue
+            closed.add(current)
+            if current == goal:
+                break
+            
+            if current == start:
+                edges = list(start_edges.items())
+            else:
+                edges = list(self.intra[self.cluster_of(current)].get(current, {}).items())
+                if current in goal_edges:
+                    edges.append((goal, goal_edges[current]))
+            edges.extend((neighbor, 1) for neighbor in self._inter.get(current, ()))
+            
+            for neighbor, cost in edges:
+                if neighbor in closed:
+                    continue
+                new_g = g_costs[current] + cost
+                if neighbor not in g_costs or new_g < g_costs[neighbor]:
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    h = heuristic(neighbor)
+                    heapq.heappush(open_list, (new_g + h, h, neighbor))
+        else:
+            return None
+        
+        abstract_path = []
+        current = goal
+        while current != -1:
+            abstract_path.append(current)
+            current = parents[current]
+        abstract_path.reverse()
+        
+        if direct_parents is not None and len(abstract_path) == 2:
+            path = []
+            current = goal
+            while current != -1:
+                path.append(grid.position(current))
+                current = direct_parents[current]
+            return path[::-1]
+        
+        return self._refine(abstract_path)
+    
+    def _refine(self, abstract_path: List[int]) -> List[Tuple[int, int]]:
+        """
+        Converte um caminho abstrato em células, com uma busca local por aresta.
+        
+        Args:
+            abstract_path: Índices dos nós abstratos, do início ao fim
+            
+        Returns:
+            Lista de posições do início ao fim
+        """
+        grid = self.grid
+        path = [grid.position(abstract_path[0])]
+        
+        for u, v in zip(abstract_path, abstract_path[1:]):
+            if abs(u - v) in (1, grid.width):
+                path.append(grid.position(v))
+                continue
+            
+            # Aresta interna: u e v estão no mesmo cluster
+            _, parents = self._cluster_bfs(u, self.cluster_of(u), v)
+            segment = []
+            current = v
+            while current != u:
+                segment.append(grid.position(current))
+                current = parents[current]
+            path.extend(reversed(segment))
+        
+        return path
+    
+    def save(self, filename: str):
+        """
+        Grava a abstração em um arquivo binário, para ser construída offline.
+        
+        Os índices são gravados sem o deslocamento do buffer da grade, então o
+        arquivo pode ser carregado sobre a mesma grade vinda de outra fonte
+        (por exemplo, um arquivo mapeado com ``maze_io.load_maze``).
+        
+        Args:
+            filename: Caminho do arquivo de saída
+        """
+        self.refresh()
+        base = self.grid.offset
+        
+        transitions = array('i')
+        for pairs in self.transitions.values():
+            for u, v in pairs:
+                transitions.extend((u - base, v - base))
+        
+        intra = array('i')
+        for table in self.intra.values():
+            for u, distances in table.items():
+                for v, distance in distances.items():
+                    if u < v:
+                        intra.extend((u - base, v - base, distance))
+        
+        if sys.byteorder == 'big':
+            transitions.byteswap()
+            intra.byteswap()
+        
+        with open(filename, 'wb') as f:
+            f.write(HPA_HEADER.pack(HPA_MAGIC, self.grid.rows, self.grid.cols, self.cluster_size,
+                                    len(transitions) // 2, len(intra) // 3))
+            transitions.tofile(f)
+            intra.tofile(f)
+    
+    @classmethod
+    def load(cls, filename: str, grid: PackedGrid) -> 'ClusterAbstraction':
+        """
+        Carrega uma abstração gravada por ``save``.
+        
+        Args:
+            filename: Caminho do arquivo
+            grid: Grade à qual a abstração se refere (mesmas dimensões)
+            
+        Returns:
+            ClusterAbstraction pronta para consultas
+        """
+        with open(filename, 'rb') as f:
+            magic, rows, cols, cluster_size, n_transitions, n_intra = HPA_HEADER.unpack(
+                f.read(HPA_HEADER.size))
+            if magic != HPA_MAGIC:
+                raise ValueError(f"{filename} não é um arquivo de abstração HPA*!")
+            if (rows, cols) != (grid.rows, grid.cols):
+                raise ValueError(
+                    f"A abstração é de um mapa {rows}x{cols}, mas a grade é {grid.rows}x{grid.cols}!")
+            
+            transitions = array('i')
+            transitions.fromfile(f, 2 * n_transitions)
+            intra = array('i')
+            intra.fromfile(f, 3 * n_intra)
+        
+        if sys.byteorder == 'big':
+            transitions.byteswap()
+            intra.byteswap()
+        
+        abstraction = cls(grid, cluster_size, build=False)
+        base = grid.offset
+        cluster_of = abstraction.cluster_of
+        
+        for i in range(0, len(transitions), 2):
+            u, v = transitions[i] + base, transitions[i + 1] + base
+            key = (cluster_of(u), cluster_of(v))
+            abstraction.transitions.setdefault(key, []).append((u, v))
+            abstraction._inter.setdefault(u, set()).add(v)
+            abstraction._inter.setdefault(v, set()).add(u)
+        
+        n_clusters = abstraction.cluster_rows * abstraction.cluster_cols
+        abstraction.intra = {cluster: {} for cluster in range(n_clusters)}
+        for i in range(0, len(intra), 3):
+            u, v, distance = intra[i] + base, intra[i + 1] + base, intra[i + 2]
+            table = abstraction.intra[cluster_of(u)]
+            table.setdefault(u, {})[v] = distance
+            table.setdefault(v, {})[u] = distance
+        
+        return abstraction
@@ -0,0 +1,229 @@
+"""
+Replanejamento incremental (D* Lite) para mapas que mudam entre consultas
+Descrição: Mantém a árvore de busca entre consultas e, quando células são
+bloqueadas ou liberadas, repara apenas a parte afetada em vez de refazer a
+busca inteira
+"""
+
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from pathfinder_astar import PackedGrid, WALL
+
+
+INF = float('inf')
+
+
+class DStarLite:
+    """
+    Planejador D* Lite entre um início (que pode se mover) e um fim fixos.
+    
+    A busca é feita do fim para o início: g(u) é a distância de u até o fim e
+    rhs(u) a estimativa um passo à frente (1 + menor g dos vizinhos). Células
+    com g != rhs ficam na fila; quando uma célula muda, só ela e seus
+    vizinhos são reavaliados, e a fila propaga a mudança apenas até onde ela
+    afeta o caminho atual.
+    
+    Use ``PathFinder.incremental_planner`` para criar um planejador que recebe
+    automaticamente as alterações feitas com ``set_blocked``/``set_free``.
+    
+    Atributos:
+        grid: Grade usada
+        start: Índice atual do início
+        goal: Índice do fim
+        nodes_expanded: Células retiradas da fila na última chamada de ``find_path``
+        version: Versão da grade refletida pelo planejador
+    """
+    def __init__(self, grid: PackedGrid, start: int, goal: int):
+        """
+        Cria o planejador (a primeira busca só acontece em ``find_path``).
+        
+        Args:
+            grid: Grade do labirinto
+            start: Índice inicial no buffer da grade
+            goal: Índice final no buffer da grade
+        """
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+        self.nodes_expanded = 0
+        self._offsets = (-grid.width, grid.width, -1, 1)
+        self._reset()
+    
+    def _reset(self):
+        """Descarta toda a árvore de busca e recomeça a partir do fim."""
+        self._km = 0
+        self._last_start = self.start
+        self._g: Dict[int, float] = {}
+        self._rhs: Dict[int, float] = {self.goal: 0}
+        self._open: List[Tuple[float, float, int]] = []
+        # Chave atual de cada célula na fila (entradas diferentes são obsoletas)
+        self._keys: Dict[int, Tuple[float, float]] = {}
+        self._push(self.goal)
+        self.version = self.grid.version
+    
+    def _heuristic(self, index: int) -> int:
+        """Distância de Manhattan de uma célula até o início atual."""
+        width, base = self.grid.width, self.grid.offset
+        row, col = divmod(index - base, width)
+        start_row, start_col = divmod(self.start - base, width)
+        return abs(row - start_row) + abs(col - start_col)
+    
+    def _key(self, index: int) -> Tuple[float, float]:
+        """Chave de prioridade (k1, k2) de uma célula."""
+        best = min(self._g.get(index, INF), self._rhs.get(index, INF))
+        return (best + self._heuristic(index) + self._km, best)
+    
+    def _push(self, index: int):
+        """Insere (ou reinsere) uma célula na fila com sua chave atual."""
+        key = self._key(index)
+        self._keys[index] = key
+        heapq.heappush(self._open, (key[0], key[1], index))
+    
+    def _top_key(self) -> Tuple[float, float]:
+        """Menor chave válida da fila, descartando entradas obsoletas."""
+        open_list, keys = self._open, self._keys
+        while open_list:
+            k1, k2, index = open_list[0]
+            if keys.get(index) == (k1, k2):
+                return (k1, k2)
+            heapq.heappop(open_list)
+        return (INF, INF)
+    
+    def _update_vertex(self, index: int):
+        """Recalcula rhs de uma célula e a (re)coloca na fila se ficou inconsistente."""
+        cells = self.grid.cells
+        g = self._g
+        
+        if index != self.goal:
+            if cells[index] == WALL:
+                rhs = INF
+            else:
+                rhs = INF
+                for step in self._offsets:
+                    neighbor = index + step
+                    if cells[neighbor] != WALL:
+                        cost = g.get(neighbor, INF) + 1
+                        if cost < rhs:
+                            rhs = cost
+            if rhs == INF:
+                self._rhs.pop(index, None)
+            else:
+                self._rhs[index] = rhs
+        
+        self._keys.pop(index, None)
+        if g.get(index, INF) != self._rhs.get(index, INF):
+            self._push(index)
+    
+    def _compute_shortest_path(self):
+        """Processa a fila até o início ficar consistente (laço principal do D* Lite)."""
+        cells = self.grid.cells
+        g, rhs, keys = self._g, self._rhs, self._keys
+        offsets = self._offsets
+        expanded = 0
+        
+        while True:
+            top = self._top_key()
+            start = self.start
+            if top == (INF, INF):
+                break
+            if not (top < self._key(start) or rhs.get(start, INF) != g.get(start, INF)):
+                break
+            
+            k1, k2, current = heapq.heappop(self._open)
+            del keys[current]
+            expanded += 1
+            
+            new_key = self._key(current)
+            if (k1, k2) < new_key:
+                # Chave desatualizada (o início se moveu): reinsere
+                self._push(current)
+            elif g.get(current, INF) > rhs.get(current, INF):
+                # Sobreconsistente: a distância diminuiu
+                g[current] = rhs[current]
+                for step in offsets:
+                    if cells[current + step] != WALL:
+                        self._update_vertex(current + step)
+            else:
+                # Subconsistente: a distância aumentou (ex.: célula bloqueada)
+                g.pop(current, None)
+                self._update_vertex(current)
+                for step in offsets:
+                    if cells[current + step] != WALL:
+                        self._update_vertex(current + step)
+        
+        self.nodes_expanded = expanded
+    
+    def cell_changed(self, index: int, blocked: bool):
+        """
+        Registra uma alteração de célula (``PathFinder.set_blocked``/``set_free``).
+        
+        A célula e seus vizinhos são reavaliados; a propagação acontece na
+        próxima chamada de ``find_path``. Se a grade mudou por outro caminho,
+        o planejador recomeça do zero.
+        
+        Args:
+            index: Índice da célula alterada
+            blocked: True se a célula virou parede, False se foi liberada
+        """
+        if self.version + 1 != self.grid.version:
+            return
+        self.version = self.grid.version
+        
+        cells = self.grid.cells
+        self._update_vertex(index)
+        for step in self._offsets:
+            if cells[index + step] != WALL:
+                self._update_vertex(index + step)
+    
+    def move_start(self, position: Tuple[int, int]):
+        """
+        Atualiza o início (por exemplo, depois que o agente andou).
+        
+        Args:
+            position: Nova posição inicial (linha, coluna)
+        """
+        if not self.grid.contains(position):
+            raise ValueError(f"Posição {tuple(position)} fora dos limites do labirinto!")
+        
+        self.start = self.grid.index(position)
+        self._km += self._heuristic(self._last_start)
+        self._last_start = self.start
+    
+    def find_path(self) -> Optional[List[Tuple[int, int]]]:
+        """
+        Repara a árvore de busca e retorna o menor caminho atual.
+        
+        Returns:
+            Lista de posições do início ao fim, ou None se não houver solução
+        """
+        if self.version != self.grid.version:
+            self._reset()
+        
+        cells = self.grid.cells
+        if cells[self.start] == WALL or cells[self.goal] == WALL:
+            return None
+        
+        self._compute_shortest_path()
+        g = self._g
+        if g.get(self.start, INF) == INF:
+            return None
+        
+        # Desce pelos g: cada passo vai para o vizinho mais próximo do fim
+        position = self.grid.position
+        current = self.start
+        path = [position(current)]
+        while current != self.goal:
+            best, best_cost = -1, INF
+            for step in self._offsets:
+                neighbor = current + step
+                if cells[neighbor] != WALL:
+                    cost = g.get(neighbor, INF)
+                    if cost < best_cost:
+                        best, best_cost = neighbor, cost
+            if best == -1 or best_cost >= g[current]:
+                return None
+            current = best
+            path.append(position(current))
+        
+        return path
@@ -0,0 +1,257 @@
+"""
+Heurística ALT (A*, Landmarks e desigualdade Triangular)
+Descrição: Pré-calcula, por BFS, a distância real de alguns marcos (landmarks)
+até todas as células do mapa e usa essas tabelas para obter limites
+inferiores muito melhores que a distância de Manhattan em mapas com paredes
+longas, mantendo o A* ótimo
+"""
+
+import struct
+import sys
+from array import array
+from typing import List, Optional
+
+from pathfinder_astar import PackedGrid, WALL
+
+
+# Cabeçalho do arquivo: assinatura, linhas, colunas e número de marcos
+ALT_MAGIC = b'PFALT1\n\x00'
+ALT_HEADER = struct.Struct('<8sIII')
+
+# Distância gravada nas tabelas para células que o marco não alcança
+UNREACHABLE = -1
+
+
+class LandmarkTable:
+    """
+    Tabelas de distância de K marcos para uma PackedGrid.
+    
+    Pela desigualdade triangular, para qualquer marco L:
+        dist(n, fim) >= |dist(L, fim) - dist(L, n)|
+    O maior desses valores entre os marcos é uma heurística admissível e
+    consistente, então o A* continua retornando caminhos mínimos.
+    
+    Os marcos são escolhidos pelo critério "mais distante": cada novo marco é
+    a célula livre mais longe dos marcos já escolhidos (células que nenhum
+    marco alcança têm prioridade, assim cada região isolada ganha um marco).
+    
+    As tabelas são indexadas pelo índice do buffer menos ``grid.offset`` e
+    usam 4 bytes por célula e por marco.
+    
+    Atributos:
+        grid: Grade usada
+        landmarks: Índices (no buffer da grade) dos marcos
+        tables: Uma ``array('i')`` de distâncias por marco (-1 = inalcançável)
+        version: Versão da grade usada no último cálculo
+    """
+    def __init__(self, grid: PackedGrid, count: int = 8, build: bool = True):
+        """
+        Cria as tabelas de marcos.
+        
+        Args:
+            grid: Grade do labirinto
+            count: Número de marcos (mais marcos: heurística melhor, mais memória)
+            build: Se False, não calcula nada (usado por ``load``)
+        """
+        if count < 1:
+            raise ValueError("É preciso pelo menos um marco!")
+        
+        self.grid = grid
+        self.count = count
+        self.landmarks: List[int] = []
+        self.tables: List[array] = []
+        self.version = -1
+        
+        if build:
+            self.rebuild()
+    
+    def _bfs(self, source: int) -> array:
+        """
+        Distâncias de uma célula até todas as outras (BFS por camadas).
+        
+        Args:
+            source: Índice de origem no buffer da grade
+            
+        Returns:
+            Tabela de distâncias indexada por (índice - grid.offset)
+        """
+        grid = self.grid
+        cells = grid.cells
+        base = grid.offset
+        width = grid.width
+        offsets = (-width, width, -1, 1)
+        
+        distances = array('i', [UNREACHABLE]) * ((grid.rows + 2) * width)
+        distances[source - base] = 0
+        frontier = [source]
+        distance = 0
+        
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for current in frontier:
+                for step in offsets:
+                    neighbor = current + step
+                    if cells[neighbor] != WALL and distances[neighbor - base] == UNREACHABLE:
+                        distances[neighbor - base] = distance
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        
+        return distances
+    
+    def rebuild(self):
+        """Escolhe os marcos e recalcula todas as tabelas de distância."""
+        grid = self.grid
+        cells = grid.cells
+        base = grid.offset
+        width = grid.width
+        
+        free = [grid.index((row, col))
+                for row in range(grid.rows) for col in range(grid.cols)
+                if cells[base + (row + 1) * width + col + 1] != WALL]
+        
+        self.landmarks = []
+        self.tables = []
+        self.version = grid.version
+        if not free:
+            return
+        
+        # Menor distância de cada célula livre a um marco já escolhido
+        # (None = nenhum marco alcança a célula)
+        nearest: List[Optional[int]] = [None] * len(free)
+        
+        # O primeiro marco é o ponto mais distante de uma célula qualquer
+        seed = self._bfs(free[0])
+        candidate = max(free, key=lambda index: seed[index - base])
+        
+        while len(self.landmarks) < min(self.count, len(free)):
+            table = self._bfs(candidate)
+            self.landmarks.append(candidate)
+            self.tables.append(table)
+            
+            best, best_distance = -1, -1
+            for i, index in enumerate(free):
+                distance = table[index - base]
+                if distance != UNREACHABLE and (nearest[i] is None or distance < nearest[i]):
+                    nearest[i] = distance
+                # Células sem marco algum vêm antes de qualquer distância
+                score = sys.maxsize if nearest[i] is None else nearest[i]
+                if score > best_distance:
+                    best, best_distance = index, score
+            
+            if best_distance <= 0:
+                # Todas as células livres já são marcos
+                break
+            candidate = best
+    
+    def refresh(self):
+        """Recalcula as tabelas se a grade mudou desde o último cálculo."""
+        if self.version != self.grid.version:
+            self.rebuild()
+    
+    def heuristic(self, index: int, goal: int) -> int:
+        """
+        Limite inferior da distância entre duas células.
+        
+        Args:
+            index: Índice da célula no buffer da grade
+            goal: Índice do destino no buffer da grade
+            
+        Returns:
+            O maior limite entre os marcos e a distância de Manhattan
+        """
+        base, width = self.grid.offset, self.grid.width
+        row, col = divmod(index - base, width)
+        goal_row, goal_col = divmod(goal - base, width)
+        best = abs(row - goal_row) + abs(col - goal_col)
+        
+        for table in self.tables:
+            goal_distance = table[goal - base]
+            if goal_distance == UNREACHABLE:
+                continue
+            bound = abs(goal_distance - table[index - base])
+            if bound > best:
+                best = bound
+        return best
+    
+    def goal_tables(self, goal: int) -> List[tuple]:
+        """
+        Prepara as tabelas usadas numa consulta com destino fixo.
+        
+        Marcos que não alcançam o destino não dão limite algum e ficam de fora.
+        
+        Args:
+            goal: Índice do destino no buffer da grade
+            
+        Returns:
+            Lista de pares (tabela, distância do marco ao destino)
+        """
+        base = self.grid.offset
+        return [(table, table[goal - base]) for table in self.tables
+                if table[goal - base] != UNREACHABLE]
+    
+    def save(self, filename: str):
+        """
+        Grava os marcos e as tabelas em um arquivo binário.
+        
+        Os índices são gravados sem o deslocamento do buffer da grade, como em
+        ``ClusterAbstraction.save``.
+        
+        Args:
+            filename: Caminho do arquivo de saída
+        """
+        self.refresh()
+        base = self.grid.offset
+        landmarks = array('i', [index - base for index in self.landmarks])
+        tables = [array('i', table) for table in self.tables]
+        
+        if sys.byteorder == 'big':
+            landmarks.byteswap()
+            for table in tables:
+                table.byteswap()
+        
+        with open(filename, 'wb') as f:
+            f.write(ALT_HEADER.pack(ALT_MAGIC, self.grid.rows, self.grid.cols, len(landmarks)))
+            landmarks.tofile(f)
+            for table in tables:
+                table.tofile(f)
+    
+    @classmethod
+    def load(cls, filename: str, grid: PackedGrid) -> 'LandmarkTable':
+        """
+        Carrega tabelas gravadas por ``save``.
+        
+        Args:
+            filename: Caminho do arquivo
+            grid: Grade à qual as tabelas se referem (mesmas dimensões)
+            
+        Returns:
+            LandmarkTable pronta para consultas
+        """
+        with open(filename, 'rb') as f:
+            magic, rows, cols, count = ALT_HEADER.unpack(f.read(ALT_HEADER.size))
+            if magic != ALT_MAGIC:
+                raise ValueError(f"{filename} não é um arquivo de marcos ALT!")
+            if (rows, cols) != (grid.rows, grid.cols):
+                raise ValueError(
+                    f"As tabelas são de um mapa {rows}x{cols}, mas a grade é {grid.rows}x{grid.cols}!")
+            
+            landmarks = array('i')
+            landmarks.fromfile(f, count)
+            size = (rows + 2) * grid.width
+            tables = []
+            for _ in range(count):
+                table = array('i')
+                table.fromfile(f, size)
+                tables.append(table)
+        
+        if sys.byteorder == 'big':
+            landmarks.byteswap()
+            for table in tables:
+                table.byteswap()
+        
+        landmark_table = cls(grid, max(count, 1), build=False)
+        landmark_table.landmarks = [index + grid.offset for index in landmarks]
+        landmark_table.tables = tables
+        landmark_table.version = grid.version
+        return landmark_table
@@ -0,0 +1,234 @@
+"""
+Leitura e gravação de labirintos em arquivo
+Descrição: Carrega labirintos grandes via mmap, entregando ao PathFinder uma
+visão da grade sem copiar o arquivo para a memória; também lê o formato
+texto (com ou sem espaços) e um formato binário compacto de 1 bit por célula
+"""
+
+import mmap
+import os
+import struct
+from typing import List
+
+from pathfinder_astar import PackedGrid, WALL
+
+
+# Cabeçalho do formato binário: assinatura, número de linhas e de colunas
+GRID_MAGIC = b'PFGRID1\n'
+GRID_HEADER = struct.Struct('<8sII')
+
+# Cabeçalho do formato compacto: assinatura, linhas, colunas e o número de
+# 'S' e de 'E'; em seguida vêm as posições (linha, coluna) de cada um
+BITS_MAGIC = b'PFBITS2\n'
+BITS_HEADER = struct.Struct('<8sIIII')
+BITS_POSITION = struct.Struct('<ii')
+
+# Versão anterior (ainda lida): só a última posição de S e de E (-1 se ausente)
+BITS1_MAGIC = b'PFBITS1\n'
+BITS1_HEADER = struct.Struct('<8sIIiiii')
+
+# Formato texto: '*' (caminho desenhado por display_maze_with_path) é célula livre
+_TEXT_TABLE = bytes(ord('0') if code == ord('*') else code for code in range(256))
+# Símbolos aceitos no formato texto (depois da conversão acima)
+_TEXT_SYMBOLS = b'01SE23456789\n'
+# Formato compacto: um dígito binário por célula ('1' = parede, '0' = livre)
+_BIT_TABLE = bytes(ord('1') if code == WALL else ord('0') for code in range(256))
+
+
+def save_grid(grid: PackedGrid, filename: str):
+    """
+    Grava uma grade no formato binário bruto (cabeçalho + bytes com borda).
+    
+    O corpo do arquivo é exatamente o buffer da PackedGrid, de modo que
+    ``load_maze`` consegue mapeá-lo de volta sem nenhuma conversão.
+    
+    Args:
+        grid: Grade a ser gravada
+        filename: Caminho do arquivo de saída
+    """
+    size = (grid.rows + 2) * grid.width
+    with open(filename, 'wb') as f:
+        f.write(GRID_HEADER.pack(GRID_MAGIC, grid.rows, grid.cols))
+        f.write(grid.cells[grid.offset:grid.offset + size])
+
+
+def load_maze(filename: str, writable: bool = False) -> PackedGrid:
+    """
+    Abre um arquivo de labirinto via mmap e devolve uma PackedGrid.
+    
+    Formatos aceitos:
+    - Binário bruto (gravado por ``save_grid``): a grade é uma visão direta
+      das páginas do arquivo. Nada é copiado e o sistema operacional só
+      carrega as páginas que a busca realmente tocar.
+    - Compacto (gravado por ``save_bits``): 1 bit por célula, convertido
+      para a grade em poucas operações sobre o arquivo inteiro.
+    - Texto com uma linha por linha do labirinto ('S', 'E', '0', '1', com ou
+      sem espaços entre as células): o arquivo é mapeado e convertido para a
+      grade com borda em uma única passada (uma cópia de ~1 byte por célula).
+    
+    Args:
+        filename: Caminho do arquivo
+        writable: Se True, o mapeamento é copy-on-write (alterações na grade
+                  ficam só na memória do processo); se False, é somente leitura
+        
+    Returns:
+        PackedGrid com o conteúdo do arquivo
+        
+    Raises:
+        ValueError: Se o arquivo estiver vazio ou não for um labirinto válido
+    """
+    with open(filename, 'rb') as f:
+        # mmap não aceita arquivos de tamanho zero
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"O arquivo {filename} está vazio!")
+        access = mmap.ACCESS_COPY if writable else mmap.ACCESS_READ
+        mapped = mmap.mmap(f.fileno(), 0, access=access)
+    
+    if mapped[:len(GRID_MAGIC)] == GRID_MAGIC:
+        _, rows, cols = GRID_HEADER.unpack_from(mapped)
+        return PackedGrid(rows, cols, mapped, offset=GRID_HEADER.size)
+    
+    try:
+        if mapped[:len(BITS_MAGIC)] in (BITS_MAGIC, BITS1_MAGIC):
+            return parse_bits(mapped[:])
+        return parse_text(mapped[:])
+    finally:
+        mapped.close()
+
+
+def parse_text(data: bytes) -> PackedGrid:
+    """
+    Converte o formato texto em uma PackedGrid.
+    
+    Aceita 'S0100' ou 'S 0 1 0 0' por linha, inclusive a saída de
+    ``display_maze_with_path`` (o '*' do caminho vira célula livre). Espaços
+    são removidos e símbolos convertidos com um único ``bytes.translate``, e
+    as linhas são unidas de uma só vez, intercaladas com as paredes da borda,
+    sem percorrer as células individualmente em Python.
+    
+    Args:
+        data: Conteúdo do arquivo texto
+        
+    Returns:
+        PackedGrid com o labirinto
+    """
+    data = data.translate(_TEXT_TABLE, b' \t\r')
+    if data.translate(None, _TEXT_SYMBOLS):
+        raise ValueError("O labirinto só pode conter 'S', 'E', '0', '1' (ou terreno '2' a '9')!")
+    
+    lines: List[bytes] = [line for line in data.split(b'\n') if line]
+    rows = len(lines)
+    cols = len(lines[0]) if lines else 0
+    
+    if any(len(line) != cols for line in lines):
+        raise ValueError("Todas as linhas do labirinto devem ter o mesmo tamanho!")
+    
+    width = cols + 2
+    border = b'1' * width
+    if rows:
+        body = b'1' + b'11'.join(lines) + b'1'
+    else:
+        body = b''
+    
+    cells = bytearray(border + body + border)
+    return PackedGrid(rows, cols, cells)
+
+
+def save_bits(grid: PackedGrid, filename: str):
+    """
+    Grava a grade no formato compacto: cabeçalho + 1 bit por célula.
+    
+    O cabeçalho guarda as posições de todos os 'S' e 'E' (uma grade com
+    vários objetivos volta igual); no corpo, cada célula vira um bit
+    (1 = parede), linha a linha, do bit mais significativo ao menos
+    significativo de cada byte. Terrenos ('2' a '9') viram células livres.
+    O empacotamento é feito pela conversão de inteiros do Python (texto
+    binário → int → bytes), sem laço por célula.
+    
+    Args:
+        grid: Grade a ser gravada
+        filename: Caminho do arquivo de saída
+    """
+    rows, cols, width = grid.rows, grid.cols, grid.width
+    first = grid.offset + width + 1
+    bits = b''.join(
+        bytes(grid.cells[first + row * width:first + row * width + cols]) for row in range(rows)
+    ).translate(_BIT_TABLE)
+    
+    n_bytes = (len(bits) + 7) // 8
+    padding = b'0' * (n_bytes * 8 - len(bits))
+    value = int(bits + padding, 2) if bits else 0
+    
+    starts = grid.find_all('S')
+    ends = grid.find_all('E')
+    with open(filename, 'wb') as f:
+        f.write(BITS_HEADER.pack(BITS_MAGIC, rows, cols, len(starts), len(ends)))
+        for position in starts + ends:
+            f.write(BITS_POSITION.pack(*position))
+        f.write(value.to_bytes(n_bytes, 'big'))
+
+
+def parse_bits(data: bytes) -> PackedGrid:
+    """
+    Converte o conteúdo de um arquivo gravado por ``save_bits`` em uma PackedGrid.
+    
+    Os bits viram de volta os dígitos '0'/'1' (que já são os códigos de célula
+    livre e parede) com ``int.from_bytes`` + ``format``, e cada linha é copiada
+    para a grade com borda por fatia. Também lê a versão anterior do formato
+    (``BITS1_MAGIC``), que só guardava um 'S' e um 'E'.
+    
+    Args:
+        data: Conteúdo do arquivo
+        
+    Returns:
+        PackedGrid com o labirinto (com 'S' e 'E' nas posições gravadas)
+    """
+    if data[:len(BITS1_MAGIC)] == BITS1_MAGIC:
+        _, rows, cols, *coords = BITS1_HEADER.unpack_from(data)
+        header_size = BITS1_HEADER.size
+        starts = [tuple(coords[:2])] if coords[0] >= 0 else []
+        ends = [tuple(coords[2:])] if coords[2] >= 0 else []
+    else:
+        _, rows, cols, n_starts, n_ends = BITS_HEADER.unpack_from(data)
+        positions = [BITS_POSITION.unpack_from(data, BITS_HEADER.size + i * BITS_POSITION.size)
+                     for i in range(n_starts + n_ends)]
+        header_size = BITS_HEADER.size + len(positions) * BITS_POSITION.size
+        starts, ends = positions[:n_starts], positions[n_starts:]
+    
+    payload = data[header_size:]
+    n_cells = rows * cols
+    if len(payload) * 8 < n_cells:
+        raise ValueError(f"Arquivo truncado: {len(payload)} bytes para {rows}x{cols} células!")
+    
+    bits = format(int.from_bytes(payload, 'big'), f'0{len(payload) * 8}b').encode('ascii')
+    view = memoryview(bits)
+    
+    grid = PackedGrid(rows, cols, bytearray(b'1') * ((rows + 2) * (cols + 2)))
+    cells, width = grid.cells, grid.width
+    for row in range(rows):
+        first = (row + 1) * width + 1
+        cells[first:first + cols] = view[row * cols:(row + 1) * cols]
+    
+    for symbol, positions in (ord('S'), starts), (ord('E'), ends):
+        for position in positions:
+            if not grid.contains(position):
+                raise ValueError(f"Posição {position} fora da grade {rows}x{cols}!")
+            cells[grid.index(position)] = symbol
+    return grid
+
+
+def load_bits(filename: str) -> PackedGrid:
+    """
+    Carrega um arquivo gravado por ``save_bits`` (atalho para ``parse_bits``).
+    
+    Args:
+        filename: Caminho do arquivo
+        
+    Returns:
+        PackedGrid com o labirinto
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+    if data[:len(BITS_MAGIC)] not in (BITS_MAGIC, BITS1_MAGIC):
+        raise ValueError(f"{filename} não está no formato compacto de labirinto!")
+    return parse_bits(data)
@@ -0,0 +1,211 @@
+"""
+Cache LRU de caminhos resolvidos
+Descrição: Guarda os resultados de find_path (inclusive "sem solução") por
+versão do mapa e extremidades, com limite de entradas e de memória
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Estimativas aproximadas de memória usadas no limite em bytes
+ENTRY_OVERHEAD = 200   # chave, entrada do OrderedDict e objeto _CacheEntry
+BYTES_PER_STEP = 180   # tupla da posição + ponteiros na lista e nos índices
+
+
+class _CacheEntry:
+    """
+    Caminho guardado no cache.
+    
+    Atributos:
+        path: Caminho resolvido (lista de posições) ou None para "sem solução"
+        offsets: Posição de cada célula (índice da grade) dentro do caminho
+        size: Memória estimada da entrada, em bytes
+    """
+    __slots__ = ('path', 'offsets', 'size')
+    
+    def __init__(self, path: Optional[List[Tuple[int, int]]], cells: List[int]):
+        self.path = path
+        self.offsets = {cell: i for i, cell in enumerate(cells)}
+        self.size = ENTRY_OVERHEAD + BYTES_PER_STEP * len(cells)
+
+
+class PathCache:
+    """
+    Cache LRU de caminhos para um PathFinder.
+    
+    As chaves são os índices (início, fim) na grade; o cache também registra
+    a versão da grade (``PackedGrid.version``) e é esvaziado automaticamente
+    quando ela muda, isto é, quando alguma célula é alterada.
+    
+    Índices e versão só identificam um caminho dentro de uma mesma grade: o
+    cache fica ligado à primeira grade que o usar (``bind``) e pode ser
+    compartilhado apenas entre PathFinders dessa grade.
+    
+    Como todo trecho de um caminho mínimo também é mínimo, um caminho guardado
+    responde qualquer consulta entre duas células dele (em qualquer sentido).
+    
+    Atributos:
+        grid: Grade à qual o cache está ligado (None até o primeiro uso)
+        capacity: Número máximo de entradas
+        max_bytes: Limite aproximado de memória (None = sem limite)
+        hits: Consultas respondidas por uma entrada com as mesmas extremidades
+        subpath_hits: Consultas respondidas por um trecho de outro caminho
+        misses: Consultas não encontradas no cache
+        evictions: Entradas descartadas por falta de espaço
+        invalidations: Vezes em que o cache foi esvaziado por mudança no mapa
+    """
+    def __init__(self, capacity: int = 1024, max_bytes: Optional[int] = None):
+        """
+        Cria um cache vazio.
+        
+        Args:
+            capacity: Número máximo de entradas
+            max_bytes: Limite aproximado de memória em bytes (None = sem limite)
+        """
+        if capacity < 1:
+            raise ValueError("A capacidade do cache deve ser pelo menos 1!")
+        
+        self.grid = None
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.version = None
+        self.bytes_used = 0
+        
+        self.hits = 0
+        self.subpath_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        
+        self._entries: 'OrderedDict[Tuple[int, int], _CacheEntry]' = OrderedDict()
+        # Para cada célula, as chaves dos caminhos guardados que passam por ela
+        self._by_cell: Dict[int, Set[Tuple[int, int]]] = {}
+    
+    def bind(self, grid):
+        """
+        Liga o cache a uma grade (chamado pelo construtor do PathFinder).
+        
+        Args:
+            grid: PackedGrid do PathFinder que vai usar o cache
+        """
+        if self.grid is None:
+            self.grid = grid
+        elif self.grid is not grid:
+            raise ValueError("Este cache já pertence a outra grade: crie um PathCache por grade!")
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def clear(self):
+        """Remove todas as entradas (os contadores são mantidos)."""
+        self._entries.clear()
+        self._by_cell.clear()
+        self.bytes_used = 0
+    
+    def _check_version(self, version: int):
+        """Esvazia o cache se a grade mudou desde a última operação."""
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+                self.clear()
+            self.version = version
+    
+    def get(self, version: int, start: int, goal: int
+            ) -> Tuple[bool, Optional[List[Tuple[int, int]]]]:
+        """
+        Procura o caminho entre dois índices da grade.
+        
+        Args:
+            version: Versão atual da grade
+            start: Índice inicial
+            goal: Índice final
+            
+        Returns:
+            Tupla (encontrado, caminho). O caminho pode ser None quando o cache
+            sabe que não há solução; devolve sempre uma lista nova.
+        """
+        self._check_version(version)
+        entries = self._entries
+        
+        entry = entries.get((start, goal))
+        if entry is not None:
+            entries.move_to_end((start, goal))
+            self.hits += 1
+            return True, None if entry.path is None else list(entry.path)
+        
+        # Trecho de algum caminho guardado que passe pelas duas células
+        for key in self._by_cell.get(start, ()):
+            entry = entries[key]
+            end = entry.offsets.get(goal)
+            if end is None:
+                continue
+            begin = entry.offsets[start]
+            entries.move_to_end(key)
+            self.subpath_hits += 1
+            if begin <= end:
+                return True, entry.path[begin:end + 1]
+            return True, entry.path[end:begin + 1][::-1]
+        
+        self.misses += 1
+        return False, None
+    
+    def put(self, version: int, start: int, goal: int,
+            path: Optional[List[Tuple[int, int]]], cells: Optional[List[int]] = None):
+        """
+        Guarda o resultado de uma consulta.
+        
+        Args:
+            version: Versão da grade usada na busca
+            start: Índice inicial
+            goal: Índice final
+            path: Caminho encontrado, ou None se não houver solução
+            cells: Índices da grade de cada posição do caminho, usados para
+                   responder trechos; se omitido, só a consulta exata é guardada
+        """
+        self._check_version(version)
+        key = (start, goal)
+        if key in self._entries:
+            self._remove(key)
+        
+        if path is None or cells is None:
+            cells = []
+        else:
+            path = list(path)
+        entry = _CacheEntry(path, cells)
+        
+        if self.max_bytes is not None and entry.size > self.max_bytes:
+            return
+        
+        self._entries[key] = entry
+        self.bytes_used += entry.size
+        for cell in cells:
+            self._by_cell.setdefault(cell, set()).add(key)
+        
+        while len(self._entries) > self.capacity or (
+            self.max_bytes is not None and self.bytes_used > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+    
+    def _remove(self, key: Tuple[int, int]):
+        """Remove uma entrada e suas referências no índice por célula."""
+        entry = self._entries.pop(key)
+        self.bytes_used -= entry.size
+        for cell in entry.offsets:
+            keys = self._by_cell[cell]
+            keys.discard(key)
+            if not keys:
+                del self._by_cell[cell]
+    
+    def stats(self) -> Dict[str, int]:
+        """Retorna os contadores do cache em um dicionário."""
+        return {
+            'entries': len(self._entries),
+            'bytes_used': self.bytes_used,
+            'hits': self.hits,
+            'subpath_hits': self.subpath_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
@@ -5,7 +5,37 @@ Descrição: Resolve labirintos 2D usando o algoritmo A* com heurística de Manh
 """
 
 import heapq
-from typing import List, Tuple, Optional, Set
+import io
+import math
+import re
+import time
+import weakref
+from array import array
+from typing import Callable, Iterable, Iterator, List, TextIO, Tuple, Optional, Union
+
+
+# Códigos (ASCII) das células na grade compacta
+WALL = ord('1')
+FREE = ord('0')
+START = ord('S')
+END = ord('E')
+
+# Trechos contínuos de células transitáveis em uma linha da grade
+_FREE_RUN = re.compile(rb'[^1]+')
+
+# Tabela de tradução que reduz a grade a '1' (parede) e '0' (transitável)
+_WALL_MASK_TABLE = bytes(WALL if code == WALL else FREE for code in range(256))
+
+# Custo de um passo diagonal no modo 8-conectado
+SQRT2 = math.sqrt(2)
+
+# Custo de entrar em cada célula no modo com terreno: os dígitos '2' a '9'
+# custam o próprio valor, parede ('1') vale 0 (intransitável) e qualquer
+# outra célula transitável ('0', 'S', 'E') custa 1
+_TERRAIN_COST = bytes(
+    0 if code == WALL else code - ord('0') if ord('2') <= code <= ord('9') else 1
+    for code in range(256)
+)
 
 
 class Node:
@@ -39,37 +69,527 @@ class Node:
         return hash(self.position)
 
 
+class PackedGrid:
+    """
+    Representação compacta do labirinto: um byte (código ASCII) por célula.
+    
+    As células ficam em um buffer plano com uma borda de 1 célula de parede
+    ('1') ao redor de toda a grade. Assim, todo vizinho de uma célula interna
+    é um índice válido do buffer e nenhuma verificação de limites é necessária.
+    
+    O buffer pode ser qualquer objeto indexável por bytes (``bytearray``,
+    ``mmap``, ``memoryview``); a grade começa no byte ``offset`` dele, o que
+    permite usar diretamente o conteúdo de um arquivo com cabeçalho.
+    
+    Atributos:
+        rows: Número de linhas do labirinto (sem a borda)
+        cols: Número de colunas do labirinto (sem a borda)
+        width: Largura de uma linha no buffer (cols + 2)
+        offset: Posição do primeiro byte da grade dentro do buffer
+        cells: Buffer com offset + (rows + 2) * (cols + 2) bytes
+        version: Contador incrementado a cada alteração feita por ``set_cell``
+    """
+    def __init__(self, rows: int, cols: int, cells=None, offset: int = 0):
+        """
+        Cria uma grade compacta.
+        
+        Args:
+            rows: Número de linhas do labirinto
+            cols: Número de colunas do labirinto
+            cells: Buffer já preenchido (com borda); se omitido, cria uma grade
+                   toda livre cercada de paredes
+            offset: Posição do primeiro byte da grade dentro de ``cells``
+        """
+        self.rows = rows
+        self.cols = cols
+        self.width = cols + 2
+        self.offset = offset
+        size = (rows + 2) * self.width
+        
+        if cells is None:
+            cells = bytearray(b'1') * (offset + size)
+            free_row = b'0' * cols
+            for row in range(rows):
+                start = offset + (row + 1) * self.width + 1
+                cells[start:start + cols] = free_row
+        elif len(cells) != offset + size:
+            raise ValueError(
+                f"Buffer com {len(cells)} bytes, esperado {offset + size} para {rows}x{cols} com borda!"
+            )
+        
+        self.cells = cells
+        self.version = 0
+    
+    @classmethod
+    def from_matrix(cls, maze: List[List[str]]) -> 'PackedGrid':
+        """
+        Converte uma matriz de caracteres em uma grade compacta.
+        
+        Args:
+            maze: Matriz 2D com 'S', 'E', '0' e '1'
+            
+        Returns:
+            Nova PackedGrid com o conteúdo da matriz
+        """
+        rows = len(maze)
+        cols = len(maze[0]) if maze else 0
+        width = cols + 2
+        cells = bytearray(b'1') * ((rows + 2) * width)
+        
+        for row, line in enumerate(maze):
+            if len(line) != cols:
+                raise ValueError("Todas as linhas do labirinto devem ter o mesmo tamanho!")
+            start = (row + 1) * width + 1
+            cells[start:start + cols] = ''.join(line).encode('ascii')
+        
+        return cls(rows, cols, cells)
+    
+    def index(self, position: Tuple[int, int]) -> int:
+        """Converte (linha, coluna) no índice do buffer (considerando a borda)."""
+        return self.offset + (position[0] + 1) * self.width + position[1] + 1
+    
+    def position(self, index: int) -> Tuple[int, int]:
+        """Converte um índice do buffer em (linha, coluna) do labirinto."""
+        row, col = divmod(index - self.offset, self.width)
+        return (row - 1, col - 1)
+    
+    def find_last(self, symbol: str) -> Optional[Tuple[int, int]]:
+        """
+        Localiza a última ocorrência de um símbolo com uma única varredura do buffer.
+        
+        Args:
+            symbol: Caractere procurado (por exemplo 'S' ou 'E')
+            
+        Returns:
+            Posição (linha, coluna) encontrada, ou None se não existir
+        """
+        cells = self.cells
+        target = symbol.encode('ascii')
+        
+        if hasattr(cells, 'rfind'):
+            index = cells.rfind(target, self.offset)
+            return None if index == -1 else self.position(index)
+        
+        # memoryview (ex.: memória compartilhada) não tem rfind: varre do fim
+        # para o início em blocos, sem copiar o buffer inteiro
+        block = 1 << 20
+        end = len(cells)
+        while end > self.offset:
+            begin = max(self.offset, end - block)
+            index = bytes(cells[begin:end]).rfind(target)
+            if index != -1:
+                return self.position(begin + index)
+            end = begin
+        return None
+    
+    def find_all(self, symbol: str) -> List[Tuple[int, int]]:
+        """
+        Localiza todas as ocorrências de um símbolo, em ordem de linha.
+        
+        Args:
+            symbol: Caractere procurado (por exemplo 'E')
+            
+        Returns:
+            Lista de posições (linha, coluna), vazia se não houver nenhuma
+        """
+        cells = self.cells
+        target = symbol.encode('ascii')
+        position = self.position
+        positions = []
+        
+        if hasattr(cells, 'find'):
+            index = cells.find(target, self.offset)
+            while index != -1:
+                positions.append(position(index))
+                index = cells.find(target, index + 1)
+            return positions
+        
+        # memoryview não tem find: percorre em blocos, como em find_last
+        block = 1 << 20
+        begin = self.offset
+        while begin < len(cells):
+            chunk = bytes(cells[begin:begin + block])
+            index = chunk.find(target)
+            while index != -1:
+                positions.append(position(begin + index))
+                index = chunk.find(target, index + 1)
+            begin += block
+        return positions
+    
+    def contains(self, position: Tuple[int, int]) -> bool:
+        """Indica se a posição está dentro dos limites do labirinto."""
+        return 0 <= position[0] < self.rows and 0 <= position[1] < self.cols
+    
+    def set_cell(self, position: Tuple[int, int], symbol: str):
+        """
+        Altera o conteúdo de uma célula e incrementa a versão da grade.
+        
+        Estruturas que dependem da grade (caches, índices) comparam a versão
+        para saber se ficaram desatualizadas; por isso alterações devem passar
+        por este método e não escrever diretamente em ``cells``.
+        
+        Args:
+            position: Posição (linha, coluna) da célula
+            symbol: Novo conteúdo ('0', '1', 'S' ou 'E')
+        """
+        if not self.contains(position):
+            raise ValueError(f"Posição {position} fora dos limites do labirinto!")
+        self.cells[self.index(position)] = ord(symbol)
+        self.version += 1
+    
+    def to_matrix(self) -> List[List[str]]:
+        """Converte a grade de volta para uma matriz de caracteres (sem a borda)."""
+        width, cols = self.width, self.cols
+        matrix = []
+        for row in range(self.rows):
+            start = self.offset + (row + 1) * width + 1
+            matrix.append(list(bytes(self.cells[start:start + cols]).decode('ascii')))
+        return matrix
+
+
+class ComponentIndex:
+    """
+    Índice das componentes conexas das células livres de uma PackedGrid.
+    
+    Cada célula recebe um rótulo e os rótulos são agrupados por uma estrutura
+    union-find; duas células estão na mesma componente se seus rótulos têm a
+    mesma raiz. Com isso, consultas entre regiões desconectadas são
+    descartadas em O(1), sem explorar toda a região alcançável.
+    
+    O índice é sempre uma aproximação segura: ele nunca separa células que
+    estão ligadas. Liberar uma célula apenas une rótulos; bloquear uma célula
+    pode dividir uma componente, o que o índice só descobre quando uma busca
+    falha entre células que ele considerava ligadas (ver ``split``).
+    
+    Atributos:
+        grid: Grade indexada
+        labels: Rótulo de cada posição do buffer da grade (-1 = parede/borda)
+        version: Versão da grade refletida pelo índice
+    """
+    def __init__(self, grid: PackedGrid):
+        """
+        Constrói o índice para uma grade.
+        
+        Args:
+            grid: Grade a ser indexada
+        """
+        self.grid = grid
+        self.rebuild()
+    
+    def rebuild(self):
+        """
+        Reconstrói o índice com uma passada pelas linhas da grade.
+        
+        Cada trecho contínuo de células livres de uma linha recebe um rótulo
+        (atribuído em bloco ao vetor de rótulos) e é unido aos trechos da linha
+        anterior com os quais se sobrepõe.
+        """
+        grid = self.grid
+        cells, width, cols = grid.cells, grid.width, grid.cols
+        
+        self.labels = array('i', [-1]) * len(cells)
+        self._parent = array('i')
+        labels, parent = self.labels, self._parent
+        
+        previous_runs = []
+        for row in range(grid.rows):
+            line_start = grid.offset + (row + 1) * width + 1
+            line = bytes(cells[line_start:line_start + cols])
+            
+            runs = []
+            for match in _FREE_RUN.finditer(line):
+                begin, end = match.span()
+                label = len(parent)
+                parent.append(label)
+                labels[line_start + begin:line_start + end] = array('i', [label]) * (end - begin)
+                runs.append((begin, end, label))
+            
+            # Une os trechos que se sobrepõem aos da linha de cima (dois ponteiros)
+            i = j = 0
+            while i < len(runs) and j < len(previous_runs):
+                begin, end, label = runs[i]
+                above_begin, above_end, above_label = previous_runs[j]
+                if begin < above_end and above_begin < end:
+                    self._union(label, above_label)
+                if end <= above_end:
+                    i += 1
+                else:
+                    j += 1
+            
+            previous_runs = runs
+        
+        self.version = grid.version
+    
+    def _find(self, label: int) -> int:
+        """Retorna a raiz de um rótulo (com compressão de caminho)."""
+        parent = self._parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+    
+    def _union(self, label1: int, label2: int):
+        """Une os grupos de dois rótulos."""
+        root1, root2 = self._find(label1), self._find(label2)
+        if root1 != root2:
+            self._parent[root2] = root1
+    
+    def connected(self, index1: int, index2: int) -> bool:
+        """
+        Indica se duas células podem estar ligadas por um caminho.
+        
+        Args:
+            index1: Índice da primeira célula no buffer da grade
+            index2: Índice da segunda célula no buffer da grade
+            
+        Returns:
+            False se certamente não há caminho (inclusive se alguma for parede)
+        """
+        label1, label2 = self.labels[index1], self.labels[index2]
+        if label1 < 0 or label2 < 0:
+            return False
+        return label1 == label2 or self._find(label1) == self._find(label2)
+    
+    def _in_sync(self) -> bool:
+        """
+        Indica se a única alteração desde a última atualização foi a atual.
+        
+        Se a grade mudou por outro caminho, o índice não é atualizado e será
+        reconstruído na próxima consulta.
+        """
+        if self.version + 1 != self.grid.version:
+            return False
+        self.version = self.grid.version
+        return True
+    
+    def cell_changed(self, index: int, blocked: bool):
+        """
+        Atualiza o índice após ``PathFinder.set_blocked``/``set_free``.
+        
+        Liberar uma célula une seu novo rótulo aos rótulos dos vizinhos;
+        bloquear apenas remove o rótulo da célula.
+        
+        Args:
+            index: Índice da célula alterada no buffer da grade
+            blocked: True se a célula virou parede, False se foi liberada
+        """
+        if not self._in_sync():
+            return
+        
+        if blocked:
+            self.labels[index] = -1
+            return
+        if self.labels[index] >= 0:
+            return
+        
+        label = len(self._parent)
+        self._parent.append(label)
+        self.labels[index] = label
+        for step in (-self.grid.width, self.grid.width, -1, 1):
+            neighbor_label = self.labels[index + step]
+            if neighbor_label >= 0:
+                self._union(label, neighbor_label)
+    
+    def split(self, index: int):
+        """
+        Isola a componente real de uma célula com um novo rótulo.
+        
+        Chamado quando uma busca falha entre células que o índice considerava
+        ligadas: percorre a região alcançável a partir de ``index`` e a separa
+        do restante do grupo antigo.
+        
+        Args:
+            index: Índice de uma célula livre no buffer da grade
+        """
+        labels = self.labels
+        label = len(self._parent)
+        self._parent.append(label)
+        offsets = (-self.grid.width, self.grid.width, -1, 1)
+        
+        labels[index] = label
+        stack = [index]
+        while stack:
+            current = stack.pop()
+            for step in offsets:
+                neighbor = current + step
+                neighbor_label = labels[neighbor]
+                if neighbor_label >= 0 and neighbor_label != label:
+                    labels[neighbor] = label
+                    stack.append(neighbor)
+
+
+class SearchStats:
+    """
+    Estatísticas de uma consulta, retornadas por ``PathFinder.find_path_with_stats``.
+    
+    Os contadores detalhados (inserções, remoções obsoletas, pico da fila e
+    tempos por fase) só são preenchidos no modo ``detailed=True``; nos
+    demais casos ficam em zero.
+    
+    Atributos:
+        algorithm: Algoritmo usado
+        nodes_expanded: Número de células expandidas (retiradas da fila e visitadas)
+        elapsed: Tempo da consulta em segundos
+        path_length: Número de posições do caminho (0 se não houver solução)
+        nodes_pushed: Inserções na fila de prioridade
+        stale_pops: Remoções de células já visitadas (entradas obsoletas da fila)
+        peak_open: Maior tamanho da fila durante a busca
+        setup_time: Tempo de preparação (validação e buffers), em segundos
+        search_time: Tempo do laço de busca, em segundos
+        reconstruction_time: Tempo de reconstrução do caminho, em segundos
+    """
+    def __init__(self, algorithm: str):
+        self.algorithm = algorithm
+        self.nodes_expanded = 0
+        self.elapsed = 0.0
+        self.path_length = 0
+        self.nodes_pushed = 0
+        self.stale_pops = 0
+        self.peak_open = 0
+        self.setup_time = 0.0
+        self.search_time = 0.0
+        self.reconstruction_time = 0.0
+    
+    def __repr__(self):
+        text = (f"SearchStats(algorithm={self.algorithm!r}, nodes_expanded={self.nodes_expanded}, "
+                f"elapsed={self.elapsed * 1000:.3f} ms, path_length={self.path_length}")
+        if self.nodes_pushed:
+            text += (f", nodes_pushed={self.nodes_pushed}, stale_pops={self.stale_pops}, "
+                     f"peak_open={self.peak_open}, setup={self.setup_time * 1000:.3f} ms, "
+                     f"search={self.search_time * 1000:.3f} ms, "
+                     f"reconstruction={self.reconstruction_time * 1000:.3f} ms")
+        return text + ")"
+
+
+class BoundedPath(list):
+    """
+    Caminho (lista de posições) com o limite de subotimalidade comprovado.
+    
+    Retornado por ``PathFinder.find_path_bounded`` e ``find_path_anytime``:
+    o comprimento do caminho é no máximo ``bound`` vezes o do menor caminho
+    (``bound == 1.0`` significa caminho mínimo).
+    
+    Atributos:
+        bound: Fator de subotimalidade comprovado (>= 1)
+        epsilon: Último peso da heurística usado na busca
+    """
+    def __init__(self, path: Iterable[Tuple[int, int]], bound: float, epsilon: float):
+        super().__init__(path)
+        self.bound = bound
+        self.epsilon = epsilon
+    
+    def __repr__(self):
+        return f"BoundedPath({list.__repr__(self)}, bound={self.bound:.3f})"
+
+
 class PathFinder:
     """
     Implementa o algoritmo A* para encontrar o menor caminho em um labirinto.
     """
     
-    def __init__(self, maze: List[List[str]]):
+    def __init__(self, maze: Union[List[List[str]], PackedGrid], require_endpoints: bool = True,
+                 cache=None, connectivity: int = 4, corner_cutting: bool = False):
         """
         Inicializa o PathFinder com um labirinto.
         
         Args:
-            maze: Matriz 2D representando o labirinto
+            maze: Matriz 2D representando o labirinto, ou uma PackedGrid
                   'S' = início, 'E' = fim, '0' = livre, '1' = obstáculo
+            require_endpoints: Se True (padrão), exige 'S' e 'E' no labirinto.
+                               Use False para mapas sem S/E consultados com
+                               ``find_path(start, goal)``
+            cache: PathCache opcional (ver ``path_cache``) com caminhos já resolvidos
+            connectivity: 4 (padrão, só movimentos ortogonais) ou 8 (também
+                          diagonais, com custo √2 e heurística octile)
+            corner_cutting: No modo 8, se False (padrão) uma diagonal exige as
+                            duas células ortogonais livres; se True basta uma
+                            (nunca se passa entre duas paredes)
         """
-        self.maze = maze
-        self.rows = len(maze)
-        self.cols = len(maze[0]) if maze else 0
+        if connectivity not in (4, 8):
+            raise ValueError("connectivity deve ser 4 ou 8!")
+        if not isinstance(maze, PackedGrid):
+            maze = PackedGrid.from_matrix(maze)
+        
+        self.grid = maze
+        self.rows = maze.rows
+        self.cols = maze.cols
         self.start = None
         self.end = None
         
+        # Deslocamentos no buffer: cima, baixo, esquerda, direita
+        self._offsets = (-maze.width, maze.width, -1, 1)
+        
+        # Movimentos do modo 8, calculados uma vez: (deslocamento, custo,
+        # lado ortogonal 1, lado ortogonal 2); os lados valem 0 nos ortogonais
+        self.connectivity = connectivity
+        self.corner_cutting = corner_cutting
+        width = maze.width
+        self._moves = tuple((step, 1, 0, 0) for step in self._offsets) + tuple(
+            (rows + cols, SQRT2, rows, cols)
+            for rows in (-width, width) for cols in (-1, 1)
+        )
+        
+        # Buffers da busca, alocados na primeira consulta e reaproveitados
+        self._g_costs = None
+        self._parents = None
+        self._marks = None
+        self._back_buffers = None
+        self._generation = 0
+        
+        # O cache só vale para esta grade (ver PathCache.bind)
+        if cache is not None:
+            cache.bind(maze)
+        self.cache = cache
+        self.components = None
+        self.hierarchy = None
+        self.landmarks = None
+        # Planejadores incrementais que recebem as alterações da grade
+        self._planners = weakref.WeakSet()
+        
+        # Máscara de paredes usada pelo JPS (ver _wall_mask)
+        self._mask = None
+        self._mask_version = -1
+        
+        # Quantidade de células de cada custo de terreno (ver _terrain_counts)
+        self._terrain = None
+        self._terrain_version = -1
+        
+        # Posições de todos os 'E' (ver ends)
+        self._ends = None
+        self._ends_version = -1
+        
         # Encontra as posições de início (S) e fim (E)
-        self._find_start_end()
+        self._find_start_end(require_endpoints)
     
-    def _find_start_end(self):
-        """Localiza as posições de início (S) e fim (E) no labirinto."""
-        for i in range(self.rows):
-            for j in range(self.cols):
-                if self.maze[i][j] == 'S':
-                    self.start = (i, j)
-                elif self.maze[i][j] == 'E':
-                    self.end = (i, j)
+    @property
+    def maze(self) -> List[List[str]]:
+        """Matriz de caracteres equivalente à grade (gerada sob demanda)."""
+        return self.grid.to_matrix()
+    
+    @property
+    def ends(self) -> List[Tuple[int, int]]:
+        """
+        Posições de todos os 'E' da grade, em ordem de linha (``self.end`` é o
+        último). Recalculadas quando a versão da grade muda.
+        """
+        version = self.grid.version
+        if self._ends is None or self._ends_version != version:
+            self._ends = self.grid.find_all('E')
+            self._ends_version = version
+        return self._ends
+    
+    def _find_start_end(self, required: bool = True):
+        """
+        Localiza as posições de início (S) e fim (E) no labirinto.
+        
+        Args:
+            required: Se True, a ausência de 'S' ou 'E' gera ValueError
+        """
+        self.start = self.grid.find_last('S')
+        self.end = self.grid.find_last('E')
         
+        if not required:
+            return
         if self.start is None:
             raise ValueError("Posição inicial 'S' não encontrada no labirinto!")
         if self.end is None:
@@ -90,6 +610,24 @@ class PathFinder:
         """
         return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
     
+    def _octile_distance(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
+        """
+        Calcula a distância octile entre duas posições (heurística do modo 8).
+        
+        Heurística: h(n) = dx + dy + (√2 - 2) * min(dx, dy), ou seja, anda na
+        diagonal enquanto puder e em linha reta no resto.
+        
+        Args:
+            pos1: Primeira posição (linha, coluna)
+            pos2: Segunda posição (linha, coluna)
+            
+        Returns:
+            Distância octile entre as posições
+        """
+        dx = abs(pos1[0] - pos2[0])
+        dy = abs(pos1[1] - pos2[1])
+        return dx + dy + (SQRT2 - 2) * min(dx, dy)
+    
     def _is_valid_position(self, position: Tuple[int, int]) -> bool:
         """
         Verifica se uma posição é válida no labirinto.
@@ -100,21 +638,16 @@ class PathFinder:
         Returns:
             True se a posição é válida, False caso contrário
         """
-        row, col = position
-        
-        # Verifica se está dentro dos limites
-        if row < 0 or row >= self.rows or col < 0 or col >= self.cols:
-            return False
-        
-        # Verifica se não é um obstáculo
-        if self.maze[row][col] == '1':
+        # A borda de paredes só cobre vizinhos a um passo: posições mais
+        # distantes dariam um índice de outra linha ou fora do buffer
+        if not self.grid.contains(position):
             return False
-        
-        return True
+        return self.grid.cells[self.grid.index(position)] != WALL
     
     def _get_neighbors(self, position: Tuple[int, int]) -> List[Tuple[int, int]]:
         """
-        Retorna as posições vizinhas válidas (cima, baixo, esquerda, direita).
+        Retorna as posições vizinhas válidas (cima, baixo, esquerda, direita e,
+        no modo 8, as diagonais permitidas pela regra de quinas).
         
         Args:
             position: Posição atual (linha, coluna)
@@ -122,39 +655,160 @@ class PathFinder:
         Returns:
             Lista de posições vizinhas válidas
         """
-        row, col = position
-        neighbors = []
+        grid = self.grid
+        cells = grid.cells
+        index = grid.index(position)
         
-        # Movimentos possíveis: cima, baixo, esquerda, direita
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        
-        for dr, dc in directions:
-            new_position = (row + dr, col + dc)
-            if self._is_valid_position(new_position):
-                neighbors.append(new_position)
+        if self.connectivity == 4:
+            return [
+                grid.position(index + step)
+                for step in self._offsets
+                if cells[index + step] != WALL
+            ]
         
+        neighbors = []
+        for step, _, side_a, side_b in self._moves:
+            if cells[index + step] == WALL:
+                continue
+            if side_a:
+                blocked_a = cells[index + side_a] == WALL
+                blocked_b = cells[index + side_b] == WALL
+                if (blocked_a and blocked_b) if self.corner_cutting else (blocked_a or blocked_b):
+                    continue
+            neighbors.append(grid.position(index + step))
         return neighbors
     
-    def _reconstruct_path(self, node: Node) -> List[Tuple[int, int]]:
+    def _reconstruct_path(self, parents: array, index: int) -> List[Tuple[int, int]]:
         """
-        Reconstrói o caminho do início ao fim seguindo os nós pais.
+        Reconstrói o caminho do início ao fim seguindo o vetor de pais.
         
         Args:
-            node: Nó final do caminho
+            parents: Vetor plano com o índice do pai de cada célula (-1 na raiz)
+            index: Índice da célula final no buffer da grade
             
         Returns:
             Lista de posições do início ao fim
         """
+        position = self.grid.position
         path = []
-        current = node
+        current = index
         
-        while current is not None:
-            path.append(current.position)
-            current = current.parent
+        while current != -1:
+            path.append(position(current))
+            current = parents[current]
         
         return path[::-1]  # Inverte para começar do início
     
-    def find_path(self) -> Optional[List[Tuple[int, int]]]:
+    def _walk_parents(self, index: int, generation: int) -> Iterator[Tuple[int, int]]:
+        """
+        Percorre o vetor de pais a partir de uma célula, sem montar uma lista.
+        
+        Args:
+            index: Índice da primeira célula no buffer da grade
+            generation: Geração da busca que preencheu os pais
+            
+        Yields:
+            Posições, da célula dada até a raiz da árvore de busca
+        """
+        position = self.grid.position
+        parents = self._parents
+        current = index
+        
+        while current != -1:
+            yield position(current)
+            # Os pais só valem enquanto nenhuma outra busca rodou neste PathFinder
+            if self._generation != generation:
+                raise RuntimeError("Outra consulta reutilizou os buffers antes do fim da iteração!")
+            current = parents[current]
+    
+    def _resolve_endpoints(self, start: Optional[Tuple[int, int]],
+                           goal: Optional[Tuple[int, int]]) -> Tuple[int, int]:
+        """
+        Valida as extremidades de uma consulta e as converte em índices.
+        
+        Args:
+            start: Posição inicial, ou None para usar o 'S' do labirinto
+            goal: Posição final, ou None para usar o 'E' do labirinto
+            
+        Returns:
+            Tupla (índice inicial, índice final) no buffer da grade
+        """
+        start = self.start if start is None else start
+        goal = self.end if goal is None else goal
+        
+        if start is None or goal is None:
+            raise ValueError("Informe o início e o fim: o labirinto não tem 'S'/'E'!")
+        
+        for name, position in (("inicial", start), ("final", goal)):
+            if not self.grid.contains(position):
+                raise ValueError(f"Posição {name} {tuple(position)} fora dos limites do labirinto!")
+        
+        return self.grid.index(start), self.grid.index(goal)
+    
+    def _next_generation(self) -> Tuple[int, int]:
+        """
+        Prepara os buffers da busca para uma nova consulta.
+        
+        Em vez de limpar os buffers, cada consulta usa um novo par de marcas:
+        ``marks[i] == 2 * geração`` indica que g[i] e pais[i] são válidos
+        nesta consulta e ``2 * geração + 1`` que a célula já foi visitada.
+        Valores menores são restos de consultas anteriores e são ignorados.
+        
+        Returns:
+            Tupla (marca de aberto, marca de visitado) desta consulta
+        """
+        n_cells = len(self.grid.cells)
+        self._generation += 1
+        
+        # Primeira consulta ou estouro do contador: (re)aloca os buffers zerados
+        if self._marks is None or 2 * self._generation + 1 > 0xFFFFFFFF:
+            # Custos fracionários (√2) no modo 8-conectado
+            if self.connectivity == 8:
+                self._g_costs = array('d', [0.0]) * n_cells
+            else:
+                self._g_costs = array('i', [0]) * n_cells
+            self._parents = array('i', [-1]) * n_cells
+            self._marks = array('I', [0]) * n_cells
+            self._back_buffers = None
+            self._generation = 1
+        
+        open_mark = 2 * self._generation
+        return open_mark, open_mark + 1
+    
+    def _backward_buffers(self) -> Tuple[array, array, array]:
+        """
+        Retorna os buffers (custos g, pais, marcas) da busca no sentido inverso.
+        
+        Usados pela busca bidirecional junto com os buffers normais; seguem as
+        mesmas marcas de geração e também são alocados uma única vez.
+        """
+        if self._back_buffers is None:
+            n_cells = len(self.grid.cells)
+            self._back_buffers = (
+                array('i', [0]) * n_cells,
+                array('i', [-1]) * n_cells,
+                array('I', [0]) * n_cells,
+            )
+        return self._back_buffers
+    
+    # Algoritmos aceitos por find_path e o método que implementa cada um
+    _ALGORITHMS = {
+        'astar': '_astar',
+        'jps': '_jps',
+        'bidirectional': '_bidirectional',
+        'hpa': '_hpa',
+        'alt': '_alt',
+        'weighted': '_weighted',
+    }
+    
+    # Algoritmos que sempre retornam caminhos mínimos (os únicos guardados no cache).
+    # 'weighted' minimiza o custo do terreno, não o número de passos, então
+    # seus caminhos não podem ser misturados com os dos outros no cache
+    _OPTIMAL_ALGORITHMS = ('astar', 'jps', 'bidirectional', 'alt')
+    
+    def find_path(self, start: Optional[Tuple[int, int]] = None,
+                  goal: Optional[Tuple[int, int]] = None,
+                  algorithm: str = 'astar') -> Optional[List[Tuple[int, int]]]:
         """
         Executa o algoritmo A* para encontrar o menor caminho.
         
@@ -167,95 +821,1648 @@ class PathFinder:
            - Calcula h (heurística do vizinho até o fim)
            - Adiciona o vizinho à fila se for um caminho melhor
         
+        Cada célula é identificada pelo seu índice no buffer da PackedGrid.
+        Os custos g, os pais e as marcas de visitado ficam em buffers planos
+        alocados uma única vez e reaproveitados entre consultas (ver
+        ``_next_generation``); a fila guarda apenas tuplas ``(f, h, índice)``.
+        Por isso uma mesma instância não deve ser usada por várias threads ao
+        mesmo tempo.
+        
+        Args:
+            start: Posição inicial (padrão: o 'S' do labirinto)
+            goal: Posição final (padrão: o 'E' do labirinto)
+            algorithm: 'astar' (padrão), 'jps' (Jump Point Search, ver ``_jps``)
+                       'bidirectional' (ver ``_bidirectional``) ou 'alt'
+                       (heurística de marcos, ver ``build_landmarks``), que
+                       retornam caminhos de comprimento mínimo, 'hpa'
+                       (hierárquico, quase ótimo; ver ``build_hierarchy``)
+                       ou 'weighted' (custo mínimo com terreno, ver ``_weighted``)
+        
         Returns:
             Lista de posições do caminho encontrado, ou None se não houver solução
         """
-        # Fila de prioridade (heap) para nós a explorar
-        open_list = []
-        # Conjunto de posições já visitadas
-        closed_set: Set[Tuple[int, int]] = set()
-        # Dicionário para rastrear o melhor custo g para cada posição
-        g_costs = {self.start: 0}
-        
-        # Cria o nó inicial
-        start_node = Node(
-            position=self.start,
-            g=0,
-            h=self._manhattan_distance(self.start, self.end),
-            parent=None
-        )
+        if algorithm not in self._ALGORITHMS:
+            raise ValueError(f"Algoritmo desconhecido: {algorithm!r}")
+        if self.connectivity == 8 and algorithm != 'astar':
+            raise ValueError(f"O algoritmo {algorithm!r} só funciona com connectivity=4!")
+        
+        start, goal = self._resolve_endpoints(start, goal)
+        
+        cache = self.cache
+        # O cache pode ser compartilhado entre PathFinders da mesma grade: só
+        # guarda caminhos 4-conectados
+        if cache is None or algorithm not in self._OPTIMAL_ALGORITHMS or self.connectivity == 8:
+            return self._search(start, goal, algorithm)
+        
+        version = self.grid.version
+        found, path = cache.get(version, start, goal)
+        if not found:
+            path = self._search(start, goal, algorithm)
+            cells = None if path is None else [self.grid.index(pos) for pos in path]
+            cache.put(version, start, goal, path, cells)
+        return path
+    
+    def _search(self, start: int, goal: int, algorithm: str = 'astar'
+                ) -> Optional[List[Tuple[int, int]]]:
+        """
+        Resolve uma consulta entre dois índices, consultando antes o índice de
+        componentes (se houver) para descartar pares desconectados em O(1).
+        
+        Args:
+            start: Índice inicial no buffer da grade
+            goal: Índice final no buffer da grade
+            algorithm: Nome do algoritmo (chave de ``_ALGORITHMS``)
+            
+        Returns:
+            Lista de posições do caminho encontrado, ou None se não houver solução
+        """
+        if self.connectivity == 8:
+            search = self._astar8
+        else:
+            search = getattr(self, self._ALGORITHMS[algorithm])
+        
+        # A regra de quinas nunca liga células que não estejam ligadas
+        # ortogonalmente, então o índice de componentes vale nos dois modos
+        components = self.components
+        if components is None:
+            return search(start, goal)
+        
+        if components.version != self.grid.version:
+            components.rebuild()
+        if not components.connected(start, goal):
+            return None
+        
+        path = search(start, goal)
+        if path is None:
+            # O índice considerava os pontos ligados: algum bloqueio dividiu a componente
+            components.split(start)
+        return path
+    
+    def _astar(self, start: int, goal: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Núcleo do A* entre dois índices da grade (ver ``find_path``).
+        
+        Args:
+            start: Índice inicial no buffer da grade
+            goal: Índice final no buffer da grade
+            
+        Returns:
+            Lista de posições do caminho encontrado, ou None se não houver solução
+        """
+        if not self._astar_tree(start, goal):
+            return None
+        return self._reconstruct_path(self._parents, goal)
+    
+    def _astar_tree(self, start: int, goal: int) -> bool:
+        """
+        Executa o A* e deixa a árvore de pais da busca em ``self._parents``.
+        
+        Args:
+            start: Índice inicial no buffer da grade
+            goal: Índice final no buffer da grade
+            
+        Returns:
+            True se o fim foi alcançado (o caminho pode ser lido dos pais)
+        """
+        grid = self.grid
+        cells = grid.cells
+        if cells[start] == WALL or cells[goal] == WALL:
+            return False
         
-        heapq.heappush(open_list, start_node)
+        width = grid.width
+        offsets = self._offsets
+        base = grid.offset
+        goal_row, goal_col = divmod(goal - base, width)
+        start_row, start_col = divmod(start - base, width)
+        
+        open_mark, closed_mark = self._next_generation()
+        # Melhor custo g conhecido para cada célula (válido se marks == open_mark)
+        g_costs = self._g_costs
+        # Índice do pai de cada célula no melhor caminho conhecido
+        parents = self._parents
+        # Marcas da geração atual (aberto / visitado)
+        marks = self._marks
+        
+        g_costs[start] = 0
+        parents[start] = -1
+        marks[start] = open_mark
+        h = abs(start_row - goal_row) + abs(start_col - goal_col)
+        
+        # Fila de prioridade (heap) com tuplas (f, h, índice)
+        open_list = [(h, h, start)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
         
         # Loop principal do A*
         while open_list:
             # Remove o nó com menor f da fila
-            current_node = heapq.heappop(open_list)
-            current_pos = current_node.position
+            current = heappop(open_list)[2]
             
             # Se já visitamos esta posição, pula
-            if current_pos in closed_set:
+            if marks[current] == closed_mark:
                 continue
             
             # Marca como visitada
-            closed_set.add(current_pos)
+            marks[current] = closed_mark
             
-            # Se chegamos ao objetivo, reconstrói o caminho
-            if current_pos == self.end:
-                return self._reconstruct_path(current_node)
+            # Se chegamos ao objetivo, o caminho está na árvore de pais
+            if current == goal:
+                return True
             
-            # Explora os vizinhos
-            for neighbor_pos in self._get_neighbors(current_pos):
-                # Se já visitamos, pula
-                if neighbor_pos in closed_set:
-                    continue
+            # Calcula o novo custo g (custo atual + 1)
+            new_g = g_costs[current] + 1
+            
+            # Explora os vizinhos: a borda de paredes dispensa checar limites
+            for step in offsets:
+                neighbor = current + step
                 
-                # Calcula o novo custo g (custo atual + 1)
-                new_g = current_node.g + 1
+                # Obstáculo ou já visitado: pula
+                mark = marks[neighbor]
+                if mark == closed_mark or cells[neighbor] == WALL:
+                    continue
                 
                 # Se encontramos um caminho melhor ou é a primeira vez visitando
-                if neighbor_pos not in g_costs or new_g < g_costs[neighbor_pos]:
-                    g_costs[neighbor_pos] = new_g
-                    
-                    # Cria o nó vizinho
-                    neighbor_node = Node(
-                        position=neighbor_pos,
-                        g=new_g,
-                        h=self._manhattan_distance(neighbor_pos, self.end),
-                        parent=current_node
-                    )
-                    
-                    heapq.heappush(open_list, neighbor_node)
+                if mark != open_mark or new_g < g_costs[neighbor]:
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    marks[neighbor] = open_mark
+                    n_row, n_col = divmod(neighbor - base, width)
+                    h = abs(n_row - goal_row) + abs(n_col - goal_col)
+                    heappush(open_list, (new_g + h, h, neighbor))
         
         # Se a fila está vazia e não chegamos ao objetivo, não há solução
-        return None
+        return False
     
-    def display_maze_with_path(self, path: List[Tuple[int, int]]) -> str:
+    def _astar8(self, start: int, goal: int) -> Optional[List[Tuple[int, int]]]:
         """
-        Cria uma representação visual do labirinto com o caminho destacado.
+        A* 8-conectado (ver ``_astar8_tree``).
         
         Args:
-            path: Lista de posições do caminho encontrado
+            start: Índice inicial no buffer da grade
+            goal: Índice final no buffer da grade
             
         Returns:
-            String com o labirinto e caminho destacado
+            Lista de posições do caminho encontrado, ou None se não houver solução
+        """
+        if not self._astar8_tree(start, goal):
+            return None
+        return self._reconstruct_path(self._parents, goal)
+    
+    def _astar8_tree(self, start: int, goal: int) -> bool:
         """
-        # Cria uma cópia do labirinto para não modificar o original
-        display = [row[:] for row in self.maze]
+        Executa o A* com movimentos diagonais e deixa a árvore em ``self._parents``.
         
-        # Marca o caminho com '*' (exceto início e fim)
-        for pos in path:
-            if pos != self.start and pos != self.end:
-                display[pos[0]][pos[1]] = '*'
+        Mesmo laço de ``_astar_tree``, mas percorrendo ``self._moves`` (os oito
+        movimentos, pré-calculados no construtor) com custo 1 ou √2 e
+        heurística octile. Uma diagonal só é aceita se a regra de quinas
+        permitir (ver ``corner_cutting`` no construtor).
         
-        # Converte para string
-        result = []
-        for row in display:
-            result.append(' '.join(row))
+        Args:
+            start: Índice inicial no buffer da grade
+            goal: Índice final no buffer da grade
+            
+        Returns:
+            True se o fim foi alcançado (o caminho pode ser lido dos pais)
+        """
+        grid = self.grid
+        cells = grid.cells
+        if cells[start] == WALL or cells[goal] == WALL:
+            return False
         
-        return '\n'.join(result)
-
-
+        width = grid.width
+        moves = self._moves
+        corner_cutting = self.corner_cutting
+        base = grid.offset
+        diagonal_extra = SQRT2 - 2
+        goal_row, goal_col = divmod(goal - base, width)
+        start_row, start_col = divmod(start - base, width)
+        
+        open_mark, closed_mark = self._next_generation()
+        g_costs = self._g_costs
+        parents = self._parents
+        marks = self._marks
+        
+        g_costs[start] = 0.0
+        parents[start] = -1
+        marks[start] = open_mark
+        dx, dy = abs(start_row - goal_row), abs(start_col - goal_col)
+        h = dx + dy + diagonal_extra * (dx if dx < dy else dy)
+        
+        open_list = [(h, h, start)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        while open_list:
+            current = heappop(open_list)[2]
+            if marks[current] == closed_mark:
+                continue
+            marks[current] = closed_mark
+            
+            if current == goal:
+                return True
+            
+            g = g_costs[current]
+            for step, cost, side_a, side_b in moves:
+                neighbor = current + step
+                mark = marks[neighbor]
+                if mark == closed_mark or cells[neighbor] == WALL:
+                    continue
+                
+                # Diagonal: confere as duas células ortogonais atravessadas
+                if side_a:
+                    blocked_a = cells[current + side_a] == WALL
+                    blocked_b = cells[current + side_b] == WALL
+                    if (blocked_a and blocked_b) if corner_cutting else (blocked_a or blocked_b):
+                        continue
+                
+                new_g = g + cost
+                if mark != open_mark or new_g < g_costs[neighbor]:
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    marks[neighbor] = open_mark
+                    n_row, n_col = divmod(neighbor - base, width)
+                    dx, dy = abs(n_row - goal_row), abs(n_col - goal_col)
+                    h = dx + dy + diagonal_extra * (dx if dx < dy else dy)
+                    heappush(open_list, (new_g + h, h, neighbor))
+        
+        return False
+    
+    def _jps(self, start: int, goal: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Jump Point Search para grades 4-conectadas de custo uniforme.
+        
+        Em vez de inserir na fila cada célula vizinha, a busca "salta" em linha
+        reta e só para em pontos de salto, descartando caminhos simétricos
+        (mesmo comprimento, mesma região). Regras usadas:
+        
+        - Movimento horizontal: segue na mesma direção; só vira para cima ou
+          para baixo em um vizinho forçado, isto é, quando a célula vertical
+          está livre mas a célula correspondente logo atrás é parede.
+        - Movimento vertical: segue na mesma direção e, a cada célula, tenta
+          saltos horizontais para os dois lados; se algum encontrar um ponto de
+          salto, a célula atual também é um ponto de salto.
+        
+        Os custos entre pontos de salto são distâncias em linha reta, e o
+        caminho final é expandido célula a célula, no mesmo formato do A*.
+        
+        Args:
+            start: Índice inicial no buffer da grade
+            goal: Índice final no buffer da grade
+            
+        Returns:
+            Lista de posições do caminho encontrado, ou None se não houver solução
+        """
+        grid = self.grid
+        cells = grid.cells
+        if cells[start] == WALL or cells[goal] == WALL:
+            return None
+        
+        width = grid.width
+        base = grid.offset
+        goal_row, goal_col = divmod(goal - base, width)
+        
+        # Máscara binária da grade ('1' = parede, '0' = livre) para varrer as
+        # linhas com find/rfind em vez de testar célula por célula
+        mask = self._wall_mask()
+        find, rfind = mask.find, mask.rfind
+        
+        def jump_horizontal(index: int, step: int) -> int:
+            """Salta na horizontal; retorna o ponto de salto ou -1."""
+            if step == 1:
+                # Próxima parede à direita (a borda garante que existe)
+                wall = find(b'1', index + 1)
+                stop = wall
+                # Vizinho forçado: parede seguida de célula livre na linha de cima/baixo
+                above = find(b'10', index - width, wall - width)
+                if above != -1:
+                    stop = above + 1 + width
+                below = find(b'10', index + width, wall + width)
+                if below != -1 and below + 1 - width < stop:
+                    stop = below + 1 - width
+                if index < goal < stop:
+                    return goal
+            else:
+                wall = rfind(b'1', 0, index)
+                stop = wall
+                above = rfind(b'01', wall + 1 - width, index + 1 - width)
+                if above != -1:
+                    stop = above + width
+                below = rfind(b'01', wall + 1 + width, index + 1 + width)
+                if below != -1 and below - width > stop:
+                    stop = below - width
+                if stop < goal < index:
+                    return goal
+            return -1 if stop == wall else stop
+        
+        def jump_vertical(index: int, step: int) -> int:
+            """Salta na vertical; retorna o ponto de salto ou -1."""
+            while True:
+                index += step
+                if cells[index] == WALL:
+                    return -1
+                if index == goal:
+                    return index
+                if jump_horizontal(index, 1) != -1 or jump_horizontal(index, -1) != -1:
+                    return index
+        
+        open_mark, closed_mark = self._next_generation()
+        g_costs = self._g_costs
+        parents = self._parents
+        marks = self._marks
+        
+        g_costs[start] = 0
+        parents[start] = -1
+        marks[start] = open_mark
+        start_row, start_col = divmod(start - base, width)
+        h = abs(start_row - goal_row) + abs(start_col - goal_col)
+        open_list = [(h, h, start)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        while open_list:
+            current = heappop(open_list)[2]
+            if marks[current] == closed_mark:
+                continue
+            marks[current] = closed_mark
+            
+            if current == goal:
+                return self._expand_jump_path(parents, current)
+            
+            row, col = divmod(current - base, width)
+            parent = parents[current]
+            
+            # Saltos a partir do nó atual, conforme a direção de chegada
+            if parent == -1:
+                jumps = (jump_horizontal(current, 1), jump_horizontal(current, -1),
+                         jump_vertical(current, width), jump_vertical(current, -width))
+            elif (parent - base) // width == row:
+                step = 1 if current > parent else -1
+                jumps = [jump_horizontal(current, step)]
+                for vertical in (-width, width):
+                    if cells[current + vertical] != WALL and cells[current - step + vertical] == WALL:
+                        jumps.append(jump_vertical(current, vertical))
+            else:
+                step = width if current > parent else -width
+                jumps = (jump_vertical(current, step),
+                         jump_horizontal(current, 1), jump_horizontal(current, -1))
+            
+            for neighbor in jumps:
+                if neighbor == -1:
+                    continue
+                mark = marks[neighbor]
+                if mark == closed_mark:
+                    continue
+                
+                n_row, n_col = divmod(neighbor - base, width)
+                new_g = g_costs[current] + abs(n_row - row) + abs(n_col - col)
+                if mark != open_mark or new_g < g_costs[neighbor]:
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    marks[neighbor] = open_mark
+                    h = abs(n_row - goal_row) + abs(n_col - goal_col)
+                    heappush(open_list, (new_g + h, h, neighbor))
+        
+        return None
+    
+    def _bidirectional(self, start: int, goal: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        A* bidirecional: busca a partir de S e de E ao mesmo tempo.
+        
+        A busca direta usa a distância de Manhattan até o fim e a inversa a
+        distância até o início. A cada passo expande o lado com a menor fila.
+        Sempre que um lado alcança uma célula já alcançada pelo outro, o
+        custo do caminho que passa por ela vira candidato (mu). A busca para
+        quando o menor f de alguma das filas é >= mu: nenhum caminho ainda não
+        encontrado pode ser mais curto que o melhor já conhecido.
+        
+        Args:
+            start: Índice inicial no buffer da grade
+            goal: Índice final no buffer da grade
+            
+        Returns:
+            Lista de posições do caminho encontrado, ou None se não houver solução
+        """
+        grid = self.grid
+        cells = grid.cells
+        if cells[start] == WALL or cells[goal] == WALL:
+            return None
+        if start == goal:
+            return [grid.position(start)]
+        
+        width = grid.width
+        base = grid.offset
+        offsets = self._offsets
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        open_mark, closed_mark = self._next_generation()
+        g_forward, parents_forward, marks_forward = self._g_costs, self._parents, self._marks
+        g_backward, parents_backward, marks_backward = self._backward_buffers()
+        
+        start_row, start_col = divmod(start - base, width)
+        goal_row, goal_col = divmod(goal - base, width)
+        h = abs(start_row - goal_row) + abs(start_col - goal_col)
+        
+        for g_costs, parents, marks, index in (
+            (g_forward, parents_forward, marks_forward, start),
+            (g_backward, parents_backward, marks_backward, goal),
+        ):
+            g_costs[index] = 0
+            parents[index] = -1
+            marks[index] = open_mark
+        
+        open_forward = [(h, h, start)]
+        open_backward = [(h, h, goal)]
+        # Cada lado: fila, g, pais, marcas, alvo da heurística, marcas e g do outro lado
+        sides = (
+            (open_forward, g_forward, parents_forward, marks_forward,
+             goal_row, goal_col, marks_backward, g_backward),
+            (open_backward, g_backward, parents_backward, marks_backward,
+             start_row, start_col, marks_forward, g_forward),
+        )
+        
+        best = -1        # mu: custo do melhor caminho encontrado (-1 = nenhum)
+        meeting = -1     # célula onde as duas buscas se encontraram
+        
+        while open_forward and open_backward:
+            if best != -1 and (open_forward[0][0] >= best or open_backward[0][0] >= best):
+                break
+            
+            side = sides[0] if len(open_forward) <= len(open_backward) else sides[1]
+            open_list, g_costs, parents, marks, target_row, target_col, other_marks, other_g = side
+            
+            current = heappop(open_list)[2]
+            if marks[current] == closed_mark:
+                continue
+            marks[current] = closed_mark
+            
+            new_g = g_costs[current] + 1
+            for step in offsets:
+                neighbor = current + step
+                mark = marks[neighbor]
+                if mark == closed_mark or cells[neighbor] == WALL:
+                    continue
+                
+                if mark != open_mark or new_g < g_costs[neighbor]:
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    marks[neighbor] = open_mark
+                    n_row, n_col = divmod(neighbor - base, width)
+                    h = abs(n_row - target_row) + abs(n_col - target_col)
+                    heappush(open_list, (new_g + h, h, neighbor))
+                
+                # O outro lado já alcançou este vizinho: caminho candidato
+                if other_marks[neighbor] >= open_mark:
+                    total = g_costs[neighbor] + other_g[neighbor]
+                    if best == -1 or total < best:
+                        best = total
+                        meeting = neighbor
+        
+        if meeting == -1:
+            return None
+        
+        # Junta início -> encontro (busca direta) e encontro -> fim (busca inversa)
+        path = self._reconstruct_path(parents_forward, meeting)
+        current = parents_backward[meeting]
+        while current != -1:
+            path.append(grid.position(current))
+            current = parents_backward[current]
+        return path
+    
+    def _hpa(self, start: int, goal: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Busca hierárquica (HPA*) usando a abstração de ``build_hierarchy``.
+        
+        Args:
+            start: Índice inicial no buffer da grade
+            goal: Índice final no buffer da grade
+            
+        Returns:
+            Lista de posições do caminho encontrado, ou None se não houver solução
+        """
+        if self.hierarchy is None:
+            raise ValueError("Use build_hierarchy() ou load_hierarchy() antes do algoritmo 'hpa'!")
+        return self.hierarchy.find_path(start, goal)
+    
+    def _alt(self, start: int, goal: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        A* com a heurística ALT das tabelas de ``build_landmarks``.
+        
+        O laço é o mesmo de ``_astar``; só o h muda: o maior entre a distância
+        de Manhattan e os limites |d(L, fim) - d(L, n)| de cada marco L. Em
+        labirintos com paredes longas esse limite fica muito mais perto da
+        distância real e a busca expande bem menos células.
+        
+        Args:
+            start: Índice inicial no buffer da grade
+            goal: Índice final no buffer da grade
+            
+        Returns:
+            Lista de posições do caminho encontrado, ou None se não houver solução
+        """
+        landmarks = self.landmarks
+        if landmarks is None:
+            raise ValueError("Use build_landmarks() ou load_landmarks() antes do algoritmo 'alt'!")
+        # Tabelas de outra versão da grade deixariam de ser admissíveis
+        landmarks.refresh()
+        
+        grid = self.grid
+        cells = grid.cells
+        if cells[start] == WALL or cells[goal] == WALL:
+            return None
+        
+        width = grid.width
+        offsets = self._offsets
+        base = grid.offset
+        goal_row, goal_col = divmod(goal - base, width)
+        bounds = landmarks.goal_tables(goal)
+        
+        open_mark, closed_mark = self._next_generation()
+        g_costs = self._g_costs
+        parents = self._parents
+        marks = self._marks
+        
+        g_costs[start] = 0
+        parents[start] = -1
+        marks[start] = open_mark
+        h = landmarks.heuristic(start, goal)
+        
+        open_list = [(h, h, start)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        while open_list:
+            current = heappop(open_list)[2]
+            if marks[current] == closed_mark:
+                continue
+            marks[current] = closed_mark
+            
+            if current == goal:
+                return self._reconstruct_path(parents, current)
+            
+            new_g = g_costs[current] + 1
+            for step in offsets:
+                neighbor = current + step
+                mark = marks[neighbor]
+                if mark == closed_mark or cells[neighbor] == WALL:
+                    continue
+                
+                if mark != open_mark or new_g < g_costs[neighbor]:
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    marks[neighbor] = open_mark
+                    
+                    relative = neighbor - base
+                    n_row, n_col = divmod(relative, width)
+                    h = abs(n_row - goal_row) + abs(n_col - goal_col)
+                    for table, goal_distance in bounds:
+                        bound = table[relative] - goal_distance
+                        if bound < 0:
+                            bound = -bound
+                        if bound > h:
+                            h = bound
+                    heappush(open_list, (new_g + h, h, neighbor))
+        
+        return None
+    
+    def _weighted(self, start: int, goal: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        A* de custo mínimo em mapas com terreno, com fila de baldes.
+        
+        Entrar numa célula custa 1 ('0', 'S', 'E') ou o valor do dígito ('2' a
+        '9'); '1' continua sendo parede, então os mapas antigos valem sem
+        mudança. A heurística é a distância de Manhattan escalada pelo menor
+        custo de terreno do mapa (o último passo, que entra no fim, usa o
+        custo do próprio fim), o que a mantém admissível e consistente.
+        
+        Como os custos são inteiros pequenos e a heurística é consistente, o
+        f retirado da fila nunca diminui. Por isso a fila é um vetor de
+        baldes indexado por f, percorrido por um cursor que só avança:
+        inserir e remover custam O(1) amortizado, sem o log do heap.
+        
+        Args:
+            start: Índice inicial no buffer da grade
+            goal: Índice final no buffer da grade
+            
+        Returns:
+            Lista de posições do caminho de menor custo, ou None se não houver solução
+        """
+        grid = self.grid
+        cells = grid.cells
+        costs = _TERRAIN_COST
+        goal_cost = costs[cells[goal]]
+        if not costs[cells[start]] or not goal_cost:
+            return None
+        
+        width = grid.width
+        offsets = self._offsets
+        base = grid.offset
+        goal_row, goal_col = divmod(goal - base, width)
+        start_row, start_col = divmod(start - base, width)
+        
+        # Menor custo de terreno entre as células que não são o fim
+        counts = list(self._terrain_counts())
+        counts[goal_cost] -= 1
+        min_cost = next((cost for cost in range(1, 10) if counts[cost] > 0), 1)
+        # h(n) = min_cost * (d - 1) + goal_cost, com d = Manhattan (0 no fim)
+        h_offset = goal_cost - min_cost
+        
+        open_mark, closed_mark = self._next_generation()
+        g_costs = self._g_costs
+        parents = self._parents
+        marks = self._marks
+        
+        g_costs[start] = 0
+        parents[start] = -1
+        marks[start] = open_mark
+        distance = abs(start_row - goal_row) + abs(start_col - goal_col)
+        f = distance * min_cost + h_offset if distance else 0
+        
+        # Fila de baldes: buckets[f] guarda os índices inseridos com aquele f
+        buckets = [[] for _ in range(f + 1)]
+        buckets[f].append(start)
+        cursor = f
+        
+        while True:
+            # Avança até o próximo balde não vazio
+            while cursor < len(buckets) and not buckets[cursor]:
+                cursor += 1
+            if cursor == len(buckets):
+                return None
+            
+            current = buckets[cursor].pop()
+            if marks[current] == closed_mark:
+                continue
+            marks[current] = closed_mark
+            
+            if current == goal:
+                return self._reconstruct_path(parents, current)
+            
+            g = g_costs[current]
+            for step in offsets:
+                neighbor = current + step
+                cost = costs[cells[neighbor]]
+                mark = marks[neighbor]
+                if not cost or mark == closed_mark:
+                    continue
+                
+                new_g = g + cost
+                if mark != open_mark or new_g < g_costs[neighbor]:
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    marks[neighbor] = open_mark
+                    n_row, n_col = divmod(neighbor - base, width)
+                    distance = abs(n_row - goal_row) + abs(n_col - goal_col)
+                    f = new_g + (distance * min_cost + h_offset if distance else 0)
+                    if f >= len(buckets):
+                        buckets.extend([] for _ in range(f + 1 - len(buckets)))
+                    buckets[f].append(neighbor)
+    
+    def _terrain_counts(self) -> Tuple[int, ...]:
+        """
+        Quantidade de células transitáveis de cada custo (índices 1 a 9),
+        calculada uma vez por versão da grade.
+        """
+        version = self.grid.version
+        if self._terrain is None or self._terrain_version != version:
+            grid = self.grid
+            size = (grid.rows + 2) * grid.width
+            terrain = bytes(grid.cells[grid.offset:grid.offset + size]).translate(_TERRAIN_COST)
+            self._terrain = tuple(terrain.count(cost) for cost in range(10))
+            self._terrain_version = version
+        return self._terrain
+    
+    def path_cost(self, path: Optional[List[Tuple[int, int]]]) -> Optional[int]:
+        """
+        Custo de um caminho no modo com terreno (soma dos custos das células
+        em que se entra; a posição inicial não conta).
+        
+        Args:
+            path: Lista de posições (ou None)
+            
+        Returns:
+            Custo total, ou None se não houver caminho
+        """
+        if path is None:
+            return None
+        cells, index = self.grid.cells, self.grid.index
+        return sum(_TERRAIN_COST[cells[index(pos)]] for pos in path[1:])
+    
+    def _wall_mask(self) -> bytes:
+        """
+        Retorna a grade convertida para '1' (parede) e '0' (qualquer célula
+        transitável), gerada uma vez por versão da grade.
+        
+        Returns:
+            Bytes com o mesmo layout (e índices) do buffer da grade
+        """
+        version = self.grid.version
+        if self._mask is None or self._mask_version != version:
+            self._mask = bytes(self.grid.cells).translate(_WALL_MASK_TABLE)
+            self._mask_version = version
+        return self._mask
+    
+    def _expand_jump_path(self, parents: array, index: int) -> List[Tuple[int, int]]:
+        """
+        Reconstrói o caminho de uma busca por saltos, preenchendo as células
+        entre pontos de salto consecutivos (sempre na mesma linha ou coluna).
+        
+        Args:
+            parents: Vetor de pais (ligando pontos de salto)
+            index: Índice do ponto de salto final
+            
+        Returns:
+            Lista de posições do início ao fim, célula a célula
+        """
+        jump_points = self._reconstruct_path(parents, index)
+        path = jump_points[:1]
+        
+        for (row, col), (next_row, next_col) in zip(jump_points, jump_points[1:]):
+            if row == next_row:
+                step = 1 if next_col > col else -1
+                path.extend((row, c) for c in range(col + step, next_col + step, step))
+            else:
+                step = 1 if next_row > row else -1
+                path.extend((r, col) for r in range(row + step, next_row + step, step))
+        
+        return path
+    
+    def iter_path(self, start: Optional[Tuple[int, int]] = None,
+                  goal: Optional[Tuple[int, int]] = None) -> Iterator[Tuple[int, int]]:
+        """
+        Gera os passos do menor caminho, do início ao fim, sob demanda.
+        
+        A busca é feita do fim para o início: assim a árvore de pais já aponta
+        do início em direção ao fim e os passos saem na ordem certa, um a um,
+        sem montar nem inverter a lista do caminho. Útil quando só os
+        primeiros movimentos interessam (``itertools.islice(..., 3)``).
+        
+        A busca acontece na chamada; o iterador apenas lê os buffers da busca,
+        então deve ser consumido antes da próxima consulta neste PathFinder
+        (caso contrário gera RuntimeError).
+        
+        Args:
+            start: Posição inicial (padrão: o 'S' do labirinto)
+            goal: Posição final (padrão: o 'E' do labirinto)
+            
+        Returns:
+            Iterador de posições (vazio se não houver solução)
+        """
+        start, goal = self._resolve_endpoints(start, goal)
+        if self._disconnected(start, goal):
+            return iter(())
+        
+        tree = self._astar8_tree if self.connectivity == 8 else self._astar_tree
+        if not tree(goal, start):
+            return iter(())
+        return self._walk_parents(start, self._generation)
+    
+    def _disconnected(self, start: int, goal: int) -> bool:
+        """
+        Consulta o índice de componentes (se houver) para um par de índices.
+        
+        Returns:
+            True se o índice garante que não há caminho entre os dois
+        """
+        components = self.components
+        if components is None:
+            return False
+        if components.version != self.grid.version:
+            components.rebuild()
+        return not components.connected(start, goal)
+    
+    def find_path_bounded(self, start: Optional[Tuple[int, int]] = None,
+                          goal: Optional[Tuple[int, int]] = None,
+                          epsilon: float = 1.5) -> Optional[BoundedPath]:
+        """
+        A* ponderado: f = g + epsilon * h.
+        
+        Dar mais peso à heurística faz a busca ir direto ao objetivo e
+        expandir bem menos células; em troca, o caminho pode ser até
+        ``epsilon`` vezes mais longo que o mínimo. O limite retornado costuma
+        ser mais justo que ``epsilon``: é o custo encontrado dividido pelo
+        menor g + h ainda pendente (um limite inferior do custo ótimo).
+        
+        Args:
+            start: Posição inicial (padrão: o 'S' do labirinto)
+            goal: Posição final (padrão: o 'E' do labirinto)
+            epsilon: Peso da heurística (>= 1; 1 equivale ao A* comum)
+            
+        Returns:
+            BoundedPath com o limite comprovado em ``bound``, ou None se não houver solução
+        """
+        return self.find_path_anytime(start, goal, epsilon=epsilon, final_epsilon=epsilon)
+    
+    def find_path_anytime(self, start: Optional[Tuple[int, int]] = None,
+                          goal: Optional[Tuple[int, int]] = None,
+                          epsilon: float = 3.0, final_epsilon: float = 1.0, step: float = 0.5,
+                          time_budget: Optional[float] = None,
+                          max_expansions: Optional[int] = None) -> Optional[BoundedPath]:
+        """
+        Busca anytime ARA*: encontra logo um caminho e vai melhorando.
+        
+        A primeira iteração é um A* ponderado com ``epsilon`` alto (rápido).
+        Cada iteração seguinte reduz o peso em ``step`` e reaproveita os
+        custos g já calculados: só as células abertas e as que melhoraram
+        depois de expandidas (inconsistentes) voltam à fila. A busca para
+        quando o limite comprovado chega a ``final_epsilon`` ou quando o
+        orçamento de tempo ou de expansões acaba; o melhor caminho até então é
+        retornado com seu limite.
+        
+        O orçamento só interrompe as melhorias: a primeira solução é sempre
+        calculada por completo.
+        
+        Args:
+            start: Posição inicial (padrão: o 'S' do labirinto)
+            goal: Posição final (padrão: o 'E' do labirinto)
+            epsilon: Peso inicial da heurística
+            final_epsilon: Peso (e limite) em que a busca pode parar (>= 1)
+            step: Redução do peso a cada iteração
+            time_budget: Tempo máximo em segundos (None = sem limite)
+            max_expansions: Máximo de expansões (None = sem limite)
+            
+        Returns:
+            BoundedPath com o limite comprovado em ``bound``, ou None se não houver solução
+        """
+        if final_epsilon < 1 or epsilon < final_epsilon:
+            raise ValueError("É preciso 1 <= final_epsilon <= epsilon!")
+        if step <= 0:
+            raise ValueError("step deve ser positivo!")
+        if self.connectivity != 4:
+            raise ValueError("As buscas ponderada e anytime só funcionam com connectivity=4!")
+        
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        start, goal = self._resolve_endpoints(start, goal)
+        
+        grid = self.grid
+        cells = grid.cells
+        if cells[start] == WALL or cells[goal] == WALL or self._disconnected(start, goal):
+            return None
+        
+        width = grid.width
+        offsets = self._offsets
+        base = grid.offset
+        goal_row, goal_col = divmod(goal - base, width)
+        
+        def heuristic(index: int) -> int:
+            row, col = divmod(index - base, width)
+            return abs(row - goal_row) + abs(col - goal_col)
+        
+        # g é válido para células com a marca da consulta; a marca de visitado
+        # não é usada, porque o conjunto de expandidas recomeça a cada iteração
+        open_mark, _ = self._next_generation()
+        g_costs = self._g_costs
+        parents = self._parents
+        marks = self._marks
+        
+        g_costs[start] = 0
+        parents[start] = -1
+        marks[start] = open_mark
+        h = heuristic(start)
+        
+        weight = epsilon
+        open_list = [(weight * h, h, start)]
+        inconsistent = set()
+        best = None
+        expansions = 0
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        while True:
+            closed = set()
+            
+            # ImprovePath: expande enquanto alguém na fila puder melhorar o fim
+            while open_list:
+                f, h, current = open_list[0]
+                goal_g = g_costs[goal] if marks[goal] == open_mark else None
+                if goal_g is not None and f >= goal_g:
+                    break
+                heappop(open_list)
+                # Entrada obsoleta: já expandida ou com g desatualizado
+                if current in closed or f != g_costs[current] + weight * h:
+                    continue
+                closed.add(current)
+                expansions += 1
+                
+                if best is not None and (
+                        (max_expansions is not None and expansions >= max_expansions)
+                        or (deadline is not None and not expansions & 255
+                            and time.perf_counter() > deadline)):
+                    return best
+                
+                new_g = g_costs[current] + 1
+                for step_offset in offsets:
+                    neighbor = current + step_offset
+                    if cells[neighbor] == WALL:
+                        continue
+                    if marks[neighbor] != open_mark or new_g < g_costs[neighbor]:
+                        g_costs[neighbor] = new_g
+                        parents[neighbor] = current
+                        marks[neighbor] = open_mark
+                        if neighbor in closed:
+                            inconsistent.add(neighbor)
+                        else:
+                            h = heuristic(neighbor)
+                            heappush(open_list, (new_g + weight * h, h, neighbor))
+            
+            if marks[goal] != open_mark:
+                # A fila esvaziou sem alcançar o fim
+                return best
+            
+            # Pendentes (abertas + inconsistentes) sem entradas repetidas
+            pending = {index for _, _, index in open_list if index not in closed} | inconsistent
+            cost = g_costs[goal]
+            lower = min((g_costs[index] + heuristic(index) for index in pending), default=cost)
+            bound = max(1.0, min(weight, cost / lower if lower else 1.0))
+            best = BoundedPath(self._reconstruct_path(parents, goal), bound, weight)
+            
+            if bound <= final_epsilon or weight <= 1:
+                return best
+            if (max_expansions is not None and expansions >= max_expansions) or (
+                    deadline is not None and time.perf_counter() > deadline):
+                return best
+            
+            # Próxima iteração: peso menor e fila reconstruída com as novas chaves
+            weight = max(final_epsilon, weight - step)
+            open_list = []
+            for index in pending:
+                h = heuristic(index)
+                open_list.append((g_costs[index] + weight * h, h, index))
+            heapq.heapify(open_list)
+            inconsistent = set()
+    
+    def smooth_path(self, path: Optional[List[Tuple[int, int]]],
+                    max_lookahead: int = 64) -> Optional[List[Tuple[int, int]]]:
+        """
+        Reduz um caminho de grade a poucos pontos de passagem (qualquer ângulo).
+        
+        A partir de cada ponto de passagem, avança pelo caminho enquanto houver
+        linha de visada (``_line_of_sight``) até o ponto seguinte; o último
+        ponto visível vira o próximo ponto de passagem. Os trechos retos entre
+        pontos consecutivos atravessam apenas células livres, sem cortar quinas.
+        
+        O custo é limitado por ``max_lookahead``: cada ponto de passagem olha no
+        máximo essa quantidade de posições adiante, então o total fica em
+        O(len(path) * max_lookahead) leituras da grade, por maior que seja o
+        mapa.
+        
+        Args:
+            path: Caminho retornado por ``find_path`` (ou None)
+            max_lookahead: Maior número de posições puladas por trecho
+            
+        Returns:
+            Lista de pontos de passagem (começa e termina nos mesmos pontos
+            do caminho), ou None se ``path`` for None
+        """
+        if max_lookahead < 1:
+            raise ValueError("max_lookahead deve ser pelo menos 1!")
+        if path is None or len(path) < 3:
+            return None if path is None else list(path)
+        
+        index = self.grid.index
+        indices = [index(pos) for pos in path]
+        line_of_sight = self._line_of_sight
+        last = len(path) - 1
+        
+        waypoints = [path[0]]
+        anchor = 0
+        while anchor < last:
+            best = anchor + 1
+            limit = min(last, anchor + max_lookahead)
+            candidate = best + 1
+            while candidate <= limit and line_of_sight(indices[anchor], indices[candidate]):
+                best = candidate
+                candidate += 1
+            waypoints.append(path[best])
+            anchor = best
+        
+        return waypoints
+    
+    def _line_of_sight(self, source: int, target: int) -> bool:
+        """
+        Verifica se o segmento entre duas células passa só por células livres.
+        
+        Percorre a reta de Bresenham direto nos índices do buffer (a borda de
+        paredes dispensa checar limites). Nos passos diagonais, as duas células
+        ortogonais também precisam estar livres, para a reta não raspar quinas.
+        
+        Args:
+            source: Índice inicial no buffer da grade
+            target: Índice final no buffer da grade
+            
+        Returns:
+            True se nenhuma célula da reta for parede
+        """
+        grid = self.grid
+        cells = grid.cells
+        width = grid.width
+        source_row, source_col = divmod(source - grid.offset, width)
+        target_row, target_col = divmod(target - grid.offset, width)
+        
+        d_row = abs(target_row - source_row)
+        d_col = abs(target_col - source_col)
+        step_row = width if target_row > source_row else -width
+        step_col = 1 if target_col > source_col else -1
+        error = d_col - d_row
+        current = source
+        
+        while current != target:
+            doubled = 2 * error
+            step = 0
+            if doubled > -d_row:
+                error -= d_row
+                step += step_col
+            if doubled < d_col:
+                error += d_col
+                step += step_row
+            
+            if step != step_col and step != step_row:
+                # Passo diagonal: confere as duas células ortogonais
+                if cells[current + step_col] == WALL or cells[current + step_row] == WALL:
+                    return False
+            current += step
+            if cells[current] == WALL:
+                return False
+        
+        return True
+    
+    def find_path_with_stats(self, start: Optional[Tuple[int, int]] = None,
+                             goal: Optional[Tuple[int, int]] = None,
+                             algorithm: str = 'astar',
+                             detailed: bool = False,
+                             on_expand: Optional[Callable[[Tuple[int, int], int], None]] = None,
+                             on_push: Optional[Callable[[Tuple[int, int], int, int], None]] = None
+                             ) -> Tuple[Optional[List[Tuple[int, int]]], SearchStats]:
+        """
+        Executa ``find_path`` e também retorna estatísticas da consulta.
+        
+        As células expandidas são contadas depois da busca, a partir das
+        marcas de visitado da geração atual, então o laço de busca não tem
+        nenhum custo extra. Útil para comparar algoritmos, por exemplo
+        'astar' e 'bidirectional', sobre a mesma consulta.
+        
+        Com ``detailed=True`` (ou algum gancho), a consulta A* roda em uma cópia
+        instrumentada do laço (``_astar_instrumented``) que preenche todos os
+        contadores de ``SearchStats`` e chama os ganchos. Esse modo sempre faz
+        a busca (ignora o cache e o índice de componentes); o laço normal não
+        muda, então a instrumentação não custa nada quando desligada.
+        
+        Args:
+            start: Posição inicial (padrão: o 'S' do labirinto)
+            goal: Posição final (padrão: o 'E' do labirinto)
+            algorithm: Algoritmo (ver ``find_path``)
+            detailed: Se True, preenche os contadores detalhados (só 'astar')
+            on_expand: Gancho ``on_expand(posição, g)`` chamado a cada expansão
+            on_push: Gancho ``on_push(posição, g, h)`` chamado a cada inserção na fila
+            
+        Returns:
+            Tupla (caminho ou None, SearchStats)
+        """
+        stats = SearchStats(algorithm)
+        
+        if detailed or on_expand is not None or on_push is not None:
+            if algorithm != 'astar' or self.connectivity != 4:
+                raise ValueError("As estatísticas detalhadas e os ganchos só existem para 'astar' "
+                                 "com connectivity=4!")
+            began = time.perf_counter()
+            path = self._astar_instrumented(start, goal, stats, on_expand, on_push)
+            stats.elapsed = time.perf_counter() - began
+            stats.path_length = len(path) if path else 0
+            return path, stats
+        
+        generation = self._generation
+        
+        began = time.perf_counter()
+        path = self.find_path(start, goal, algorithm)
+        stats.elapsed = time.perf_counter() - began
+        stats.path_length = len(path) if path else 0
+        
+        # Sem nova geração, a resposta veio do cache ou do índice de componentes
+        if self._generation != generation:
+            closed_mark = 2 * self._generation + 1
+            stats.nodes_expanded = self._marks.count(closed_mark)
+            if self._back_buffers is not None:
+                stats.nodes_expanded += self._back_buffers[2].count(closed_mark)
+        
+        return path, stats
+    
+    def _astar_instrumented(self, start: Optional[Tuple[int, int]], goal: Optional[Tuple[int, int]],
+                            stats: SearchStats,
+                            on_expand: Optional[Callable[[Tuple[int, int], int], None]],
+                            on_push: Optional[Callable[[Tuple[int, int], int, int], None]]
+                            ) -> Optional[List[Tuple[int, int]]]:
+        """
+        Cópia do laço de ``_astar_tree`` que mede cada fase e chama os ganchos.
+        
+        Mantida separada de propósito: o laço normal não tem nenhum teste de
+        instrumentação. Um gancho que levanta exceção interrompe a busca.
+        
+        Args:
+            start: Posição inicial (padrão: o 'S' do labirinto)
+            goal: Posição final (padrão: o 'E' do labirinto)
+            stats: SearchStats a preencher
+            on_expand: Gancho de expansão (ou None)
+            on_push: Gancho de inserção (ou None)
+            
+        Returns:
+            Lista de posições do caminho encontrado, ou None se não houver solução
+        """
+        clock = time.perf_counter
+        phase = clock()
+        
+        start, goal = self._resolve_endpoints(start, goal)
+        grid = self.grid
+        cells = grid.cells
+        if cells[start] == WALL or cells[goal] == WALL:
+            stats.setup_time = clock() - phase
+            return None
+        
+        width = grid.width
+        offsets = self._offsets
+        base = grid.offset
+        position = grid.position
+        goal_row, goal_col = divmod(goal - base, width)
+        start_row, start_col = divmod(start - base, width)
+        
+        open_mark, closed_mark = self._next_generation()
+        g_costs = self._g_costs
+        parents = self._parents
+        marks = self._marks
+        
+        g_costs[start] = 0
+        parents[start] = -1
+        marks[start] = open_mark
+        h = abs(start_row - goal_row) + abs(start_col - goal_col)
+        open_list = [(h, h, start)]
+        if on_push is not None:
+            on_push(position(start), 0, h)
+        
+        expanded = 0
+        pushed = 1
+        stale = 0
+        peak = 1
+        found = False
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        now = clock()
+        stats.setup_time = now - phase
+        phase = now
+        
+        while open_list:
+            if len(open_list) > peak:
+                peak = len(open_list)
+            current = heappop(open_list)[2]
+            
+            if marks[current] == closed_mark:
+                stale += 1
+                continue
+            marks[current] = closed_mark
+            expanded += 1
+            
+            new_g = g_costs[current] + 1
+            if on_expand is not None:
+                on_expand(position(current), new_g - 1)
+            
+            if current == goal:
+                found = True
+                break
+            
+            for step in offsets:
+                neighbor = current + step
+                mark = marks[neighbor]
+                if mark == closed_mark or cells[neighbor] == WALL:
+                    continue
+                
+                if mark != open_mark or new_g < g_costs[neighbor]:
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    marks[neighbor] = open_mark
+                    n_row, n_col = divmod(neighbor - base, width)
+                    h = abs(n_row - goal_row) + abs(n_col - goal_col)
+                    heappush(open_list, (new_g + h, h, neighbor))
+                    pushed += 1
+                    if on_push is not None:
+                        on_push(position(neighbor), new_g, h)
+        
+        now = clock()
+        stats.search_time = now - phase
+        stats.nodes_expanded = expanded
+        stats.nodes_pushed = pushed
+        stats.stale_pops = stale
+        stats.peak_open = peak
+        
+        if not found:
+            return None
+        
+        path = self._reconstruct_path(parents, goal)
+        stats.reconstruction_time = clock() - now
+        return path
+    
+    def find_paths(self, pairs: Iterable[Tuple[Tuple[int, int], Tuple[int, int]]]
+                   ) -> List[Optional[List[Tuple[int, int]]]]:
+        """
+        Resolve várias consultas (início, fim) sobre o mesmo labirinto.
+        
+        Todas as consultas reaproveitam os mesmos buffers de busca.
+        
+        Args:
+            pairs: Sequência de pares (início, fim)
+            
+        Returns:
+            Lista com o caminho (ou None) de cada par, na mesma ordem
+        """
+        return [self.find_path(start, goal) for start, goal in pairs]
+    
+    # Até quantos objetivos find_nearest usa a busca direta (heurística do
+    # mínimo entre os objetivos, O(objetivos) por inserção); acima disso
+    # busca a partir de todos os objetivos de uma vez em direção ao início
+    _NEAREST_FORWARD_LIMIT = 8
+    
+    def find_nearest(self, start: Optional[Tuple[int, int]] = None,
+                     goals: Optional[Iterable[Tuple[int, int]]] = None,
+                     strategy: Optional[str] = None
+                     ) -> Optional[Tuple[Tuple[int, int], List[Tuple[int, int]]]]:
+        """
+        Encontra o objetivo alcançável mais próximo e o caminho até ele.
+        
+        Uma única busca resolve todos os objetivos:
+        
+        - ``'forward'``: A* a partir do início com h = menor distância de
+          Manhattan até algum objetivo (consistente, então o primeiro
+          objetivo retirado da fila é o mais próximo)
+        - ``'reverse'``: A* a partir de todos os objetivos ao mesmo tempo (todos
+          com g = 0) em direção ao início, com h = Manhattan até o início; a
+          árvore de pais leva do início ao objetivo que o alcançou primeiro
+        
+        Args:
+            start: Posição inicial (padrão: o 'S' do labirinto)
+            goals: Posições dos objetivos (padrão: todos os 'E' do labirinto)
+            strategy: ``'forward'``, ``'reverse'`` ou None (escolhe pelo número
+                      de objetivos, ver ``_NEAREST_FORWARD_LIMIT``)
+            
+        Returns:
+            Tupla (objetivo, caminho) ou None se nenhum objetivo for alcançável
+        """
+        if self.connectivity != 4:
+            raise ValueError("find_nearest só funciona com connectivity=4!")
+        if strategy not in (None, 'forward', 'reverse'):
+            raise ValueError(f"Estratégia desconhecida: {strategy!r}")
+        
+        goals = self.ends if goals is None else list(goals)
+        if not goals:
+            raise ValueError("Informe ao menos um objetivo: o labirinto não tem 'E'!")
+        
+        grid = self.grid
+        cells = grid.cells
+        start = self.start if start is None else start
+        if start is None:
+            raise ValueError("Informe o início: o labirinto não tem 'S'!")
+        if not grid.contains(start):
+            raise ValueError(f"Posição inicial {tuple(start)} fora dos limites do labirinto!")
+        start = grid.index(start)
+        
+        indices = []
+        for goal in goals:
+            if not grid.contains(goal):
+                raise ValueError(f"Posição final {tuple(goal)} fora dos limites do labirinto!")
+            indices.append(grid.index(goal))
+        # Descarta repetidos (mantendo a ordem), paredes e objetivos que o
+        # índice de componentes exclui
+        targets = [index for index in dict.fromkeys(indices)
+                   if cells[index] != WALL and not self._disconnected(start, index)]
+        
+        if cells[start] == WALL or not targets:
+            return None
+        if start in targets:
+            return grid.position(start), [grid.position(start)]
+        
+        if strategy is None:
+            strategy = 'forward' if len(targets) <= self._NEAREST_FORWARD_LIMIT else 'reverse'
+        
+        if strategy == 'forward':
+            goal = self._nearest_forward(start, targets)
+            if goal is None:
+                return None
+            return grid.position(goal), self._reconstruct_path(self._parents, goal)
+        
+        if not self._nearest_reverse(start, targets):
+            return None
+        path = list(self._walk_parents(start, self._generation))
+        return path[-1], path
+    
+    def _nearest_forward(self, start: int, targets: List[int]) -> Optional[int]:
+        """
+        A* do início até o objetivo mais próximo (h = mínimo entre os objetivos).
+        
+        Args:
+            start: Índice inicial no buffer da grade
+            targets: Índices dos objetivos (livres e sem repetição)
+            
+        Returns:
+            Índice do objetivo alcançado (caminho nos pais), ou None
+        """
+        grid = self.grid
+        cells = grid.cells
+        width = grid.width
+        base = grid.offset
+        offsets = self._offsets
+        goal_set = set(targets)
+        goal_cells = [divmod(index - base, width) for index in targets]
+        
+        def heuristic(index: int) -> int:
+            row, col = divmod(index - base, width)
+            return min(abs(row - g_row) + abs(col - g_col) for g_row, g_col in goal_cells)
+        
+        open_mark, closed_mark = self._next_generation()
+        g_costs = self._g_costs
+        parents = self._parents
+        marks = self._marks
+        
+        g_costs[start] = 0
+        parents[start] = -1
+        marks[start] = open_mark
+        h = heuristic(start)
+        open_list = [(h, h, start)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        while open_list:
+            current = heappop(open_list)[2]
+            if marks[current] == closed_mark:
+                continue
+            marks[current] = closed_mark
+            
+            # O primeiro objetivo retirado da fila é o mais próximo
+            if current in goal_set:
+                return current
+            
+            new_g = g_costs[current] + 1
+            for step in offsets:
+                neighbor = current + step
+                mark = marks[neighbor]
+                if mark == closed_mark or cells[neighbor] == WALL:
+                    continue
+                if mark != open_mark or new_g < g_costs[neighbor]:
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    marks[neighbor] = open_mark
+                    h = heuristic(neighbor)
+                    heappush(open_list, (new_g + h, h, neighbor))
+        
+        return None
+    
+    def _nearest_reverse(self, start: int, targets: List[int]) -> bool:
+        """
+        A* com várias origens: parte de todos os objetivos em direção ao início.
+        
+        Args:
+            start: Índice inicial no buffer da grade (destino desta busca)
+            targets: Índices dos objetivos (livres e sem repetição)
+            
+        Returns:
+            True se o início foi alcançado (os pais levam do início ao objetivo)
+        """
+        grid = self.grid
+        cells = grid.cells
+        width = grid.width
+        base = grid.offset
+        offsets = self._offsets
+        start_row, start_col = divmod(start - base, width)
+        
+        open_mark, closed_mark = self._next_generation()
+        g_costs = self._g_costs
+        parents = self._parents
+        marks = self._marks
+        
+        # Todos os objetivos entram na fila com custo zero
+        open_list = []
+        for index in targets:
+            g_costs[index] = 0
+            parents[index] = -1
+            marks[index] = open_mark
+            row, col = divmod(index - base, width)
+            h = abs(row - start_row) + abs(col - start_col)
+            open_list.append((h, h, index))
+        heapq.heapify(open_list)
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        while open_list:
+            current = heappop(open_list)[2]
+            if marks[current] == closed_mark:
+                continue
+            marks[current] = closed_mark
+            
+            if current == start:
+                return True
+            
+            new_g = g_costs[current] + 1
+            for step in offsets:
+                neighbor = current + step
+                mark = marks[neighbor]
+                if mark == closed_mark or cells[neighbor] == WALL:
+                    continue
+                if mark != open_mark or new_g < g_costs[neighbor]:
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    marks[neighbor] = open_mark
+                    n_row, n_col = divmod(neighbor - base, width)
+                    h = abs(n_row - start_row) + abs(n_col - start_col)
+                    heappush(open_list, (new_g + h, h, neighbor))
+        
+        return False
+    
+    def set_blocked(self, position: Tuple[int, int]):
+        """
+        Transforma uma célula em obstáculo ('1').
+        
+        Args:
+            position: Posição (linha, coluna) da célula
+        """
+        self.grid.set_cell(position, '1')
+        self._cell_changed(self.grid.index(position), True)
+    
+    def set_free(self, position: Tuple[int, int]):
+        """
+        Libera uma célula bloqueada, tornando-a um caminho livre ('0').
+        
+        Células já transitáveis (inclusive 'S' e 'E') não são alteradas.
+        
+        Args:
+            position: Posição (linha, coluna) da célula
+        """
+        grid = self.grid
+        if grid.contains(position) and grid.cells[grid.index(position)] != WALL:
+            return
+        grid.set_cell(position, '0')
+        self._cell_changed(grid.index(position), False)
+    
+    def _cell_changed(self, index: int, blocked: bool):
+        """
+        Repassa uma alteração de célula às estruturas auxiliares da grade.
+        
+        Args:
+            index: Índice da célula alterada no buffer da grade
+            blocked: True se a célula virou parede, False se foi liberada
+        """
+        for structure in (self.components, self.hierarchy, *self._planners):
+            if structure is not None:
+                structure.cell_changed(index, blocked)
+    
+    def build_component_index(self) -> ComponentIndex:
+        """
+        Constrói o índice de componentes conexas usado por ``find_path``.
+        
+        Com o índice, consultas entre regiões desconectadas retornam None em
+        O(1). Ele é mantido por ``set_blocked``/``set_free`` e reconstruído
+        automaticamente se a grade for alterada por outro meio.
+        
+        Returns:
+            O ComponentIndex criado (também disponível em ``self.components``)
+        """
+        self.components = ComponentIndex(self.grid)
+        return self.components
+    
+    def incremental_planner(self, start: Optional[Tuple[int, int]] = None,
+                            goal: Optional[Tuple[int, int]] = None):
+        """
+        Cria um planejador D* Lite ligado a este PathFinder.
+        
+        Alterações feitas com ``set_blocked``/``set_free`` são repassadas ao
+        planejador, que repara sua árvore de busca na próxima chamada de
+        ``planner.find_path()``, com custo proporcional à região afetada.
+        
+        Args:
+            start: Posição inicial (padrão: o 'S' do labirinto)
+            goal: Posição final (padrão: o 'E' do labirinto)
+            
+        Returns:
+            Um ``incremental.DStarLite``
+        """
+        from incremental import DStarLite
+        
+        if self.connectivity != 4:
+            raise ValueError("O planejador incremental só funciona com connectivity=4!")
+        start, goal = self._resolve_endpoints(start, goal)
+        planner = DStarLite(self.grid, start, goal)
+        self._planners.add(planner)
+        return planner
+    
+    def build_hierarchy(self, cluster_size: int = 16):
+        """
+        Constrói a abstração em clusters usada por ``find_path(algorithm='hpa')``.
+        
+        A abstração é mantida por ``set_blocked``/``set_free``: só os clusters
+        alterados (e seus vizinhos) são recalculados na consulta seguinte.
+        
+        Args:
+            cluster_size: Lado de cada cluster, em células
+            
+        Returns:
+            O ClusterAbstraction criado (também disponível em ``self.hierarchy``)
+        """
+        from hierarchical import ClusterAbstraction
+        
+        self.hierarchy = ClusterAbstraction(self.grid, cluster_size)
+        return self.hierarchy
+    
+    def load_hierarchy(self, filename: str):
+        """
+        Carrega uma abstração gravada com ``ClusterAbstraction.save``.
+        
+        Args:
+            filename: Caminho do arquivo
+            
+        Returns:
+            O ClusterAbstraction carregado (também disponível em ``self.hierarchy``)
+        """
+        from hierarchical import ClusterAbstraction
+        
+        self.hierarchy = ClusterAbstraction.load(filename, self.grid)
+        return self.hierarchy
+    
+    def build_landmarks(self, count: int = 8):
+        """
+        Calcula as tabelas de marcos usadas por ``find_path(algorithm='alt')``.
+        
+        O cálculo faz uma BFS completa por marco; depois de ``set_blocked``/
+        ``set_free`` as tabelas são recalculadas na consulta 'alt' seguinte.
+        
+        Args:
+            count: Número de marcos
+            
+        Returns:
+            O LandmarkTable criado (também disponível em ``self.landmarks``)
+        """
+        from landmarks import LandmarkTable
+        
+        self.landmarks = LandmarkTable(self.grid, count)
+        return self.landmarks
+    
+    def load_landmarks(self, filename: str):
+        """
+        Carrega tabelas de marcos gravadas com ``LandmarkTable.save``.
+        
+        Args:
+            filename: Caminho do arquivo
+            
+        Returns:
+            O LandmarkTable carregado (também disponível em ``self.landmarks``)
+        """
+        from landmarks import LandmarkTable
+        
+        self.landmarks = LandmarkTable.load(filename, self.grid)
+        return self.landmarks
+    
+    def display_maze_with_path(self, path: List[Tuple[int, int]]) -> str:
+        """
+        Cria uma representação visual do labirinto com o caminho destacado.
+        
+        Args:
+            path: Lista de posições do caminho encontrado
+            
+        Returns:
+            String com o labirinto e caminho destacado
+        """
+        output = io.StringIO()
+        self.write_maze_with_path(path, output)
+        return output.getvalue()[:-1]
+    
+    def write_maze_with_path(self, path: Iterable[Tuple[int, int]], stream: TextIO):
+        """
+        Escreve o labirinto com o caminho destacado, linha a linha, em um arquivo.
+        
+        Versão incremental de ``display_maze_with_path`` para grades enormes:
+        nunca monta a matriz nem a string completa, apenas uma linha por vez.
+        
+        Args:
+            path: Posições do caminho (lista ou iterador, ex.: ``iter_path``)
+            stream: Objeto de arquivo de texto (qualquer coisa com ``write``)
+        """
+        grid = self.grid
+        
+        # Colunas marcadas com '*' em cada linha (exceto início e fim). Outros
+        # 'E' no meio do caminho também são marcados; só o último passo fica
+        # como está se for um 'E' (o objetivo alcançado por ``find_nearest``)
+        endpoints = (self.start, self.end)
+        marked = {}
+        pos = None
+        for pos in path:
+            if pos not in endpoints:
+                marked.setdefault(pos[0], []).append(pos[1])
+        if pos is not None and pos not in endpoints and grid.cells[grid.index(pos)] == ord('E'):
+            marked[pos[0]].remove(pos[1])
+        
+        for row in range(grid.rows):
+            first = grid.offset + (row + 1) * grid.width + 1
+            line = bytearray(grid.cells[first:first + grid.cols])
+            for col in marked.get(row, ()):
+                line[col] = ord('*')
+            stream.write(' '.join(line.decode('ascii')))
+            stream.write('\n')
+
+
 def format_path(path: List[Tuple[int, int]], maze: List[List[str]]) -> str:
     """
     Formata o caminho para exibição, mostrando 'S' e 'E' no início e fim.
@@ -267,19 +2474,34 @@ def format_path(path: List[Tuple[int, int]], maze: List[List[str]]) -> str:
     Returns:
         String formatada do caminho
     """
-    if not path:
-        return "[]"
-    
-    formatted = []
-    for i, pos in enumerate(path):
-        if i == 0:
-            formatted.append(f"S{pos}")
-        elif i == len(path) - 1:
-            formatted.append(f"E{pos}")
-        else:
-            formatted.append(str(pos))
+    output = io.StringIO()
+    write_path(path or (), output)
+    return output.getvalue()
+
+
+def write_path(path: Iterable[Tuple[int, int]], stream: TextIO):
+    """
+    Escreve o caminho formatado (como ``format_path``) aos poucos em um arquivo.
+    
+    Aceita um iterador (ex.: ``PathFinder.iter_path``): cada posição é escrita
+    assim que a seguinte é conhecida, sem guardar o caminho inteiro.
     
-    return "[" + ", ".join(formatted) + "]"
+    Args:
+        path: Posições do caminho (lista ou iterador)
+        stream: Objeto de arquivo de texto (qualquer coisa com ``write``)
+    """
+    steps = iter(path)
+    previous = next(steps, None)
+    stream.write("[")
+    if previous is not None:
+        stream.write(f"S{previous}")
+        current = next(steps, None)
+        while current is not None:
+            following = next(steps, None)
+            # O último passo recebe o prefixo 'E'
+            stream.write(f", {current}" if following is not None else f", E{current}")
+            current = following
+    stream.write("]")
 
 
 def main():
@@ -0,0 +1,362 @@
+"""
+Tabela de próximos passos pré-calculada (banco de caminhos comprimido)
+Descrição: Para mapas pequenos e estáticos, guarda para cada par de células
+livres a direção do primeiro passo do menor caminho, comprimida por
+sequências (run-length), e responde consultas sem busca alguma, seguindo a
+tabela passo a passo
+"""
+
+import os
+import random
+import re
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple, Union
+
+from pathfinder_astar import PackedGrid, PathFinder, WALL
+
+
+# Cabeçalho do arquivo: assinatura, linhas, colunas, células livres e sequências
+CPD_MAGIC = b'PFCPD1\n\x00'
+CPD_HEADER = struct.Struct('<8sIIII')
+
+# Direções: 0 = cima, 1 = baixo, 2 = esquerda, 3 = direita; 4 = sem caminho
+NO_MOVE = 4
+
+# Marca de célula ainda não alcançada na BFS de uma linha da tabela
+_UNSEEN = 255
+
+# Uma sequência = um byte qualquer seguido de suas repetições
+_RUN = re.compile(rb'(.)\1*', re.S)
+
+# Grade e células livres de cada processo trabalhador (ver _attach_worker)
+_worker_state = {}
+
+
+def _first_moves(cells: bytes, width: int, free: Sequence[int], number: int) -> bytes:
+    """
+    Primeiro passo do menor caminho de uma célula até todas as células livres.
+    
+    Uma BFS a partir da origem propaga a direção do primeiro passo: os
+    vizinhos da origem recebem a própria direção e cada célula alcançada
+    herda a direção de quem a alcançou.
+    
+    Args:
+        cells: Buffer da grade com borda (índices relativos, sem deslocamento)
+        width: Largura de uma linha do buffer
+        free: Índices das células livres (define a ordem dos destinos)
+        number: Posição da origem em ``free``
+        
+    Returns:
+        Um byte de direção por célula livre, na ordem de ``free``
+    """
+    source = free[number]
+    offsets = (-width, width, -1, 1)
+    moves = bytearray([_UNSEEN]) * len(cells)
+    moves[source] = NO_MOVE
+    
+    frontier = []
+    for code, step in enumerate(offsets):
+        neighbor = source + step
+        if cells[neighbor] != WALL:
+            moves[neighbor] = code
+            frontier.append(neighbor)
+    
+    while frontier:
+        next_frontier = []
+        for current in frontier:
+            move = moves[current]
+            for step in offsets:
+                neighbor = current + step
+                if moves[neighbor] == _UNSEEN and cells[neighbor] != WALL:
+                    moves[neighbor] = move
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    
+    row = bytearray(map(moves.__getitem__, free))
+    # Destinos inalcançáveis viram NO_MOVE; a própria origem repete o valor
+    # anterior, o que só alonga uma sequência (ela nunca é consultada)
+    row = row.replace(bytes([_UNSEEN]), bytes([NO_MOVE]))
+    if number:
+        row[number] = row[number - 1]
+    return bytes(row)
+
+
+def _compress(row: bytes) -> Tuple[List[int], bytes]:
+    """Divide uma linha da tabela em sequências (início, direção)."""
+    starts = []
+    moves = bytearray()
+    for run in _RUN.finditer(row):
+        starts.append(run.start())
+        moves.append(row[run.start()])
+    return starts, bytes(moves)
+
+
+def _attach_worker(cells: bytes, width: int, free: List[int]):
+    """Inicializador dos processos: guarda a grade e a lista de células livres."""
+    _worker_state['cells'] = cells
+    _worker_state['width'] = width
+    _worker_state['free'] = free
+
+
+def _build_rows(sources: range) -> List[Tuple[List[int], bytes]]:
+    """Calcula e comprime as linhas de um bloco de origens no processo trabalhador."""
+    cells, width, free = _worker_state['cells'], _worker_state['width'], _worker_state['free']
+    return [_compress(_first_moves(cells, width, free, number)) for number in sources]
+
+
+class RoutingTable:
+    """
+    Tabela comprimida de primeiros passos sobre todas as células livres.
+    
+    As células livres são numeradas em ordem de linha. A linha de uma origem
+    guarda, para cada destino, a direção do primeiro passo; destinos vizinhos
+    costumam compartilhar a direção, então cada linha é guardada como
+    sequências (run-length): ``starts`` tem o destino onde cada sequência
+    começa e ``moves`` a direção dela. Uma consulta faz uma busca binária
+    por passo, então custa O(comprimento do caminho * log(sequências)).
+    
+    A tabela vale apenas para a grade no estado em que foi construída.
+    
+    Atributos:
+        grid: Grade usada
+        free: Índices (relativos a ``grid.offset``) das células livres
+        offsets: Primeira sequência de cada origem (len(free) + 1 valores)
+        starts: Destino onde começa cada sequência
+        moves: Direção de cada sequência (um byte por sequência)
+        version: Versão da grade usada na construção
+    """
+    def __init__(self, grid: PackedGrid, free: array, offsets: array, starts: array, moves: bytes):
+        """
+        Cria a tabela a partir dos vetores já calculados (use ``build`` ou ``load``).
+        
+        Args:
+            grid: Grade do labirinto
+            free: Índices relativos das células livres
+            offsets: Primeira sequência de cada origem
+            starts: Destino onde começa cada sequência
+            moves: Direção de cada sequência
+        """
+        self.grid = grid
+        self.free = free
+        self.offsets = offsets
+        self.starts = starts
+        self.moves = moves
+        self.version = grid.version
+        
+        # Número de cada célula livre (-1 para paredes)
+        self._ids = array('i', [-1]) * ((grid.rows + 2) * grid.width)
+        for number, index in enumerate(free):
+            self._ids[index] = number
+    
+    @classmethod
+    def build(cls, maze: Union[List[List[str]], PackedGrid], workers: Optional[int] = None,
+              chunksize: int = 64, report: bool = True) -> 'RoutingTable':
+        """
+        Constrói a tabela com uma BFS por célula livre.
+        
+        As linhas são independentes, então blocos de origens são distribuídos
+        entre processos (como em ``batch_solver``).
+        
+        Args:
+            maze: Labirinto (matriz ou PackedGrid)
+            workers: Número de processos (padrão: número de núcleos)
+            chunksize: Quantidade de origens por tarefa
+            report: Se True, imprime o relatório de memória e velocidade
+            
+        Returns:
+            RoutingTable pronta para consultas
+        """
+        if chunksize < 1:
+            raise ValueError("chunksize deve ser pelo menos 1!")
+        
+        started = time.perf_counter()
+        grid = maze if isinstance(maze, PackedGrid) else PackedGrid.from_matrix(maze)
+        size = (grid.rows + 2) * grid.width
+        cells = bytes(grid.cells[grid.offset:grid.offset + size])
+        free = [index for index in range(size) if cells[index] != WALL]
+        
+        workers = workers or os.cpu_count() or 1
+        blocks = [range(i, min(i + chunksize, len(free))) for i in range(0, len(free), chunksize)]
+        
+        if workers == 1 or len(blocks) <= 1:
+            _attach_worker(cells, grid.width, free)
+            try:
+                rows = [row for block in blocks for row in _build_rows(block)]
+            finally:
+                _worker_state.clear()
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_attach_worker,
+                initargs=(cells, grid.width, free),
+            ) as executor:
+                rows = [row for result in executor.map(_build_rows, blocks) for row in result]
+        
+        offsets = array('I', [0])
+        starts = array('I')
+        moves = bytearray()
+        for row_starts, row_moves in rows:
+            starts.extend(row_starts)
+            moves.extend(row_moves)
+            offsets.append(len(starts))
+        
+        table = cls(grid, array('i', free), offsets, starts, bytes(moves))
+        if report:
+            table.report(time.perf_counter() - started)
+        return table
+    
+    def memory_bytes(self) -> int:
+        """Bytes ocupados pelos vetores da tabela (sem o índice de células)."""
+        return (len(self.free) * self.free.itemsize + len(self.offsets) * self.offsets.itemsize
+                + len(self.starts) * self.starts.itemsize + len(self.moves))
+    
+    def report(self, build_time: Optional[float] = None, samples: int = 200):
+        """
+        Imprime o relatório de memória e velocidade da tabela.
+        
+        Compara o tamanho com uma tabela de primeiros passos sem compressão
+        (um byte por par) e o tempo médio de consulta com o A*, em consultas
+        aleatórias (semente fixa) entre células livres.
+        
+        Args:
+            build_time: Tempo de construção em segundos (se conhecido)
+            samples: Número de consultas usadas na medição
+        """
+        n_free = len(self.free)
+        print("\n📦 Tabela de próximos passos")
+        print(f"Células livres: {n_free} | Sequências: {len(self.starts)} "
+              f"({len(self.starts) / max(n_free, 1):.1f} por origem)")
+        print(f"Memória: {self.memory_bytes() / 1024:.1f} KiB comprimida | "
+              f"{n_free * n_free / 1024:.1f} KiB sem compressão")
+        if build_time is not None:
+            print(f"Construção: {build_time:.3f} s")
+        if not n_free:
+            return
+        
+        base = self.grid.offset
+        rnd = random.Random(0)
+        pairs = [(self.grid.position(rnd.choice(self.free) + base),
+                  self.grid.position(rnd.choice(self.free) + base)) for _ in range(samples)]
+        
+        started = time.perf_counter()
+        for start, goal in pairs:
+            self.find_path(start, goal)
+        table_time = (time.perf_counter() - started) / samples
+        
+        pathfinder = PathFinder(self.grid, require_endpoints=False)
+        started = time.perf_counter()
+        for start, goal in pairs:
+            pathfinder.find_path(start, goal)
+        search_time = (time.perf_counter() - started) / samples
+        
+        print(f"Consulta média: {table_time * 1e6:.1f} µs (tabela) | "
+              f"{search_time * 1e6:.1f} µs (A*)")
+    
+    def first_move(self, source: int, target: int) -> int:
+        """
+        Direção do primeiro passo entre duas células livres.
+        
+        Args:
+            source: Número da célula de origem (posição em ``free``)
+            target: Número da célula de destino
+            
+        Returns:
+            Código da direção (0 a 3) ou NO_MOVE se não houver caminho
+        """
+        first, last = self.offsets[source], self.offsets[source + 1]
+        return self.moves[bisect_right(self.starts, target, first, last) - 1]
+    
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]
+                  ) -> Optional[List[Tuple[int, int]]]:
+        """
+        Menor caminho entre duas posições, seguindo a tabela.
+        
+        Args:
+            start: Posição inicial (linha, coluna)
+            goal: Posição final (linha, coluna)
+            
+        Returns:
+            Lista de posições do caminho encontrado, ou None se não houver solução
+        """
+        grid = self.grid
+        if grid.version != self.version:
+            raise ValueError("A grade mudou depois da construção da tabela; construa-a de novo!")
+        for position in (start, goal):
+            if not grid.contains(position):
+                raise ValueError(f"Posição {tuple(position)} fora dos limites do labirinto!")
+        
+        base = grid.offset
+        ids = self._ids
+        current = grid.index(start) - base
+        goal_index = grid.index(goal) - base
+        target = ids[goal_index]
+        if ids[current] == -1 or target == -1:
+            return None
+        
+        steps = (-grid.width, grid.width, -1, 1)
+        path = [grid.position(current + base)]
+        while current != goal_index:
+            move = self.first_move(ids[current], target)
+            if move == NO_MOVE:
+                return None
+            current += steps[move]
+            path.append(grid.position(current + base))
+        
+        return path
+    
+    def save(self, filename: str):
+        """
+        Grava a tabela em um arquivo binário.
+        
+        Args:
+            filename: Caminho do arquivo de saída
+        """
+        free, offsets, starts = array('i', self.free), array('I', self.offsets), array('I', self.starts)
+        if sys.byteorder == 'big':
+            for values in (free, offsets, starts):
+                values.byteswap()
+        
+        with open(filename, 'wb') as f:
+            f.write(CPD_HEADER.pack(CPD_MAGIC, self.grid.rows, self.grid.cols,
+                                    len(free), len(starts)))
+            free.tofile(f)
+            offsets.tofile(f)
+            starts.tofile(f)
+            f.write(self.moves)
+    
+    @classmethod
+    def load(cls, filename: str, grid: PackedGrid) -> 'RoutingTable':
+        """
+        Carrega uma tabela gravada por ``save``.
+        
+        Args:
+            filename: Caminho do arquivo
+            grid: Grade à qual a tabela se refere (mesmas dimensões)
+            
+        Returns:
+            RoutingTable pronta para consultas
+        """
+        with open(filename, 'rb') as f:
+            magic, rows, cols, n_free, n_runs = CPD_HEADER.unpack(f.read(CPD_HEADER.size))
+            if magic != CPD_MAGIC:
+                raise ValueError(f"{filename} não é um arquivo de tabela de próximos passos!")
+            if (rows, cols) != (grid.rows, grid.cols):
+                raise ValueError(
+                    f"A tabela é de um mapa {rows}x{cols}, mas a grade é {grid.rows}x{grid.cols}!")
+            
+            free, offsets, starts = array('i'), array('I'), array('I')
+            free.fromfile(f, n_free)
+            offsets.fromfile(f, n_free + 1)
+            starts.fromfile(f, n_runs)
+            moves = f.read(n_runs)
+        
+        if sys.byteorder == 'big':
+            for values in (free, offsets, starts):
+                values.byteswap()
+        
+        return cls(grid, free, offsets, starts, moves)
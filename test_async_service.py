@@ -0,0 +1,134 @@
+"""
+Testes do serviço assíncrono
+Descrição: Resultados iguais aos do PathFinder, junção de consultas idênticas
+interrupção de buscas por prazo e um cache por thread
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from async_service import AsyncPathService, SearchCancelled
+from path_cache import PathCache
+from pathfinder_astar import PathFinder
+from test_pathfinder import random_maze, random_queries
+
+
+def test_results_match_pathfinder():
+    maze = random_maze(30, 30, 0.3, 1)
+    queries = random_queries(maze, 40, 1)
+    pathfinder = PathFinder(maze)
+    
+    async def run():
+        async with AsyncPathService(maze, workers=2) as service:
+            return await asyncio.gather(*(service.find_path_async(start, goal)
+                                          for start, goal in queries))
+    
+    for (start, goal), path in zip(queries, asyncio.run(run())):
+        expected = pathfinder.find_path(start, goal)
+        assert (path is None) == (expected is None)
+        if path is not None:
+            assert len(path) == len(expected)
+
+
+def test_identical_queries_are_coalesced():
+    maze = random_maze(30, 30, 0.2, 2)
+    
+    async def run():
+        async with AsyncPathService(maze, workers=2) as service:
+            paths = await asyncio.gather(*(service.find_path_async() for _ in range(5)))
+            return service, paths
+    
+    service, paths = asyncio.run(run())
+    assert service.searches == 1 and service.coalesced == 4
+    assert all(path == paths[0] for path in paths)
+
+
+def test_timeout_cancels_search(monkeypatch):
+    # A primeira expansão bloqueia até o prazo expirar: o teste não depende
+    # da velocidade da busca
+    entered, release = threading.Event(), threading.Event()
+    interrupted = []
+    original = PathFinder.find_path_with_stats
+    
+    def blocking(self, start, goal, algorithm, on_expand=None, **kwargs):
+        def hook(position, g):
+            entered.set()
+            release.wait(5)
+            on_expand(position, g)
+        
+        try:
+            return original(self, start, goal, algorithm, on_expand=hook, **kwargs)
+        except SearchCancelled:
+            interrupted.append((start, goal))
+            raise
+    
+    monkeypatch.setattr(PathFinder, 'find_path_with_stats', blocking)
+    maze = random_maze(20, 20, 0.0, 3)
+    
+    async def run():
+        async with AsyncPathService(maze, workers=1) as service:
+            with pytest.raises(asyncio.TimeoutError):
+                await service.find_path_async((0, 0), (19, 19), timeout=0.05)
+            assert entered.is_set()
+            release.set()
+            await service._queue.join()
+            return service
+    
+    service = asyncio.run(run())
+    assert service.cancelled == 1
+    assert interrupted == [((0, 0), (19, 19))]
+
+
+def test_without_timeout_uses_find_path(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("find_path_with_stats não deveria ser chamado")
+    
+    monkeypatch.setattr(PathFinder, 'find_path_with_stats', fail)
+    maze = random_maze(20, 20, 0.2, 4)
+    
+    async def run():
+        async with AsyncPathService(maze, workers=1) as service:
+            return await service.find_path_async()
+    
+    assert len(asyncio.run(run())) == len(PathFinder(maze).find_path())
+
+
+def test_cache_per_thread():
+    maze = random_maze(30, 30, 0.2, 5)
+    queries = random_queries(maze, 20, 5)
+    
+    async def run(model, workers, timeout):
+        async with AsyncPathService(maze, workers=workers, cache=model) as service:
+            first = await asyncio.gather(*(service.find_path_async(start, goal, timeout=timeout)
+                                           for start, goal in queries))
+            second = []
+            for start, goal in queries:
+                second.append(await service.find_path_async(start, goal, timeout=timeout))
+            return service, first, second
+    
+    for workers in 1, 2:
+        for timeout in None, 5.0:
+            model = PathCache(capacity=64)
+            service, first, second = asyncio.run(run(model, workers, timeout))
+            assert first == second
+            assert 1 <= len(service.caches) <= workers
+            assert len(set(map(id, service.caches))) == len(service.caches)
+            assert all(cache.capacity == 64 and cache.grid is service.grid
+                       for cache in service.caches)
+            # O cache passado nas opções só serve de modelo
+            assert model.hits == model.misses == 0
+            if workers == 1:
+                # A segunda rodada inteira sai do cache da única thread
+                cache, = service.caches
+                assert cache.hits + cache.subpath_hits >= len(queries)
+
+
+def test_requires_start():
+    async def run():
+        service = AsyncPathService(random_maze(5, 5, 0.0, 1))
+        with pytest.raises(RuntimeError):
+            await service.find_path_async()
+    
+    asyncio.run(run())
@@ -0,0 +1,56 @@
+"""
+Testes da resolução em lote com vários processos
+Descrição: Os resultados em paralelo devem coincidir com o PathFinder e os
+blocos de memória compartilhada devem ser removidos no fim
+"""
+
+from multiprocessing import shared_memory
+
+import pytest
+
+import batch_solver
+from pathfinder_astar import PathFinder
+from test_pathfinder import random_maze, random_queries
+
+
+@pytest.fixture
+def created_segments(monkeypatch):
+    """Nomes dos blocos de memória compartilhada criados durante o teste."""
+    names = []
+    
+    class RecordingSharedMemory(shared_memory.SharedMemory):
+        def __init__(self, name=None, create=False, size=0):
+            super().__init__(name=name, create=create, size=size)
+            if create:
+                names.append(self.name)
+    
+    monkeypatch.setattr(batch_solver.shared_memory, 'SharedMemory', RecordingSharedMemory)
+    return names
+
+
+def test_solve_queries_matches_pathfinder(created_segments):
+    maze = random_maze(25, 25, 0.3, 3)
+    pairs = random_queries(maze, 60, 3)
+    results = batch_solver.solve_queries(maze, pairs, workers=2, chunksize=8)
+    
+    pathfinder = PathFinder(maze, require_endpoints=False)
+    assert results == [pathfinder.find_path(start, goal) for start, goal in pairs]
+    
+    # O bloco compartilhado foi criado e removido
+    assert len(created_segments) == 1
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=created_segments[0])
+
+
+def test_solve_mazes_matches_pathfinder():
+    mazes = [random_maze(15, 15, [0.1, 0.3, 0.45][seed % 3], seed) for seed in range(6)]
+    results = batch_solver.solve_mazes(mazes, workers=2, chunksize=2)
+    assert results == [PathFinder(maze).find_path() for maze in mazes]
+
+
+def test_small_batches_run_in_process(created_segments):
+    maze = random_maze(10, 10, 0.2, 1)
+    pairs = random_queries(maze, 5, 1)
+    results = batch_solver.solve_queries(maze, pairs, workers=2, chunksize=256)
+    assert results == PathFinder(maze, require_endpoints=False).find_paths(pairs)
+    assert created_segments == []
@@ -0,0 +1,50 @@
+"""
+Testes dos geradores de labirintos do benchmark
+Descrição: Mapas que devem ter saída têm caminho, inclusive com lados
+múltiplos do tamanho das salas; o mapa sem saída continua sem saída
+"""
+
+import pytest
+
+import benchmark
+from pathfinder_astar import PathFinder, WALL
+from test_pathfinder import assert_valid_path, bfs_length
+
+
+SIZES = [(8, 8), (16, 16), (17, 33), (31, 32), (32, 32), (48, 20), (160, 160)]
+
+
+@pytest.mark.parametrize('generator', ['backtracker', 'rooms'])
+@pytest.mark.parametrize('rows, cols', SIZES)
+def test_generators_with_path(generator, rows, cols):
+    for seed in range(3):
+        grid = benchmark.GENERATORS[generator](rows, cols, seed)
+        pathfinder = PathFinder(grid)
+        path = pathfinder.find_path()
+        assert path is not None, (generator, rows, cols, seed)
+        assert_valid_path(grid.to_matrix(), path, pathfinder.start, pathfinder.end)
+        assert len(path) == bfs_length(grid.to_matrix(), pathfinder.start, pathfinder.end)
+
+
+@pytest.mark.parametrize('rows, cols', SIZES)
+def test_rooms_end_inside_room(rows, cols):
+    grid = benchmark.rooms_maze(rows, cols)
+    end = grid.find_last('E')
+    assert end == (rows - 1, cols - 1)
+    neighbours = [(rows - 2, cols - 1), (rows - 1, cols - 2)]
+    assert all(grid.cells[grid.index(cell)] != WALL for cell in neighbours)
+
+
+@pytest.mark.parametrize('rows, cols', SIZES)
+def test_random_endpoints_not_enclosed(rows, cols):
+    # Com obstáculos ao acaso não há garantia de caminho, mas S e E nunca
+    # nascem cercados
+    grid = benchmark.random_maze(rows, cols)
+    for cell in (0, 1), (1, 0), (rows - 1, cols - 2), (rows - 2, cols - 1):
+        assert grid.cells[grid.index(cell)] != WALL
+
+
+@pytest.mark.parametrize('rows, cols', SIZES)
+def test_unreachable_has_no_path(rows, cols):
+    grid = benchmark.unreachable_maze(rows, cols)
+    assert PathFinder(grid).find_path() is None
@@ -0,0 +1,87 @@
+"""
+Testes do índice de componentes conexas
+Descrição: O índice deve coincidir com a alcançabilidade da busca em largura
+após a construção e nunca separar células ligadas após alterações
+"""
+
+import random
+
+import pytest
+
+from pathfinder_astar import ComponentIndex, PackedGrid, PathFinder
+from test_pathfinder import bfs_distances, random_maze
+
+
+def free_cells(maze):
+    return [(row, col) for row in range(len(maze)) for col in range(len(maze[0]))
+            if maze[row][col] != '1']
+
+
+def check_index(index: ComponentIndex, maze, exact: bool):
+    """Compara o índice com a BFS; se não for exato, só exige que seja seguro."""
+    grid = index.grid
+    cells = free_cells(maze)
+    for source in cells[::3]:
+        reachable = bfs_distances(maze, source)
+        for target in cells:
+            connected = index.connected(grid.index(source), grid.index(target))
+            if target in reachable:
+                assert connected
+            elif exact:
+                assert not connected
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_build_matches_bfs(seed):
+    maze = random_maze(15, 17, [0.3, 0.45][seed % 2], seed)
+    index = ComponentIndex(PackedGrid.from_matrix(maze))
+    check_index(index, maze, exact=True)
+    # Paredes nunca estão ligadas
+    wall = next(((r, c) for r in range(15) for c in range(17) if maze[r][c] == '1'), None)
+    if wall is not None:
+        assert not index.connected(index.grid.index(wall), index.grid.index(wall))
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_cell_changes_stay_safe(seed):
+    rnd = random.Random(seed)
+    maze = random_maze(12, 12, 0.35, seed)
+    pathfinder = PathFinder(maze)
+    index = pathfinder.build_component_index()
+    for _ in range(30):
+        position = (rnd.randrange(12), rnd.randrange(12))
+        if rnd.random() < 0.5:
+            pathfinder.set_blocked(position)
+        else:
+            pathfinder.set_free(position)
+        assert index.version == pathfinder.grid.version
+    check_index(index, pathfinder.maze, exact=False)
+
+
+def test_free_merges_and_block_splits_after_failed_search():
+    pathfinder = PathFinder([list('S00100E')])
+    index = pathfinder.build_component_index()
+    start, goal = pathfinder.grid.index((0, 0)), pathfinder.grid.index((0, 6))
+    assert not index.connected(start, goal)
+    
+    # Liberar a parede une as duas componentes
+    pathfinder.set_free((0, 3))
+    assert index.connected(start, goal)
+    assert len(pathfinder.find_path()) == 7
+    
+    # Bloquear só é descoberto quando uma busca falha: o índice então divide a componente
+    pathfinder.set_blocked((0, 3))
+    assert index.connected(start, goal)
+    assert pathfinder.find_path() is None
+    assert not index.connected(start, goal)
+    assert index.connected(start, pathfinder.grid.index((0, 2)))
+
+
+def test_external_change_triggers_rebuild():
+    maze = random_maze(10, 10, 0.3, 4)
+    pathfinder = PathFinder(maze)
+    index = pathfinder.build_component_index()
+    pathfinder.grid.set_cell((5, 5), '1')
+    pathfinder.find_path()
+    assert index.version == pathfinder.grid.version
+    check_index(index, pathfinder.maze, exact=True)
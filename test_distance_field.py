@@ -0,0 +1,34 @@
+"""
+Testes do campo de distâncias (NumPy)
+Descrição: Distâncias e caminhos devem coincidir com uma busca em largura
+"""
+
+import pytest
+
+from distance_field import DistanceField
+from test_pathfinder import assert_valid_path, bfs_distances, random_maze
+
+# O NumPy é opcional: sem ele o módulo inteiro é ignorado
+pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_bfs(seed):
+    maze = random_maze(15, 22, [0.1, 0.3][seed % 2], seed)
+    field = DistanceField(maze)
+    distances = bfs_distances(maze, (0, 0))
+    
+    goals = [(row, col) for row in range(15) for col in range(22)]
+    for goal, path in zip(goals, field.paths_to(goals)):
+        if goal not in distances:
+            assert field.distance(goal) is None and path is None
+        else:
+            assert field.distance(goal) == distances[goal]
+            assert len(path) == distances[goal] + 1
+            assert_valid_path(maze, path, (0, 0), goal)
+
+
+def test_rejects_positions_outside():
+    field = DistanceField(random_maze(4, 4, 0.0, 1))
+    with pytest.raises(ValueError):
+        field.distance((4, 0))
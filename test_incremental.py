@@ -0,0 +1,77 @@
+"""
+Testes do planejador incremental D* Lite
+Descrição: Após cada alteração da grade e cada movimento do início, o caminho
+reparado deve ter o mesmo comprimento que uma busca em largura do zero
+"""
+
+import random
+
+import pytest
+
+from pathfinder_astar import PathFinder
+from test_pathfinder import assert_valid_path, bfs_length, random_maze
+
+
+def check_planner(planner, pathfinder: PathFinder, start, goal):
+    """Compara o caminho do planejador com a BFS sobre a grade atual."""
+    maze = pathfinder.maze
+    path = planner.find_path()
+    expected = bfs_length(maze, start, goal) if maze[goal[0]][goal[1]] != '1' else None
+    if expected is None:
+        assert path is None
+    else:
+        assert len(path) == expected
+        assert_valid_path(maze, path, start, goal)
+    return path
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_repairs_match_bfs(seed):
+    rnd = random.Random(seed)
+    maze = random_maze(18, 18, [0.1, 0.25, 0.35][seed % 3], seed)
+    pathfinder = PathFinder(maze)
+    start, goal = pathfinder.start, pathfinder.end
+    planner = pathfinder.incremental_planner()
+    check_planner(planner, pathfinder, start, goal)
+    
+    for _ in range(25):
+        position = (rnd.randrange(18), rnd.randrange(18))
+        if position in (start, goal):
+            continue
+        if rnd.random() < 0.5:
+            pathfinder.set_blocked(position)
+        else:
+            pathfinder.set_free(position)
+        path = check_planner(planner, pathfinder, start, goal)
+        
+        # O agente anda um passo pelo caminho atual
+        if path and len(path) > 1 and rnd.random() < 0.5:
+            start = path[1]
+            planner.move_start(start)
+            check_planner(planner, pathfinder, start, goal)
+
+
+def test_repair_expands_less_than_first_search():
+    maze = random_maze(40, 40, 0.2, 3)
+    pathfinder = PathFinder(maze)
+    planner = pathfinder.incremental_planner()
+    path = planner.find_path()
+    first = planner.nodes_expanded
+    pathfinder.set_blocked(path[len(path) // 2])
+    planner.find_path()
+    assert planner.nodes_expanded < first
+
+
+def test_external_grid_change_rebuilds():
+    maze = random_maze(12, 12, 0.2, 5)
+    pathfinder = PathFinder(maze)
+    planner = pathfinder.incremental_planner()
+    planner.find_path()
+    # Alteração direta na grade, sem passar pelo PathFinder
+    pathfinder.grid.set_cell((5, 5), '1')
+    check_planner(planner, pathfinder, pathfinder.start, pathfinder.end)
+
+
+def test_requires_four_connectivity():
+    with pytest.raises(ValueError):
+        PathFinder(random_maze(5, 5, 0.0, 1), connectivity=8).incremental_planner()
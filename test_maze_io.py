@@ -0,0 +1,95 @@
+"""
+Testes de leitura e gravação de labirintos
+Descrição: Carregamento via mmap (binário bruto, texto, cópia privada) e
+ida e volta dos formatos em arquivo, inclusive o compacto com vários 'E'
+"""
+
+import mmap
+
+import pytest
+
+from maze_io import BITS1_HEADER, BITS1_MAGIC, load_bits, load_maze, save_bits, save_grid
+from pathfinder_astar import PackedGrid, PathFinder
+from test_pathfinder import random_maze
+
+
+def test_raw_format_is_zero_copy(tmp_path):
+    maze = random_maze(7, 9, 0.3, 1)
+    filename = str(tmp_path / "mapa.grid")
+    save_grid(PackedGrid.from_matrix(maze), filename)
+    
+    grid = load_maze(filename)
+    assert isinstance(grid.cells, mmap.mmap)
+    assert grid.to_matrix() == maze
+    assert PathFinder(grid).find_path() == PathFinder(maze).find_path()
+    # Somente leitura por padrão
+    with pytest.raises(TypeError):
+        grid.set_cell((1, 1), '1')
+
+
+def test_writable_mapping_keeps_file(tmp_path):
+    maze = random_maze(5, 5, 0.0, 1)
+    filename = str(tmp_path / "mapa.grid")
+    save_grid(PackedGrid.from_matrix(maze), filename)
+    
+    grid = load_maze(filename, writable=True)
+    grid.set_cell((2, 2), '1')
+    assert grid.to_matrix()[2][2] == '1'
+    # Copy-on-write: o arquivo continua como antes
+    assert load_maze(filename).to_matrix() == maze
+
+
+@pytest.mark.parametrize("text", [
+    "S 0 1\n0 0 E\n",
+    "S01\r\n00E\r\n",
+    "S 0 1\n0 0 E",
+    "S * 1\n0 * E\n\n",
+])
+def test_text_formats(tmp_path, text):
+    filename = tmp_path / "mapa.txt"
+    filename.write_text(text)
+    grid = load_maze(str(filename))
+    assert grid.to_matrix() == [['S', '0', '1'], ['0', '0', 'E']]
+
+
+def test_invalid_files(tmp_path):
+    empty = tmp_path / "vazio.txt"
+    empty.write_bytes(b'')
+    with pytest.raises(ValueError, match="vazio"):
+        load_maze(str(empty))
+    
+    for content in (b'S0X\n00E\n', b'S01\n0E\n'):
+        invalid = tmp_path / "invalido.txt"
+        invalid.write_bytes(content)
+        with pytest.raises(ValueError):
+            load_maze(str(invalid))
+
+
+@pytest.mark.parametrize("rows, cols", [(1, 1), (3, 5), (7, 8), (9, 13), (4, 17)])
+def test_bits_round_trip(tmp_path, rows, cols):
+    maze = random_maze(rows, cols, 0.3, rows * cols)
+    for row, col in (0, cols - 1), (rows - 1, 0), (rows // 2, cols // 2):
+        if maze[row][col] == '0':
+            maze[row][col] = 'E'
+    filename = str(tmp_path / "mapa.bits")
+    save_bits(PackedGrid.from_matrix(maze), filename)
+    
+    for grid in load_bits(filename), load_maze(filename):
+        assert grid.to_matrix() == maze
+        assert grid.find_all('E') == PackedGrid.from_matrix(maze).find_all('E')
+
+
+def test_bits_terrain_becomes_free(tmp_path):
+    filename = str(tmp_path / "mapa.bits")
+    save_bits(PackedGrid.from_matrix([['S', '5', '1'], ['9', 'E', 'E']]), filename)
+    assert load_bits(filename).to_matrix() == [['S', '0', '1'], ['0', 'E', 'E']]
+
+
+def test_bits_version1_still_loads(tmp_path):
+    # S em (0, 0), E em (1, 2) e uma parede em (0, 2): bits 001 000
+    data = BITS1_HEADER.pack(BITS1_MAGIC, 2, 3, 0, 0, 1, 2) + bytes([0b00100000])
+    filename = tmp_path / "antigo.bits"
+    filename.write_bytes(data)
+    expected = [['S', '0', '1'], ['0', '0', 'E']]
+    assert load_bits(str(filename)).to_matrix() == expected
+    assert load_maze(str(filename)).to_matrix() == expected
@@ -0,0 +1,102 @@
+"""
+Testes do cache LRU de caminhos
+Descrição: Descarte por capacidade e por memória, respostas por trecho,
+resultados "sem solução", invalidação por versão e ligação a uma grade
+"""
+
+import pytest
+
+from path_cache import ENTRY_OVERHEAD, BYTES_PER_STEP, PathCache
+from pathfinder_astar import PathFinder
+from test_pathfinder import assert_valid_path, bfs_length, random_maze, random_queries
+
+
+OPEN = [['S', '0', '0', '0', '0', '0', 'E']]
+
+
+def test_lru_eviction():
+    cache = PathCache(capacity=2)
+    pathfinder = PathFinder(OPEN, cache=cache)
+    pathfinder.find_path((0, 0), (0, 1))
+    pathfinder.find_path((0, 2), (0, 3))
+    # Uso renova a entrada (0, 0)-(0, 1): a descartada é (0, 2)-(0, 3)
+    pathfinder.find_path((0, 0), (0, 1))
+    pathfinder.find_path((0, 4), (0, 5))
+    assert len(cache) == 2 and cache.evictions == 1
+    
+    misses = cache.misses
+    pathfinder.find_path((0, 0), (0, 1))
+    assert cache.misses == misses
+    pathfinder.find_path((0, 2), (0, 3))
+    assert cache.misses == misses + 1
+
+
+def test_byte_budget():
+    entry = ENTRY_OVERHEAD + BYTES_PER_STEP * 2
+    cache = PathCache(capacity=100, max_bytes=2 * entry)
+    pathfinder = PathFinder(OPEN, cache=cache)
+    for col in range(4):
+        pathfinder.find_path((0, col), (0, col + 1))
+    assert len(cache) == 2 and cache.bytes_used == 2 * entry
+    assert cache.evictions == 2
+    
+    # Uma entrada maior que o limite inteiro não é guardada
+    pathfinder.find_path((0, 0), (0, 6))
+    assert cache.bytes_used <= cache.max_bytes
+    assert cache.stats()['entries'] == len(cache)
+
+
+def test_subpath_hits():
+    cache = PathCache()
+    pathfinder = PathFinder(OPEN, cache=cache)
+    full = pathfinder.find_path((0, 0), (0, 6))
+    assert pathfinder.find_path((0, 2), (0, 5)) == full[2:6]
+    assert pathfinder.find_path((0, 5), (0, 1)) == full[1:6][::-1]
+    assert cache.subpath_hits == 2 and cache.misses == 1
+
+
+def test_negative_results_are_cached():
+    maze = [['S', '0', '1', '0', 'E']]
+    cache = PathCache()
+    pathfinder = PathFinder(maze, cache=cache)
+    assert pathfinder.find_path() is None
+    assert pathfinder.find_path() is None
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_invalidation_after_set_cell():
+    cache = PathCache()
+    pathfinder = PathFinder(OPEN, cache=cache)
+    assert len(pathfinder.find_path()) == 7
+    pathfinder.set_blocked((0, 3))
+    assert pathfinder.find_path() is None
+    assert cache.invalidations == 1
+    
+    # Alterações diretas na grade também mudam a versão
+    pathfinder.grid.set_cell((0, 3), '0')
+    assert len(pathfinder.find_path()) == 7
+    assert cache.invalidations == 2
+
+
+def test_cached_paths_match_bfs():
+    maze = random_maze(15, 15, 0.3, 9)
+    cache = PathCache(capacity=8)
+    pathfinder = PathFinder(maze, cache=cache)
+    queries = random_queries(maze, 30, 9)
+    for start, goal in queries + queries:
+        path = pathfinder.find_path(start, goal)
+        expected = bfs_length(maze, start, goal) if maze[goal[0]][goal[1]] != '1' else None
+        assert (path is None) == (expected is None)
+        if path is not None:
+            assert len(path) == expected
+            assert_valid_path(maze, path, start, goal)
+
+
+def test_cache_is_bound_to_one_grid():
+    cache = PathCache()
+    first = PathFinder([list('S00E')], cache=cache)
+    assert first.find_path((0, 0), (0, 1)) == [(0, 0), (0, 1)]
+    # Outro PathFinder da mesma grade pode compartilhar o cache
+    PathFinder(first.grid, cache=cache)
+    with pytest.raises(ValueError):
+        PathFinder([list('S10E')], cache=cache)
@@ -0,0 +1,605 @@
+"""
+Testes de comportamento do PathFinder A*
+Descrição: Compara os caminhos com uma busca em largura de referência e fixa
+o comprimento (não a rota exata) dos labirintos de exemplo
+"""
+
+import heapq
+import os
+import random
+import re
+from collections import deque
+from typing import List, Optional, Tuple
+
+import pytest
+
+from pathfinder_astar import PathFinder, format_path
+
+
+# Labirintos de exemplo (os mesmos de main() e do README) e o número de
+# posições do menor caminho, ou None se não houver solução
+EXAMPLES = [
+    ([
+        ['S', '0', '1', '0', '0'],
+        ['0', '0', '1', '0', '1'],
+        ['1', '0', '1', '0', '0'],
+        ['1', '0', '0', 'E', '1'],
+    ], 7),
+    ([
+        ['S', '0', '0', '1', '0', '0'],
+        ['1', '1', '0', '1', '0', '1'],
+        ['0', '0', '0', '0', '0', '0'],
+        ['0', '1', '1', '1', '1', '0'],
+        ['0', '0', '0', '0', '0', 'E'],
+    ], 10),
+    ([
+        ['S', '0', '1', '0'],
+        ['1', '0', '1', '0'],
+        ['0', '0', '1', '0'],
+        ['0', '1', '1', 'E'],
+    ], None),
+    ([
+        ['S', '0', '0', '0', '0', '0', '0', '0', '0', '0'],
+        ['0', '1', '1', '1', '1', '1', '1', '1', '0', '0'],
+        ['0', '0', '0', '0', '0', '0', '0', '1', '0', '0'],
+        ['0', '1', '1', '1', '1', '1', '0', '1', '0', '0'],
+        ['0', '0', '0', '0', '0', '1', '0', '1', '0', '0'],
+        ['0', '1', '1', '1', '0', '1', '0', '1', '0', '0'],
+        ['0', '0', '0', '0', '0', '1', '0', '0', '0', '0'],
+        ['0', '1', '1', '1', '1', '1', '1', '1', '1', '0'],
+        ['0', '0', '0', '0', '0', '0', '0', '0', '0', 'E'],
+    ], 18),
+]
+
+
+def random_maze(rows: int, cols: int, density: float, seed: int) -> List[List[str]]:
+    """
+    Gera um labirinto aleatório com 'S' no canto superior esquerdo e 'E' no inferior direito.
+    
+    Args:
+        rows: Número de linhas
+        cols: Número de colunas (pelo menos 2 se rows == 1)
+        density: Fração aproximada de obstáculos
+        seed: Semente do gerador
+    """
+    rnd = random.Random(seed)
+    maze = [['1' if rnd.random() < density else '0' for _ in range(cols)] for _ in range(rows)]
+    maze[0][0] = 'S'
+    maze[rows - 1][cols - 1] = 'E'
+    return maze
+
+
+def bfs_distances(maze: List[List[str]], start: Tuple[int, int]) -> dict:
+    """
+    Distância (em passos ortogonais) do início até cada célula alcançável.
+    
+    Args:
+        maze: Matriz do labirinto
+        start: Posição inicial
+    
+    Returns:
+        Dicionário posição -> número de passos (vazio se o início for parede)
+    """
+    rows, cols = len(maze), len(maze[0])
+    if maze[start[0]][start[1]] == '1':
+        return {}
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        row, col = queue.popleft()
+        for neighbor in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            n_row, n_col = neighbor
+            if (0 <= n_row < rows and 0 <= n_col < cols and maze[n_row][n_col] != '1'
+                    and neighbor not in distances):
+                distances[neighbor] = distances[(row, col)] + 1
+                queue.append(neighbor)
+    return distances
+
+
+def bfs_length(maze: List[List[str]], start: Tuple[int, int],
+               goal: Tuple[int, int]) -> Optional[int]:
+    """Número de posições do menor caminho (como ``len(path)``), ou None."""
+    distance = bfs_distances(maze, start).get(goal)
+    return None if distance is None else distance + 1
+
+
+def assert_valid_path(maze: List[List[str]], path: List[Tuple[int, int]],
+                      start: Tuple[int, int], goal: Tuple[int, int]):
+    """Confere extremidades, passos ortogonais unitários e ausência de paredes."""
+    assert path[0] == tuple(start) and path[-1] == tuple(goal)
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        assert abs(r1 - r2) + abs(c1 - c2) == 1
+    for row, col in path:
+        assert maze[row][col] != '1'
+
+
+@pytest.mark.parametrize("maze, length", EXAMPLES)
+def test_examples_length(maze, length):
+    pathfinder = PathFinder(maze)
+    path = pathfinder.find_path()
+    if length is None:
+        assert path is None
+    else:
+        assert len(path) == length
+        assert_valid_path(maze, path, pathfinder.start, pathfinder.end)
+
+
+def readme_examples() -> List[tuple]:
+    """
+    Lê as seções "### Exemplo N" do README: (labirinto, linhas da saída).
+    
+    O primeiro bloco de código de cada seção é a entrada e o segundo a saída.
+    """
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'README.md'),
+              encoding='utf-8') as f:
+        text = f.read()
+    examples = []
+    for section in re.split(r'^### Exemplo \d+', text, flags=re.M)[1:]:
+        blocks = re.findall(r'^```\n(.*?)^```', section, flags=re.M | re.S)
+        maze = [line.split() for line in blocks[0].strip().split('\n')]
+        examples.append((maze, blocks[1].strip().split('\n')))
+    return examples
+
+
+@pytest.mark.parametrize("maze, output", readme_examples())
+def test_readme_examples_output(maze, output):
+    # A rota exata depende do desempate do A*: o README deve acompanhá-lo
+    pathfinder = PathFinder(maze)
+    path = pathfinder.find_path()
+    if path is None:
+        assert output[0].startswith("✗ Sem solução")
+        return
+    assert output[0] == f"✓ Caminho encontrado com {len(path)} passos!"
+    for line in output:
+        if line.startswith("Menor caminho (coordenadas): "):
+            assert line == f"Menor caminho (coordenadas): {format_path(path, maze)}"
+    shown = output[output.index("Labirinto com caminho destacado:") + 1:]
+    assert shown == pathfinder.display_maze_with_path(path).split('\n')
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_bfs(seed):
+    rnd = random.Random(seed)
+    maze = random_maze(rnd.randint(1, 25), rnd.randint(2, 25), 0.3, seed)
+    pathfinder = PathFinder(maze)
+    path = pathfinder.find_path()
+    expected = bfs_length(maze, pathfinder.start, pathfinder.end)
+    if expected is None:
+        assert path is None
+    else:
+        assert len(path) == expected
+        assert_valid_path(maze, path, pathfinder.start, pathfinder.end)
+
+
+def test_is_valid_position_bounds():
+    pathfinder = PathFinder(EXAMPLES[0][0])
+    assert pathfinder._is_valid_position((0, 0))
+    assert not pathfinder._is_valid_position((0, 2))
+    # Fora da grade, inclusive além da borda de paredes
+    for position in ((-1, 0), (0, -1), (4, 0), (0, 5), (5, 5), (-3, 2), (1, 9), (-9, -9)):
+        assert not pathfinder._is_valid_position(position)
+
+
+def random_queries(maze: List[List[str]], count: int, seed: int) -> List[tuple]:
+    """Pares (início, fim) aleatórios dentro do labirinto (podem cair em paredes)."""
+    rnd = random.Random(seed)
+    rows, cols = len(maze), len(maze[0])
+    return [((rnd.randrange(rows), rnd.randrange(cols)), (rnd.randrange(rows), rnd.randrange(cols)))
+            for _ in range(count)]
+
+
+def check_optimal(pathfinder: PathFinder, maze: List[List[str]], seed: int, **options):
+    """Compara ``find_path(**options)`` com a BFS em consultas aleatórias."""
+    for start, goal in random_queries(maze, 10, seed):
+        path = pathfinder.find_path(start, goal, **options)
+        expected = bfs_length(maze, start, goal) if maze[goal[0]][goal[1]] != '1' else None
+        if expected is None:
+            assert path is None
+        else:
+            assert len(path) == expected
+            assert_valid_path(maze, path, start, goal)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_jps_matches_bfs(seed):
+    maze = random_maze(20, 20, [0.0, 0.2, 0.35][seed % 3], seed)
+    check_optimal(PathFinder(maze), maze, seed, algorithm='jps')
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_bidirectional_matches_bfs(seed):
+    maze = random_maze(20, 20, [0.0, 0.2, 0.35][seed % 3], seed)
+    check_optimal(PathFinder(maze), maze, seed, algorithm='bidirectional')
+
+
+def test_stats_report_path_length():
+    maze = EXAMPLES[1][0]
+    for algorithm in ('astar', 'jps', 'bidirectional'):
+        path, stats = PathFinder(maze).find_path_with_stats(algorithm=algorithm)
+        assert stats.algorithm == algorithm
+        assert stats.path_length == len(path) == EXAMPLES[1][1]
+        assert stats.nodes_expanded > 0
+
+
+def check_reachable(pathfinder: PathFinder, maze: List[List[str]], seed: int, **options):
+    """Como ``check_optimal``, mas aceita caminhos válidos não mínimos."""
+    for start, goal in random_queries(maze, 10, seed):
+        path = pathfinder.find_path(start, goal, **options)
+        expected = bfs_length(maze, start, goal) if maze[goal[0]][goal[1]] != '1' else None
+        if expected is None:
+            assert path is None
+        else:
+            assert len(path) >= expected
+            assert_valid_path(maze, path, start, goal)
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_hpa_paths_are_valid(seed):
+    maze = random_maze(24, 24, [0.1, 0.25, 0.35][seed % 3], seed)
+    pathfinder = PathFinder(maze)
+    pathfinder.build_hierarchy(cluster_size=[3, 5, 8][seed % 3])
+    check_reachable(pathfinder, maze, seed, algorithm='hpa')
+    
+    # Alterações na grade são repassadas à abstração
+    rnd = random.Random(seed)
+    for _ in range(15):
+        position = (rnd.randrange(24), rnd.randrange(24))
+        if rnd.random() < 0.5:
+            pathfinder.set_blocked(position)
+        else:
+            pathfinder.set_free(position)
+    check_reachable(pathfinder, pathfinder.maze, seed + 1, algorithm='hpa')
+
+
+def test_hpa_save_and_load(tmp_path):
+    maze = random_maze(20, 20, 0.25, 7)
+    pathfinder = PathFinder(maze)
+    pathfinder.build_hierarchy(cluster_size=5)
+    filename = str(tmp_path / "mapa.hpa")
+    pathfinder.hierarchy.save(filename)
+    
+    loaded = PathFinder(maze)
+    loaded.load_hierarchy(filename)
+    for start, goal in random_queries(maze, 10, 7):
+        assert loaded.find_path(start, goal, algorithm='hpa') == \
+            pathfinder.find_path(start, goal, algorithm='hpa')
+
+
+def test_hpa_requires_hierarchy():
+    with pytest.raises(ValueError):
+        PathFinder(EXAMPLES[0][0]).find_path(algorithm='hpa')
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_alt_matches_bfs(seed):
+    maze = random_maze(20, 20, [0.1, 0.25, 0.35][seed % 3], seed)
+    pathfinder = PathFinder(maze)
+    pathfinder.build_landmarks(count=[1, 4, 8][seed % 3])
+    check_optimal(pathfinder, maze, seed, algorithm='alt')
+    
+    # As tabelas são recalculadas depois de alterações na grade
+    pathfinder.set_blocked((10, 10))
+    pathfinder.set_free((3, 4))
+    check_optimal(pathfinder, pathfinder.maze, seed + 1, algorithm='alt')
+
+
+def test_alt_save_and_load(tmp_path):
+    maze = random_maze(20, 20, 0.25, 4)
+    pathfinder = PathFinder(maze)
+    pathfinder.build_landmarks(count=4)
+    filename = str(tmp_path / "mapa.alt")
+    pathfinder.landmarks.save(filename)
+    
+    loaded = PathFinder(maze)
+    loaded.load_landmarks(filename)
+    check_optimal(loaded, maze, 4, algorithm='alt')
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_iter_path_matches_find_path(seed):
+    maze = random_maze(20, 20, 0.3, seed)
+    pathfinder = PathFinder(maze)
+    for start, goal in random_queries(maze, 10, seed):
+        path = pathfinder.find_path(start, goal)
+        steps = list(pathfinder.iter_path(start, goal))
+        if path is None:
+            assert steps == []
+        else:
+            assert len(steps) == len(path)
+            assert_valid_path(maze, steps, start, goal)
+
+
+def test_iter_path_detects_reused_buffers():
+    maze = random_maze(10, 10, 0.0, 1)
+    pathfinder = PathFinder(maze)
+    steps = pathfinder.iter_path()
+    next(steps)
+    pathfinder.find_path((0, 0), (3, 3))
+    with pytest.raises(RuntimeError):
+        list(steps)
+
+
+def dijkstra_cost(maze: List[List[str]], start: Tuple[int, int],
+                  goal: Tuple[int, int]) -> Optional[int]:
+    """Menor custo de terreno ('2'-'9' custam o dígito, o resto custa 1), ou None."""
+    def cost(position):
+        symbol = maze[position[0]][position[1]]
+        return int(symbol) if symbol in '23456789' else 1
+    
+    rows, cols = len(maze), len(maze[0])
+    if maze[start[0]][start[1]] == '1' or maze[goal[0]][goal[1]] == '1':
+        return None
+    best = {start: 0}
+    queue = [(0, start)]
+    while queue:
+        g, (row, col) = heapq.heappop(queue)
+        if (row, col) == goal:
+            return g
+        if g > best[(row, col)]:
+            continue
+        for neighbor in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            n_row, n_col = neighbor
+            if 0 <= n_row < rows and 0 <= n_col < cols and maze[n_row][n_col] != '1':
+                new_g = g + cost(neighbor)
+                if new_g < best.get(neighbor, new_g + 1):
+                    best[neighbor] = new_g
+                    heapq.heappush(queue, (new_g, neighbor))
+    return None
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_weighted_matches_dijkstra(seed):
+    rnd = random.Random(seed)
+    maze = random_maze(16, 16, 0.25, seed)
+    for row in range(16):
+        for col in range(16):
+            if maze[row][col] == '0' and rnd.random() < 0.4:
+                maze[row][col] = rnd.choice('23456789')
+    pathfinder = PathFinder(maze)
+    for start, goal in random_queries(maze, 10, seed):
+        path = pathfinder.find_path(start, goal, algorithm='weighted')
+        expected = dijkstra_cost(maze, start, goal)
+        if expected is None:
+            assert path is None
+        else:
+            assert pathfinder.path_cost(path) == expected
+            assert_valid_path(maze, path, start, goal)
+
+
+def octile_cost(maze: List[List[str]], start: Tuple[int, int], goal: Tuple[int, int],
+                corner_cutting: bool) -> Optional[float]:
+    """Menor custo com diagonais (custo √2), pela regra de cantos do modo 8."""
+    rows, cols = len(maze), len(maze[0])
+    
+    def free(row, col):
+        return 0 <= row < rows and 0 <= col < cols and maze[row][col] != '1'
+    
+    if not free(*start) or not free(*goal):
+        return None
+    best = {start: 0.0}
+    queue = [(0.0, start)]
+    while queue:
+        g, (row, col) = heapq.heappop(queue)
+        if (row, col) == goal:
+            return g
+        if g > best[(row, col)]:
+            continue
+        for d_row in (-1, 0, 1):
+            for d_col in (-1, 0, 1):
+                n_row, n_col = row + d_row, col + d_col
+                if (d_row, d_col) == (0, 0) or not free(n_row, n_col):
+                    continue
+                if d_row and d_col:
+                    sides = free(row + d_row, col) + free(row, col + d_col)
+                    if sides < (1 if corner_cutting else 2):
+                        continue
+                new_g = g + (2 ** 0.5 if d_row and d_col else 1)
+                if new_g < best.get((n_row, n_col), new_g + 1) - 1e-9:
+                    best[(n_row, n_col)] = new_g
+                    heapq.heappush(queue, (new_g, (n_row, n_col)))
+    return None
+
+
+@pytest.mark.parametrize("seed", range(16))
+def test_eight_connected_matches_reference(seed):
+    corner_cutting = bool(seed % 2)
+    maze = random_maze(16, 16, [0.15, 0.3][seed // 2 % 2], seed)
+    pathfinder = PathFinder(maze, connectivity=8, corner_cutting=corner_cutting)
+    for start, goal in random_queries(maze, 10, seed):
+        path = pathfinder.find_path(start, goal)
+        expected = octile_cost(maze, start, goal, corner_cutting)
+        if expected is None:
+            assert path is None
+            continue
+        assert path[0] == start and path[-1] == goal
+        cost = 0.0
+        for (r1, c1), (r2, c2) in zip(path, path[1:]):
+            assert max(abs(r1 - r2), abs(c1 - c2)) == 1
+            assert maze[r2][c2] != '1'
+            cost += 2 ** 0.5 if r1 != r2 and c1 != c2 else 1
+        assert cost == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_smooth_path_keeps_clear_segments(seed):
+    maze = random_maze(20, 20, 0.2, seed)
+    pathfinder = PathFinder(maze)
+    for start, goal in random_queries(maze, 10, seed):
+        path = pathfinder.find_path(start, goal)
+        if path is None:
+            assert pathfinder.smooth_path(path) is None
+            continue
+        waypoints = pathfinder.smooth_path(path, max_lookahead=8)
+        assert waypoints[0] == path[0] and waypoints[-1] == path[-1]
+        
+        # Pontos de passagem são posições do caminho, na mesma ordem
+        order = [path.index(point) for point in waypoints]
+        assert order == sorted(order)
+        assert all(b - a <= 8 for a, b in zip(order, order[1:]))
+        
+        # Cada trecho reto só passa por células livres
+        for (r1, c1), (r2, c2) in zip(waypoints, waypoints[1:]):
+            samples = 40 * (abs(r2 - r1) + abs(c2 - c1))
+            for step in range(samples + 1):
+                t = step / samples
+                row = round(r1 + (r2 - r1) * t)
+                col = round(c1 + (c2 - c1) * t)
+                assert maze[row][col] != '1'
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_bounded_paths_respect_bound(seed):
+    maze = random_maze(20, 20, [0.15, 0.3][seed % 2], seed)
+    pathfinder = PathFinder(maze)
+    for start, goal in random_queries(maze, 8, seed):
+        expected = bfs_length(maze, start, goal) if maze[goal[0]][goal[1]] != '1' else None
+        for path in (pathfinder.find_path_bounded(start, goal, epsilon=2.0),
+                     pathfinder.find_path_anytime(start, goal, epsilon=3.0),
+                     pathfinder.find_path_anytime(start, goal, epsilon=3.0, max_expansions=5)):
+            if expected is None:
+                assert path is None
+                continue
+            assert_valid_path(maze, path, start, goal)
+            assert 1.0 <= path.bound <= path.epsilon
+            assert len(path) - 1 <= path.bound * (expected - 1) + 1e-9
+        
+        # Sem limite de tempo, o ARA* termina provando o ótimo
+        path = pathfinder.find_path_anytime(start, goal, epsilon=3.0, final_epsilon=1.0)
+        if expected is not None:
+            assert len(path) == expected and path.bound == 1.0
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_find_nearest_matches_bfs(seed):
+    rnd = random.Random(seed)
+    rows, cols = rnd.randint(1, 20), rnd.randint(2, 20)
+    maze = random_maze(rows, cols, [0.0, 0.2, 0.35][seed % 3], seed)
+    goals = [(rnd.randrange(rows), rnd.randrange(cols)) for _ in range(rnd.randint(1, 30))]
+    # Repetidos e paredes entre os objetivos
+    goals += goals[:3]
+    pathfinder = PathFinder(maze)
+    if seed % 2:
+        pathfinder.build_component_index()
+    
+    start = pathfinder.start
+    distances = bfs_distances(maze, start)
+    reachable = [goal for goal in goals if goal in distances]
+    for strategy in (None, 'forward', 'reverse'):
+        result = pathfinder.find_nearest(goals=goals, strategy=strategy)
+        if not reachable:
+            assert result is None
+            continue
+        goal, path = result
+        assert goal in reachable
+        assert len(path) - 1 == distances[goal] == min(distances[g] for g in reachable)
+        assert_valid_path(maze, path, start, goal)
+
+
+def test_find_nearest_special_goals():
+    maze = [
+        ['S', '0', '1', 'E'],
+        ['0', '0', '1', '0'],
+        ['1', '0', '1', '0'],
+        ['E', '0', '0', 'E'],
+    ]
+    pathfinder = PathFinder(maze)
+    assert pathfinder.ends == [(0, 3), (3, 0), (3, 3)]
+    assert pathfinder.end == (3, 3)
+    
+    # Objetivo igual ao início; objetivos só em paredes; objetivo isolado
+    assert pathfinder.find_nearest(goals=[(1, 0), (0, 0)]) == ((0, 0), [(0, 0)])
+    assert pathfinder.find_nearest(goals=[(0, 2), (1, 2), (0, 2)]) is None
+    maze_blocked = [row[:] for row in maze]
+    maze_blocked[3][2] = '1'
+    assert PathFinder(maze_blocked).find_nearest(goals=[(0, 3)]) is None
+    
+    for strategy in ('forward', 'reverse'):
+        goal, path = pathfinder.find_nearest(strategy=strategy)
+        assert goal == (3, 0) and len(path) == 6
+    
+    with pytest.raises(ValueError):
+        pathfinder.find_nearest(goals=[])
+    with pytest.raises(ValueError):
+        pathfinder.find_nearest(goals=[(9, 9)])
+    with pytest.raises(ValueError):
+        pathfinder.find_nearest(strategy='sideways')
+
+
+def test_ends_follow_grid_changes():
+    maze = [
+        ['S', '0', '0', 'E'],
+        ['0', '1', '0', '0'],
+        ['E', '0', '0', '0'],
+    ]
+    pathfinder = PathFinder(maze)
+    assert pathfinder.find_nearest()[0] == (2, 0)
+    
+    # Bloquear um 'E' o tira da lista de objetivos padrão
+    pathfinder.set_blocked((2, 0))
+    assert pathfinder.ends == [(0, 3)]
+    goal, path = pathfinder.find_nearest()
+    assert goal == (0, 3)
+    
+    # O caminho exibido mantém o 'E' alcançado e a nova parede
+    lines = pathfinder.display_maze_with_path(path).split('\n')
+    assert lines[0].split() == ['S', '*', '*', 'E']
+    assert lines[2].split()[0] == '1'
+
+
+def test_display_marks_goals_crossed_by_the_path():
+    maze = [['S', '0', 'E', '0', 'E']]
+    pathfinder = PathFinder(maze)
+    path = pathfinder.find_path()
+    # O 'E' no meio do caminho vira '*', como os demais passos
+    assert pathfinder.display_maze_with_path(path) == 'S * * * E'
+    # Objetivo escolhido: todos os passos, inclusive o último, são marcados
+    assert pathfinder.display_maze_with_path(pathfinder.find_path(goal=(0, 3))) == 'S * * * E'
+    # find_nearest: o 'E' alcançado fica como está
+    goal, path = pathfinder.find_nearest()
+    assert goal == (0, 2)
+    assert pathfinder.display_maze_with_path(path) == 'S * E 0 E'
+    assert pathfinder.display_maze_with_path([]) == 'S 0 E 0 E'
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_detailed_stats_and_hooks(seed):
+    maze = random_maze(20, 20, 0.3, seed)
+    pathfinder = PathFinder(maze)
+    for start, goal in random_queries(maze, 5, seed):
+        expanded, pushed = [], []
+        path, stats = pathfinder.find_path_with_stats(
+            start, goal, detailed=True,
+            on_expand=lambda position, g: expanded.append((position, g)),
+            on_push=lambda position, g, h: pushed.append((position, g, h)))
+        assert path == pathfinder.find_path(start, goal)
+        if maze[start[0]][start[1]] == '1' or maze[goal[0]][goal[1]] == '1':
+            assert path is None and not expanded and not pushed
+            continue
+        
+        # Um gancho por expansão e por inserção; cada inserção sai da fila
+        # como expansão, como entrada obsoleta ou ainda está na fila
+        assert stats.nodes_expanded == len(expanded) == len(set(p for p, _ in expanded))
+        assert stats.nodes_pushed == len(pushed)
+        assert stats.nodes_pushed >= stats.nodes_expanded + stats.stale_pops
+        assert 1 <= stats.peak_open <= stats.nodes_pushed
+        assert stats.path_length == (len(path) if path else 0)
+        
+        # O mesmo número de expansões que a contagem do laço normal
+        plain = pathfinder.find_path_with_stats(start, goal)[1]
+        assert plain.nodes_expanded == stats.nodes_expanded
+        if path:
+            assert expanded[-1] == (goal, len(path) - 1)
+        for position, g, h in pushed:
+            assert h == abs(position[0] - goal[0]) + abs(position[1] - goal[1])
+
+
+def test_hook_exception_stops_search():
+    def stop(position, g):
+        if g == 3:
+            raise KeyboardInterrupt
+    
+    pathfinder = PathFinder(random_maze(10, 10, 0.0, 1))
+    with pytest.raises(KeyboardInterrupt):
+        pathfinder.find_path_with_stats(on_expand=stop)
+    with pytest.raises(ValueError):
+        pathfinder.find_path_with_stats(algorithm='jps', detailed=True)
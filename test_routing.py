@@ -0,0 +1,62 @@
+"""
+Testes da tabela de rotas comprimida
+Descrição: Os caminhos lidos da tabela devem ter o comprimento da busca em
+largura, com construção em um ou mais processos e após gravar/carregar
+"""
+
+import pytest
+
+from pathfinder_astar import PackedGrid
+from routing import RoutingTable
+from test_pathfinder import assert_valid_path, bfs_length, random_maze
+
+
+def check_table(table: RoutingTable, maze):
+    """Compara todas as consultas entre células livres com a BFS."""
+    free = [(row, col) for row in range(len(maze)) for col in range(len(maze[0]))
+            if maze[row][col] != '1']
+    for start in free:
+        for goal in free:
+            path = table.find_path(start, goal)
+            expected = bfs_length(maze, start, goal)
+            if expected is None:
+                assert path is None
+            else:
+                assert len(path) == expected
+                assert_valid_path(maze, path, start, goal)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_matches_bfs(seed):
+    maze = random_maze(9, 11, [0.15, 0.3, 0.4][seed % 3], seed)
+    table = RoutingTable.build(maze, workers=1, chunksize=7, report=False)
+    check_table(table, maze)
+
+
+def test_parallel_build_matches_serial():
+    maze = random_maze(12, 12, 0.25, 11)
+    serial = RoutingTable.build(maze, workers=1, report=False)
+    parallel = RoutingTable.build(maze, workers=2, chunksize=16, report=False)
+    assert parallel.moves == serial.moves
+    assert list(parallel.starts) == list(serial.starts)
+
+
+def test_save_and_load(tmp_path):
+    maze = random_maze(10, 10, 0.25, 2)
+    grid = PackedGrid.from_matrix(maze)
+    table = RoutingTable.build(grid, workers=1, report=False)
+    filename = str(tmp_path / "mapa.cpd")
+    table.save(filename)
+    check_table(RoutingTable.load(filename, grid), maze)
+
+
+def test_walls_and_stale_grid():
+    maze = random_maze(6, 6, 0.0, 1)
+    maze[2][2] = '1'
+    grid = PackedGrid.from_matrix(maze)
+    table = RoutingTable.build(grid, workers=1, report=False)
+    assert table.find_path((2, 2), (0, 0)) is None
+    
+    grid.set_cell((3, 3), '1')
+    with pytest.raises(ValueError):
+        table.find_path((0, 0), (5, 5))
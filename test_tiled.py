@@ -0,0 +1,124 @@
+"""
+Testes da grade em blocos
+Descrição: A busca com estados despejados e relidos do disco deve achar
+caminhos do mesmo comprimento que a busca com a grade toda em memória
+"""
+
+import random
+
+import pytest
+
+from pathfinder_astar import PackedGrid, PathFinder
+from test_pathfinder import assert_valid_path, random_maze, random_queries
+from tiled import TiledGrid, TiledPathFinder, save_tiled
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_spilled_search_matches_in_memory(seed, tmp_path):
+    rnd = random.Random(seed)
+    rows, cols = rnd.randint(5, 30), rnd.randint(5, 30)
+    maze = random_maze(rows, cols, [0.1, 0.25, 0.35][seed % 3], seed)
+    pathfinder = PathFinder(maze)
+    filename = str(tmp_path / "mapa.tiles")
+    save_tiled(PackedGrid.from_matrix(maze), filename, tile_size=rnd.choice([1, 3, 4, 64]))
+    
+    with TiledGrid(filename, max_tiles=rnd.choice([1, 2, 16])) as grid:
+        assert grid.to_matrix() == maze
+        finder = TiledPathFinder(grid, max_state_tiles=rnd.choice([1, 2]))
+        assert (finder.start, finder.end) == (pathfinder.start, pathfinder.end)
+        for start, goal in [(None, None)] + random_queries(maze, 10, seed):
+            path = finder.find_path(start, goal)
+            expected = pathfinder.find_path(start, goal)
+            if expected is None:
+                assert path is None
+            else:
+                assert len(path) == len(expected)
+                assert_valid_path(maze, path, expected[0], expected[-1])
+        finder.close()
+
+
+def test_counters_report_spills_and_loads(tmp_path):
+    maze = random_maze(40, 40, 0.0, 1)
+    filename = str(tmp_path / "mapa.tiles")
+    save_tiled(PackedGrid.from_matrix(maze), filename, tile_size=4)
+    
+    with TiledGrid(filename, max_tiles=2) as grid:
+        finder = TiledPathFinder(grid, max_state_tiles=2)
+        path = finder.find_path()
+        assert len(path) == 79
+        assert grid.tile_loads > 0 and grid.tile_evictions > 0
+        assert finder.state_spills > 0 and finder.state_loads > 0
+        assert list(finder.iter_path()) == path
+
+
+def test_endpoints_and_read_only(tmp_path):
+    maze = random_maze(9, 9, 0.0, 1)
+    maze[4][4] = 'E'
+    filename = str(tmp_path / "mapa.tiles")
+    save_tiled(PackedGrid.from_matrix(maze), filename, tile_size=4)
+    
+    with TiledGrid(filename) as grid:
+        assert grid.find_all('E') == [(4, 4), (8, 8)]
+        assert grid.find_last('S') == (0, 0)
+        with pytest.raises(ValueError):
+            grid.set_cell((1, 1), '1')
+        finder = TiledPathFinder(grid)
+        assert finder.find_nearest()[0] == (4, 4)
+        with pytest.raises(ValueError):
+            finder.find_path(algorithm='jps')
+
+
+def test_rejects_other_files(tmp_path):
+    filename = tmp_path / "mapa.txt"
+    filename.write_bytes(b'S 0\n0 E\n' * 4)
+    with pytest.raises(ValueError):
+        TiledGrid(str(filename))
+
+
+def _tiled_copy(tmp_path, maze):
+    """Grava o labirinto em blocos pequenos e abre com LRUs mínimos (força despejos)."""
+    filename = str(tmp_path / "mapa.tiles")
+    save_tiled(PackedGrid.from_matrix(maze), filename, tile_size=3)
+    grid = TiledGrid(filename, max_tiles=2)
+    return grid, TiledPathFinder(grid, max_state_tiles=1)
+
+
+def test_stats_count_spilled_states(tmp_path):
+    maze = random_maze(12, 10, 0.25, 3)
+    expected = PathFinder(maze).find_path_with_stats()[1]
+    grid, finder = _tiled_copy(tmp_path, maze)
+    with grid:
+        _, stats = finder.find_path_with_stats()
+        assert finder.state_spills > 0
+        assert stats.nodes_expanded == expected.nodes_expanded > 0
+        _, detailed = finder.find_path_with_stats(detailed=True)
+        assert detailed.nodes_expanded == expected.nodes_expanded
+
+
+def test_display_reads_row_slices(tmp_path):
+    maze = random_maze(12, 10, 0.25, 3)
+    pathfinder = PathFinder(maze)
+    grid, finder = _tiled_copy(tmp_path, maze)
+    with grid:
+        path = finder.find_path()
+        assert path == pathfinder.find_path()
+        assert finder.display_maze_with_path(path) == pathfinder.display_maze_with_path(path)
+        assert grid.cells[grid.index((2, 0)):grid.index((2, 10))] == ''.join(maze[2]).encode()
+
+
+def test_wall_mask_iterates_cells(tmp_path):
+    maze = random_maze(12, 10, 0.25, 3)
+    pathfinder = PathFinder(maze)
+    grid, finder = _tiled_copy(tmp_path, maze)
+    with grid:
+        # Sem __iter__, bytes(grid.cells) nunca terminava
+        assert len(grid.cells) == len(pathfinder.grid.cells)
+        assert finder._wall_mask() == pathfinder._wall_mask()
+
+
+def test_component_index_is_rejected(tmp_path):
+    grid, finder = _tiled_copy(tmp_path, random_maze(6, 6, 0.0, 1))
+    with grid:
+        with pytest.raises(ValueError, match="componentes"):
+            finder.build_component_index()
+        assert finder.components is None
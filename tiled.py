@@ -0,0 +1,492 @@
+"""
+Grade em blocos (tiles) para mapas maiores que a memória
+Descrição: Grava o mapa em blocos quadrados de tamanho fixo, carrega os blocos
+do disco sob demanda mantendo só os mais usados em um LRU limitado, e executa
+o A* do PathFinder guardando o estado da busca também por bloco, despejando
+em um arquivo temporário os blocos de estado menos usados
+"""
+
+import struct
+import tempfile
+from array import array
+from collections import OrderedDict
+from typing import Iterator, List, Optional, Tuple
+
+from pathfinder_astar import PackedGrid, PathFinder, WALL
+
+
+# Cabeçalho do arquivo: assinatura, linhas, colunas e lado do bloco
+TILE_MAGIC = b'PFTILE1\n'
+TILE_HEADER = struct.Struct('<8sIII')
+
+
+def save_tiled(grid: PackedGrid, filename: str, tile_size: int = 256):
+    """
+    Grava uma grade no formato em blocos.
+    
+    Os blocos são gravados em ordem de linha, cada um com ``tile_size²``
+    bytes (os blocos da borda são completados com paredes). A grade é lida
+    uma faixa de blocos por vez, então uma grade mapeada do disco
+    (``maze_io.load_maze`` no formato binário) é convertida sem ser
+    carregada inteira na memória.
+    
+    Args:
+        grid: Grade a ser gravada
+        filename: Caminho do arquivo de saída
+        tile_size: Lado de cada bloco, em células
+    """
+    if tile_size < 1:
+        raise ValueError("tile_size deve ser pelo menos 1!")
+    
+    rows, cols = grid.rows, grid.cols
+    tile_rows = -(-rows // tile_size)
+    tile_cols = -(-cols // tile_size)
+    
+    with open(filename, 'wb') as f:
+        f.write(TILE_HEADER.pack(TILE_MAGIC, rows, cols, tile_size))
+        for tile_row in range(tile_rows):
+            for tile_col in range(tile_cols):
+                tile = bytearray([WALL]) * (tile_size * tile_size)
+                first_col = tile_col * tile_size
+                count = min(tile_size, cols - first_col)
+                for local_row in range(min(tile_size, rows - tile_row * tile_size)):
+                    first = grid.index((tile_row * tile_size + local_row, first_col))
+                    tile[local_row * tile_size:local_row * tile_size + count] = \
+                        grid.cells[first:first + count]
+                f.write(tile)
+
+
+class _TiledCells:
+    """
+    Visão das células de uma TiledGrid como o buffer plano (com borda) da PackedGrid.
+    
+    Só leitura. O acesso por índice é o que as buscas do PathFinder fazem;
+    fatias e iteração (usadas para desenhar o caminho e montar a máscara de
+    paredes) leem célula a célula, então só servem para mapas pequenos.
+    Índices da borda (ou fora dela) valem parede.
+    """
+    __slots__ = ('grid',)
+    
+    def __init__(self, grid: 'TiledGrid'):
+        self.grid = grid
+    
+    def __len__(self) -> int:
+        return (self.grid.rows + 2) * self.grid.width
+    
+    def __getitem__(self, index: int) -> int:
+        try:
+            row, col = divmod(index, self.grid.width)
+        except TypeError:
+            # Fatia: fora do caminho das buscas, que só usam índices
+            return bytes(map(self.__getitem__, range(*index.indices(len(self)))))
+        return self.grid.cell(row - 1, col - 1)
+    
+    def __iter__(self) -> Iterator[int]:
+        # Sem __iter__, bytes(cells) usaria __getitem__ até um IndexError que nunca vem
+        return map(self.__getitem__, range(len(self)))
+
+
+class TiledGrid(PackedGrid):
+    """
+    Grade lida do disco em blocos, com um LRU limitado de blocos em memória.
+    
+    Tem a interface da PackedGrid (índices com borda, ``offset`` 0), então o
+    PathFinder pode buscar sobre ela; ``cells`` lê cada célula do bloco
+    correspondente. A grade é somente leitura.
+    
+    Atributos:
+        rows: Número de linhas do labirinto
+        cols: Número de colunas do labirinto
+        tile_size: Lado de cada bloco, em células
+        max_tiles: Máximo de blocos mantidos em memória
+        tile_loads: Blocos lidos do disco
+        tile_hits: Acessos atendidos por blocos já em memória
+        tile_evictions: Blocos descartados do LRU
+    """
+    def __init__(self, filename: str, max_tiles: int = 64):
+        """
+        Abre um arquivo gravado por ``save_tiled``.
+        
+        Args:
+            filename: Caminho do arquivo
+            max_tiles: Máximo de blocos mantidos em memória
+        """
+        if max_tiles < 1:
+            raise ValueError("max_tiles deve ser pelo menos 1!")
+        
+        self._file = open(filename, 'rb')
+        magic, rows, cols, self.tile_size = TILE_HEADER.unpack(
+            self._file.read(TILE_HEADER.size))
+        if magic != TILE_MAGIC:
+            self._file.close()
+            raise ValueError(f"{filename} não é um arquivo de labirinto em blocos!")
+        super().__init__(rows, cols, _TiledCells(self))
+        
+        self.tile_cols = -(-self.cols // self.tile_size)
+        self.tile_rows = -(-self.rows // self.tile_size)
+        self.max_tiles = max_tiles
+        self._tiles: 'OrderedDict[int, bytes]' = OrderedDict()
+        
+        self.tile_loads = 0
+        self.tile_hits = 0
+        self.tile_evictions = 0
+    
+    def close(self):
+        """Fecha o arquivo e descarta os blocos em memória."""
+        self._file.close()
+        self._tiles.clear()
+    
+    def __enter__(self) -> 'TiledGrid':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def tile(self, tile_id: int) -> bytes:
+        """
+        Retorna o conteúdo de um bloco, lendo do disco se necessário.
+        
+        Args:
+            tile_id: Número do bloco (linha_do_bloco * tile_cols + coluna_do_bloco)
+            
+        Returns:
+            Bytes do bloco (tile_size² células, em ordem de linha)
+        """
+        tiles = self._tiles
+        tile = tiles.get(tile_id)
+        if tile is not None:
+            self.tile_hits += 1
+            tiles.move_to_end(tile_id)
+            return tile
+        
+        size = self.tile_size * self.tile_size
+        self._file.seek(TILE_HEADER.size + tile_id * size)
+        tile = self._file.read(size)
+        self.tile_loads += 1
+        
+        tiles[tile_id] = tile
+        if len(tiles) > self.max_tiles:
+            tiles.popitem(last=False)
+            self.tile_evictions += 1
+        return tile
+    
+    def cell(self, row: int, col: int) -> int:
+        """
+        Código da célula (ASCII); posições fora do mapa contam como parede.
+        
+        Args:
+            row: Linha
+            col: Coluna
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return WALL
+        size = self.tile_size
+        tile_row, local_row = divmod(row, size)
+        tile_col, local_col = divmod(col, size)
+        return self.tile(tile_row * self.tile_cols + tile_col)[local_row * size + local_col]
+    
+    def find_all(self, symbol: str) -> List[Tuple[int, int]]:
+        """
+        Localiza todas as ocorrências de um símbolo, em ordem de linha.
+        
+        Percorre o arquivo bloco a bloco sem passar pelo LRU.
+        
+        Args:
+            symbol: Caractere procurado (por exemplo 'E')
+            
+        Returns:
+            Lista de posições (linha, coluna), vazia se não houver nenhuma
+        """
+        code = symbol.encode('ascii')
+        size = self.tile_size
+        positions = []
+        self._file.seek(TILE_HEADER.size)
+        for tile_id in range(self.tile_rows * self.tile_cols):
+            tile = self._file.read(size * size)
+            tile_row, tile_col = divmod(tile_id, self.tile_cols)
+            offset = tile.find(code)
+            while offset != -1:
+                local_row, local_col = divmod(offset, size)
+                positions.append((tile_row * size + local_row, tile_col * size + local_col))
+                offset = tile.find(code, offset + 1)
+        return sorted(positions)
+    
+    def find_last(self, symbol: str) -> Optional[Tuple[int, int]]:
+        """
+        Posição da última ocorrência de um símbolo (em ordem de linha).
+        
+        Args:
+            symbol: Símbolo procurado ('S' ou 'E')
+            
+        Returns:
+            Posição (linha, coluna) ou None se não houver
+        """
+        positions = self.find_all(symbol)
+        return positions[-1] if positions else None
+    
+    def set_cell(self, position: Tuple[int, int], symbol: str):
+        """A grade em blocos é somente leitura."""
+        raise ValueError("A grade em blocos é somente leitura!")
+    
+    def to_matrix(self) -> List[List[str]]:
+        """Converte a grade para uma matriz de caracteres (só para mapas pequenos)."""
+        return [[chr(self.cell(row, col)) for col in range(self.cols)]
+                for row in range(self.rows)]
+
+
+# Bytes por célula no arquivo temporário: g ('i'), pai ('q') e marca ('I')
+_STATE_RECORD = 4 + 8 + 4
+
+
+class _TileState:
+    """Estado da busca (custos g, pais e marcas) das células de um bloco."""
+    __slots__ = ('arrays',)
+    
+    def __init__(self, size: int):
+        self.arrays = (array('i', [0]) * size, array('q', [-1]) * size, array('I', [0]) * size)
+    
+    def to_bytes(self) -> bytes:
+        """
+        Registro gravado no arquivo temporário (``_STATE_RECORD`` bytes por célula).
+        
+        Os três vetores do bloco, um depois do outro e na ordem das células
+        do bloco: g (``array('i')``, 4 bytes), pai (``array('q')``, 8 bytes,
+        índice com borda da TiledGrid) e marca de geração (``array('I')``,
+        4 bytes), na ordem de bytes da máquina (o arquivo só existe durante
+        a consulta).
+        """
+        return b''.join(values.tobytes() for values in self.arrays)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes, size: int) -> '_TileState':
+        """
+        Recria o estado de um bloco a partir do registro de ``to_bytes``.
+        
+        Args:
+            data: Registro com ``size * _STATE_RECORD`` bytes
+            size: Número de células do bloco
+        """
+        state = cls.__new__(cls)
+        g, parents, marks = array('i'), array('q'), array('I')
+        g.frombytes(data[:4 * size])
+        parents.frombytes(data[4 * size:12 * size])
+        marks.frombytes(data[12 * size:])
+        state.arrays = (g, parents, marks)
+        return state
+
+
+class _StateView:
+    """Um dos vetores do estado da busca (g, pais ou marcas), visto como um vetor plano."""
+    __slots__ = ('store', 'field')
+    
+    def __init__(self, store: '_TileStateStore', field: int):
+        self.store = store
+        self.field = field
+    
+    def __getitem__(self, index: int) -> int:
+        state, local = self.store.locate(index)
+        return state.arrays[self.field][local]
+    
+    def __setitem__(self, index: int, value: int):
+        state, local = self.store.locate(index)
+        state.arrays[self.field][local] = value
+    
+    def __len__(self) -> int:
+        return len(self.store.grid.cells)
+    
+    def count(self, value: int) -> int:
+        """Ocorrências de um valor (ex.: marcas de fechado em ``find_path_with_stats``)."""
+        return self.store.count(self.field, value)
+
+
+class _TileStateStore:
+    """
+    Estados de bloco da busca com LRU limitado e despejo em arquivo temporário.
+    
+    Cada bloco despejado ganha uma posição fixa no arquivo (registros do
+    mesmo tamanho), reescrita a cada novo despejo.
+    """
+    def __init__(self, grid: TiledGrid, max_tiles: int):
+        self.grid = grid
+        self.max_tiles = max_tiles
+        self.spills = 0
+        self.loads = 0
+        self.views = tuple(_StateView(self, field) for field in range(3))
+        # Estado de uma célula só, para os índices da borda (sempre parede:
+        # as buscas leem sua marca antes de testar a parede, mas nunca escrevem)
+        self._border = _TileState(1)
+        self._states: 'OrderedDict[int, _TileState]' = OrderedDict()
+        self._slots = {}
+        self._file = None
+        self._last_id = -1
+        self._last_state = None
+        
+        # Bloco e posição local de cada linha/coluna com borda, calculados uma
+        # vez (O(linhas + colunas)) para evitar divisões a cada acesso; -1 na borda
+        size = grid.tile_size
+        self._row_tiles = array('q', [-1]) * (grid.rows + 2)
+        self._row_locals = array('q', [0]) * (grid.rows + 2)
+        for row in range(grid.rows):
+            self._row_tiles[row + 1] = row // size * grid.tile_cols
+            self._row_locals[row + 1] = row % size * size
+        self._col_tiles = array('q', [-1]) * grid.width
+        self._col_locals = array('q', [0]) * grid.width
+        for col in range(grid.cols):
+            self._col_tiles[col + 1] = col // size
+            self._col_locals[col + 1] = col % size
+    
+    def reset(self):
+        """Descarta todos os estados e o arquivo temporário."""
+        self._states.clear()
+        self._slots.clear()
+        self._last_id, self._last_state = -1, None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def locate(self, index: int) -> Tuple[_TileState, int]:
+        """Estado do bloco e posição local de um índice (com borda) da grade."""
+        row, col = divmod(index, self.grid.width)
+        tile_row = self._row_tiles[row]
+        tile_col = self._col_tiles[col]
+        if tile_row < 0 or tile_col < 0:
+            return self._border, 0
+        
+        tile_id = tile_row + tile_col
+        # O último bloco usado já é o mais recente do LRU
+        if tile_id != self._last_id:
+            self._last_state = self._state(tile_id)
+            self._last_id = tile_id
+        return self._last_state, self._row_locals[row] + self._col_locals[col]
+    
+    def count(self, field: int, value: int) -> int:
+        """
+        Ocorrências de um valor em um dos vetores, somando os estados em
+        memória e os despejados no arquivo temporário (sem passar pelo LRU).
+        
+        Args:
+            field: 0 (g), 1 (pais) ou 2 (marcas)
+            value: Valor procurado
+        """
+        states = self._states
+        total = sum(state.arrays[field].count(value) for state in states.values())
+        
+        size = self.grid.tile_size * self.grid.tile_size
+        record = _STATE_RECORD * size
+        for tile_id, slot in self._slots.items():
+            if tile_id not in states:
+                self._file.seek(slot * record)
+                state = _TileState.from_bytes(self._file.read(record), size)
+                total += state.arrays[field].count(value)
+        return total
+    
+    def _state(self, tile_id: int) -> _TileState:
+        """Estado de um bloco (da memória, do arquivo temporário ou novo)."""
+        states = self._states
+        state = states.get(tile_id)
+        if state is not None:
+            states.move_to_end(tile_id)
+            return state
+        
+        size = self.grid.tile_size * self.grid.tile_size
+        record = _STATE_RECORD * size
+        slot = self._slots.get(tile_id)
+        if slot is None:
+            state = _TileState(size)
+        else:
+            self._file.seek(slot * record)
+            state = _TileState.from_bytes(self._file.read(record), size)
+            self.loads += 1
+        
+        states[tile_id] = state
+        if len(states) > self.max_tiles:
+            old_id, old_state = states.popitem(last=False)
+            if self._file is None:
+                self._file = tempfile.TemporaryFile()
+            slot = self._slots.setdefault(old_id, len(self._slots))
+            self._file.seek(slot * record)
+            self._file.write(old_state.to_bytes())
+            self.spills += 1
+        return state
+
+
+class TiledPathFinder(PathFinder):
+    """
+    PathFinder sobre uma TiledGrid, com o estado da busca guardado por bloco.
+    
+    A busca é o próprio A* do PathFinder (``find_path``, ``iter_path``,
+    ``find_nearest``); só os buffers mudam. Em vez de vetores do tamanho da
+    grade, os custos g, os pais e as marcas de cada célula ficam no estado
+    do bloco da célula. Só ``max_state_tiles`` estados ficam em memória; os
+    menos usados são gravados num arquivo temporário e relidos quando a busca
+    volta ao bloco. Cada consulta recomeça com estados vazios. A fila de
+    prioridade continua em memória.
+    
+    Atributos:
+        max_state_tiles: Máximo de estados de bloco mantidos em memória
+        state_spills: Estados gravados no arquivo temporário (desde a criação)
+        state_loads: Estados relidos do arquivo temporário (desde a criação)
+    """
+    def __init__(self, grid: TiledGrid, max_state_tiles: int = 64, require_endpoints: bool = True):
+        """
+        Cria o PathFinder em blocos.
+        
+        Args:
+            grid: Grade em blocos
+            max_state_tiles: Máximo de estados de bloco mantidos em memória
+            require_endpoints: Se True (padrão), exige 'S' e 'E' no mapa
+        """
+        if max_state_tiles < 1:
+            raise ValueError("max_state_tiles deve ser pelo menos 1!")
+        super().__init__(grid, require_endpoints=require_endpoints)
+        self.max_state_tiles = max_state_tiles
+        self._store = _TileStateStore(grid, max_state_tiles)
+    
+    @property
+    def state_spills(self) -> int:
+        return self._store.spills
+    
+    @property
+    def state_loads(self) -> int:
+        return self._store.loads
+    
+    def _next_generation(self) -> Tuple[int, int]:
+        """
+        Prepara os estados por bloco para uma nova consulta.
+        
+        Os estados são descartados a cada consulta (o arquivo temporário
+        nunca cresce além dos blocos tocados por uma busca); as marcas de
+        geração seguem valendo como no PathFinder.
+        """
+        self._generation += 1
+        self._store.reset()
+        self._g_costs, self._parents, self._marks = self._store.views
+        open_mark = 2 * self._generation
+        return open_mark, open_mark + 1
+    
+    def find_path(self, start: Optional[Tuple[int, int]] = None,
+                  goal: Optional[Tuple[int, int]] = None,
+                  algorithm: str = 'astar') -> Optional[List[Tuple[int, int]]]:
+        """
+        Executa o A* do PathFinder sobre a grade em blocos.
+        
+        Args:
+            start: Posição inicial (padrão: o 'S' do labirinto)
+            goal: Posição final (padrão: o 'E' do labirinto)
+            algorithm: Só 'astar' (os outros usam buffers do tamanho da grade)
+            
+        Returns:
+            Lista de posições do caminho encontrado, ou None se não houver solução
+        """
+        if algorithm != 'astar':
+            raise ValueError(f"A grade em blocos só aceita o algoritmo 'astar', não {algorithm!r}!")
+        return super().find_path(start, goal)
+    
+    def build_component_index(self):
+        """O índice de componentes guarda um rótulo por célula: não é aceito aqui."""
+        raise ValueError("A grade em blocos não aceita o índice de componentes "
+                         "(ele usa vetores do tamanho da grade)!")
+    
+    def close(self):
+        """Descarta o estado da busca e o arquivo temporário."""
+        self._store.reset()